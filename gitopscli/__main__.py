@@ -1,17 +1,24 @@
 import logging
+import os
 import sys
 
 from gitopscli.cliparser import parse_args
 from gitopscli.commands import CommandFactory
+from gitopscli.git_api.git_api_metrics import METRICS_FILE_ENV, get_git_api_metrics
+from gitopscli.git_api.http_session_registry import get_http_session_registry
 from gitopscli.gitops_exception import GitOpsException
+from gitopscli.tracing import TRACE_FILE_ENV, start_trace
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(levelname)-2s %(funcName)s: %(message)s")
     verbose, args = parse_args(sys.argv[1:])
     command = CommandFactory.create(args)
+    trace_file = os.environ.get(TRACE_FILE_ENV)
+    metrics_file = os.environ.get(METRICS_FILE_ENV)
     try:
-        command.execute()
+        with start_trace(type(command).__name__) as trace:
+            command.execute()
     except GitOpsException as ex:
         if verbose:
             logging.exception(ex)  # noqa: TRY401
@@ -19,6 +26,14 @@ def main() -> None:
             logging.error(ex)  # noqa: TRY400
             logging.error("Provide verbose flag '-v' for more error details...")  # noqa: TRY400
         sys.exit(1)
+    finally:
+        if verbose:
+            trace.log_phases()
+            get_http_session_registry().rate_limiter.log_budgets()
+        if trace_file:
+            trace.write_otlp_file(trace_file)
+        if metrics_file:
+            get_git_api_metrics().write_file(metrics_file)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,16 @@
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from gitopscli.git_api import GitRepo
 from gitopscli.gitops_exception import GitOpsException
-from gitopscli.io_api.yaml_util import yaml_file_load, yaml_load
+from gitopscli.io_api.yaml_util import yaml_file_load
+from gitopscli.tracing import submit_in_context
+
+CUSTOM_CONFIG_LOAD_WORKERS = 8
 
 
 @dataclass
@@ -33,9 +37,10 @@ class AppTenantConfig:
         self.__update_custom_app_config(desired_apps)
 
     def __update_custom_app_config(self, desired_apps: dict[str, dict[str, Any]]) -> None:
+        current_apps = self.tenant_config["applications"]
         for desired_app_name, desired_app_value in desired_apps.items():
-            if desired_app_name in self.list_apps():
-                existing_application_value = self.list_apps()[desired_app_name]
+            if desired_app_name in current_apps:
+                existing_application_value = current_apps[desired_app_name]
                 if "customAppConfig" not in desired_app_value:
                     if existing_application_value and "customAppConfig" in existing_application_value:
                         logging.info(
@@ -58,14 +63,15 @@ class AppTenantConfig:
                     self.__set_dirty()
 
     def __add_new_applications(self, desired_apps: dict[str, Any]) -> None:
+        current_apps = self.tenant_config["applications"]
         for desired_app_name, desired_app_value in desired_apps.items():
-            if desired_app_name not in self.list_apps():
+            if desired_app_name not in current_apps:
                 logging.info("Adding %s in %s applications", desired_app_name, self.file_path)
-                self.tenant_config["applications"][desired_app_name] = desired_app_value
+                current_apps[desired_app_name] = desired_app_value
                 self.__set_dirty()
 
     def __delete_removed_applications(self, desired_apps: dict[str, Any]) -> None:
-        for current_app in self.list_apps():
+        for current_app in list(self.tenant_config["applications"]):
             if current_app not in desired_apps:
                 logging.info("Removing %s from %s applications", current_app, self.file_path)
                 del self.tenant_config["applications"][current_app]
@@ -79,28 +85,24 @@ def __generate_config_from_tenant_repo(
     tenant_repo: GitRepo,
 ) -> Any:
     tenant_app_dirs = __get_all_tenant_applications_dirs(tenant_repo)
-    tenant_config_template = f"""
-    config:
-        repository: {tenant_repo.get_clone_url()}
-        applications: {{}}
-    """
-    yaml = yaml_load(tenant_config_template)
-    for app_dir in tenant_app_dirs:
-        tenant_application_template = f"""
-        {app_dir}: {{}}
-        """
-        tenant_applications_yaml = yaml_load(tenant_application_template)
-        # dict path hardcoded as object generated will always be in v2 or later
-        yaml["config"]["applications"].update(tenant_applications_yaml)
-        custom_app_config = __get_custom_config(app_dir, tenant_repo)
-        if custom_app_config:
-            yaml["config"]["applications"][app_dir]["customAppConfig"] = custom_app_config
+    applications: dict[str, dict[str, Any]] = {app_dir: {} for app_dir in tenant_app_dirs}
+    yaml = {"config": {"repository": tenant_repo.get_clone_url(), "applications": applications}}
+    with ThreadPoolExecutor(max_workers=CUSTOM_CONFIG_LOAD_WORKERS) as executor:
+        # the context is copied when submitting, so the spans of the workers are recorded in the current trace
+        futures = [
+            submit_in_context(executor, __get_custom_config, app_dir, tenant_repo) for app_dir in tenant_app_dirs
+        ]
+        for app_dir, future in zip(tenant_app_dirs, futures, strict=True):
+            if custom_app_config := future.result():
+                applications[app_dir]["customAppConfig"] = custom_app_config
     return yaml
 
 
-def __get_all_tenant_applications_dirs(tenant_repo: GitRepo) -> set[str]:
+def __get_all_tenant_applications_dirs(tenant_repo: GitRepo) -> list[str]:
     repo_dir = tenant_repo.get_full_file_path(".")
-    return {name for name in os.listdir(repo_dir) if (Path(repo_dir) / name).is_dir() and not name.startswith(".")}
+    return sorted(
+        name for name in os.listdir(repo_dir) if (Path(repo_dir) / name).is_dir() and not name.startswith(".")
+    )
 
 
 def __get_custom_config(appname: str, tenant_config_git_repo: GitRepo) -> Any:
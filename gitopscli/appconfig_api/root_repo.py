@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any
 
@@ -9,16 +10,29 @@ from gitopscli.io_api.yaml_util import yaml_file_load
 
 @dataclass
 class RootRepo:
+    """The tenants of the root repository, indexed by repository URL and application name.
+
+    Use `merge_applications` to change the applications of a tenant, so the indexes stay up to date.
+    """
+
     tenants: dict[str, AppTenantConfig]
 
+    def __post_init__(self) -> None:
+        self.__tenant_name_by_repo_url: dict[str, str] = {}
+        self.__tenants_by_app: dict[str, list[AppTenantConfig]] = {}
+        for tenant_name, tenant in self.tenants.items():
+            self.__tenant_name_by_repo_url.setdefault(tenant.repo_url, tenant_name)
+            self.__add_to_app_index(tenant, tenant.list_apps())
+
     def list_tenants(self) -> list[str]:
         return list(self.tenants.keys())
 
     def get_tenant_by_repo_url(self, repo_url: str) -> AppTenantConfig | None:
-        for tenant in self.tenants.values():
-            if tenant.repo_url == repo_url:
-                return tenant
-        return None
+        tenant_name = self.get_tenant_name_by_repo_url(repo_url)
+        return self.tenants[tenant_name] if tenant_name is not None else None
+
+    def get_tenant_name_by_repo_url(self, repo_url: str) -> str | None:
+        return self.__tenant_name_by_repo_url.get(repo_url)
 
     def get_all_applications(self) -> list[str]:
         apps: list[str] = []
@@ -27,14 +41,41 @@ class RootRepo:
         return apps
 
     def validate_tenant(self, tenant_config: AppTenantConfig) -> None:
-        apps_from_other_tenants: list[str] = []
-        for tenant in self.tenants.values():
-            if tenant.repo_url != tenant_config.repo_url:
-                apps_from_other_tenants.extend(tenant.list_apps().keys())
         for app_name in tenant_config.list_apps():
-            if app_name in apps_from_other_tenants:
+            owners = self.__tenants_by_app.get(app_name, [])
+            if any(owner.repo_url != tenant_config.repo_url for owner in owners):
                 raise GitOpsException(f"Application '{app_name}' already exists in a different repository")
 
+    def validate_tenants(self, tenant_configs: dict[str, AppTenantConfig]) -> None:
+        """Validate that no application belongs to more than one tenant once the tenants are replaced by
+        `tenant_configs` (by tenant name). Checks all tenants in a single pass instead of one pass per tenant.
+        """
+        tenant_by_app: dict[str, str] = {}
+        for tenant_name, tenant in {**self.tenants, **tenant_configs}.items():
+            for app_name in tenant.list_apps():
+                other_tenant_name = tenant_by_app.setdefault(app_name, tenant_name)
+                if other_tenant_name != tenant_name:
+                    raise GitOpsException(
+                        f"Application '{app_name}' exists in tenants '{other_tenant_name}' and '{tenant_name}'"
+                    )
+
+    def merge_applications(self, tenant: AppTenantConfig, desired_tenant_config: AppTenantConfig) -> None:
+        """Merge the applications of `desired_tenant_config` into `tenant` (one of `tenants`)."""
+        apps_before = tenant.list_apps().keys()
+        tenant.merge_applications(desired_tenant_config)
+        apps_after = tenant.list_apps().keys()
+        for app_name in apps_before - apps_after:
+            owners = [owner for owner in self.__tenants_by_app[app_name] if owner is not tenant]
+            if owners:
+                self.__tenants_by_app[app_name] = owners
+            else:
+                del self.__tenants_by_app[app_name]
+        self.__add_to_app_index(tenant, apps_after - apps_before)
+
+    def __add_to_app_index(self, tenant: AppTenantConfig, app_names: Iterable[str]) -> None:
+        for app_name in app_names:
+            self.__tenants_by_app.setdefault(app_name, []).append(tenant)
+
 
 def __load_tenants_from_bootstrap_values(root_repo: GitRepo) -> dict[str, AppTenantConfig]:
     boostrap_tenant_list = __get_bootstrap_tenant_list(root_repo)
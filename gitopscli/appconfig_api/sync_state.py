@@ -0,0 +1,64 @@
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from gitopscli.io_api.json_file_store import JsonFileStore
+
+SYNC_STATE_DIR_ENV = "GITOPSCLI_SYNC_STATE_DIR"
+
+
+@dataclass(frozen=True)
+class TenantSyncState:
+    tenant_name: str
+    tenant_commit: str
+    applications_hash: str  # of the tenant's applications in the root repository after the sync
+
+
+class SyncStateStore:
+    """Remembers the last synchronized commit of an apps config repository per root config repository.
+
+    The apps config repository is identified by `tenant_repo` (e.g. its organisation and repository name), so it
+    has to be given in the same form by all callers.
+
+    `sync-apps` skips cloning and merging a tenant if its repository is still at this commit and the tenant's
+    applications in the root repository still have the recorded content (see `get_applications_hash`).
+    """
+
+    def __init__(self, state_dir: str) -> None:
+        self.__store = JsonFileStore(state_dir)
+
+    @staticmethod
+    def from_env() -> "SyncStateStore | None":
+        state_dir = os.environ.get(SYNC_STATE_DIR_ENV)
+        if not state_dir:
+            return None
+        return SyncStateStore(state_dir)
+
+    def get(self, root_repo_url: str, tenant_repo: str) -> TenantSyncState | None:
+        state = self.__store.get(self.__key(root_repo_url, tenant_repo))
+        if not isinstance(state, dict):
+            return None
+        try:
+            return TenantSyncState(**state)
+        except TypeError:
+            return None
+
+    def put(self, root_repo_url: str, tenant_repo: str, state: TenantSyncState) -> None:
+        try:
+            self.__store.put(self.__key(root_repo_url, tenant_repo), asdict(state))
+        except OSError as ex:
+            logging.warning("Could not write sync state: %s", ex)
+
+    @staticmethod
+    def __key(root_repo_url: str, tenant_repo: str) -> str:
+        return f"{root_repo_url}\n{tenant_repo}"
+
+
+def get_applications_hash(applications: Mapping[str, Any]) -> str:
+    """Content hash of a tenant's applications (app names and their `customAppConfig`)."""
+    content = json.dumps(applications, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(content.encode()).hexdigest()
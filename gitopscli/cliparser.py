@@ -11,7 +11,9 @@ from gitopscli.commands import (
     CreatePrPreviewCommand,
     DeletePreviewCommand,
     DeletePrPreviewCommand,
+    DeployBatchCommand,
     DeployCommand,
+    ServeCommand,
     SyncAppsCommand,
     VersionCommand,
 )
@@ -42,6 +44,11 @@ def __create_parser() -> ArgumentParser:
         help="Trigger a new deployment by changing YAML values",
         parents=[__create_deploy_parser()],
     )
+    subparsers.add_parser(
+        "deploy-batch",
+        help="Trigger deployments in multiple files and repositories defined in a manifest",
+        parents=[__create_deploy_batch_parser()],
+    )
     subparsers.add_parser(
         "sync-apps",
         help="Synchronize applications (= every directory) from apps config repository to apps root config",
@@ -77,6 +84,11 @@ def __create_parser() -> ArgumentParser:
         help="Show the GitOps CLI version information",
         parents=[__create_version_parser()],
     )
+    subparsers.add_parser(
+        "serve",
+        help="Run a server which executes commands sent as JSON requests",
+        parents=[__create_serve_parser()],
+    )
     return parser
 
 
@@ -152,15 +164,66 @@ def __create_deploy_parser() -> ArgumentParser:
     return parser
 
 
+def __create_deploy_batch_parser() -> ArgumentParser:
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--manifest",
+        help="YAML/JSON file with the values to update per repository and file",
+        required=True,
+    )
+    parser.add_argument(
+        "--single-commit",
+        help="Create only single commit per repository (instead of one per file)",
+        type=__parse_bool,
+        nargs="?",
+        const=True,
+        default=False,
+    )
+    parser.add_argument(
+        "--max-workers",
+        help="Number of repositories deployed in parallel (default: 4)",
+        type=int,
+        default=4,
+    )
+    parser.add_argument(
+        "--json",
+        help="Print a JSON report containing the commits and timings per repository",
+        type=__parse_bool,
+        nargs="?",
+        const=True,
+        default=False,
+    )
+    __add_git_credentials_args(parser)
+    __add_git_commit_user_args(parser)
+    __add_git_provider_args(parser)
+    __add_verbose_arg(parser)
+    return parser
+
+
 def __create_sync_apps_parser() -> ArgumentParser:
     parser = ArgumentParser(add_help=False)
     __add_git_credentials_args(parser)
     __add_git_commit_user_args(parser)
-    __add_git_org_and_repo_args(parser)
+    __add_git_org_and_repo_args(parser, required=False)
     __add_git_provider_args(parser)
     __add_verbose_arg(parser)
     parser.add_argument("--root-organisation", help="Root config repository organisation", required=True)
     parser.add_argument("--root-repository-name", help="Root config repository name", required=True)
+    parser.add_argument(
+        "--all-tenants",
+        help="Synchronize all apps config repositories of the root config repository in a single commit "
+        "(instead of --organisation and --repository-name)",
+        type=__parse_bool,
+        nargs="?",
+        const=True,
+        default=False,
+    )
+    parser.add_argument(
+        "--max-workers",
+        help="Number of apps config repositories cloned in parallel with --all-tenants (default: 4)",
+        type=int,
+        default=4,
+    )
     return parser
 
 
@@ -228,6 +291,15 @@ def __create_version_parser() -> ArgumentParser:
     return ArgumentParser(add_help=False)
 
 
+def __create_serve_parser() -> ArgumentParser:
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument("--host", help="Host to listen on (default: 127.0.0.1)", default="127.0.0.1")
+    parser.add_argument("--port", help="Port to listen on (default: 8080)", type=int, default=8080)
+    parser.add_argument("--socket", help="Listen on this unix socket instead of host and port")
+    __add_verbose_arg(parser)
+    return parser
+
+
 def __add_git_credentials_args(deploy_p: ArgumentParser) -> None:
     deploy_p.add_argument(
         "--username",
@@ -250,9 +322,11 @@ def __add_git_commit_user_args(deploy_p: ArgumentParser) -> None:
     deploy_p.add_argument("--git-author-email", help="Git Author Email")
 
 
-def __add_git_org_and_repo_args(deploy_p: ArgumentParser) -> None:
-    deploy_p.add_argument("--organisation", help="Apps Git organisation/projectKey", required=True)
-    deploy_p.add_argument("--repository-name", help="Git repository name (not the URL, e.g. my-repo)", required=True)
+def __add_git_org_and_repo_args(deploy_p: ArgumentParser, *, required: bool = True) -> None:
+    deploy_p.add_argument("--organisation", help="Apps Git organisation/projectKey", required=required)
+    deploy_p.add_argument(
+        "--repository-name", help="Git repository name (not the URL, e.g. my-repo)", required=required
+    )
 
 
 def __add_git_provider_args(deploy_p: ArgumentParser) -> None:
@@ -360,6 +434,8 @@ def __create_command_args(args: dict[str, Any]) -> CommandArgs:
     command_args: CommandArgs
     if command == "deploy":
         command_args = DeployCommand.Args(**args)
+    elif command == "deploy-batch":
+        command_args = DeployBatchCommand.Args(**args)
     elif command == "sync-apps":
         command_args = SyncAppsCommand.Args(**args)
     elif command == "add-pr-comment":
@@ -374,6 +450,8 @@ def __create_command_args(args: dict[str, Any]) -> CommandArgs:
         command_args = DeletePrPreviewCommand.Args(**args)
     elif command == "version":
         command_args = VersionCommand.Args()
+    elif command == "serve":
+        command_args = ServeCommand.Args(**args)
     else:
         raise RuntimeError(f"Unknown command: {command}")
     return command_args
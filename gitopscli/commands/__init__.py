@@ -6,5 +6,7 @@ from .create_preview import CreatePreviewCommand
 from .delete_pr_preview import DeletePrPreviewCommand
 from .delete_preview import DeletePreviewCommand
 from .deploy import DeployCommand
+from .deploy_batch import DeployBatchCommand
+from .serve import ServeCommand
 from .sync_apps import SyncAppsCommand
 from .version import VersionCommand
@@ -4,3 +4,7 @@ from abc import ABCMeta, abstractmethod
 class Command(metaclass=ABCMeta):
     @abstractmethod
     def execute(self) -> None: ...
+
+    def get_written_repositories(self) -> list[tuple[str, str]]:
+        """Organisation and name of the repositories `execute()` pushes to (e.g. to serialize `serve` requests)."""
+        return []
@@ -5,11 +5,14 @@ from .create_preview import CreatePreviewCommand
 from .delete_pr_preview import DeletePrPreviewCommand
 from .delete_preview import DeletePreviewCommand
 from .deploy import DeployCommand
+from .deploy_batch import DeployBatchCommand
+from .serve import ServeCommand
 from .sync_apps import SyncAppsCommand
 from .version import VersionCommand
 
 CommandArgs = (
     DeployCommand.Args
+    | DeployBatchCommand.Args
     | AddPrCommentCommand.Args
     | CreatePreviewCommand.Args
     | CreatePrPreviewCommand.Args
@@ -17,6 +20,7 @@ CommandArgs = (
     | DeletePrPreviewCommand.Args
     | SyncAppsCommand.Args
     | VersionCommand.Args
+    | ServeCommand.Args
 )
 
 
@@ -26,6 +30,8 @@ class CommandFactory:
         command: Command | None
         if isinstance(args, DeployCommand.Args):
             command = DeployCommand(args)
+        elif isinstance(args, DeployBatchCommand.Args):
+            command = DeployBatchCommand(args)
         elif isinstance(args, SyncAppsCommand.Args):
             command = SyncAppsCommand(args)
         elif isinstance(args, AddPrCommentCommand.Args):
@@ -40,4 +46,8 @@ class CommandFactory:
             command = DeletePrPreviewCommand(args)
         elif isinstance(args, VersionCommand.Args):
             command = VersionCommand(args)
+        elif isinstance(args, ServeCommand.Args):
+            from gitopscli.cliparser import parse_args  # noqa: PLC0415 (cliparser imports the commands)
+
+            command = ServeCommand(args, parse_args, CommandFactory.create)
         return command
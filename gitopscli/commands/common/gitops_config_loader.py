@@ -1,16 +1,33 @@
-from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApiFactory
+import logging
+from typing import Any
+
+from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApi, GitRepoApiFactory
 from gitopscli.gitops_config import GitOpsConfig
 from gitopscli.gitops_exception import GitOpsException
-from gitopscli.io_api.yaml_util import yaml_file_load
+from gitopscli.io_api.yaml_util import yaml_file_load, yaml_load
+
+GITOPS_CONFIG_FILE = ".gitops.config.yaml"
 
 
 def load_gitops_config(git_api_config: GitApiConfig, organisation: str, repository_name: str) -> GitOpsConfig:
     git_repo_api = GitRepoApiFactory.create(git_api_config, organisation, repository_name)
+    try:
+        gitops_config_content = git_repo_api.get_file_content(GITOPS_CONFIG_FILE)
+    except GitOpsException as ex:
+        logging.warning("Cannot read %s via API, cloning repository instead: %s", GITOPS_CONFIG_FILE, ex)
+        gitops_config_yaml = __load_gitops_config_yaml_from_clone(git_repo_api)
+    else:
+        if gitops_config_content is None:
+            raise GitOpsException(f"No such file: {GITOPS_CONFIG_FILE}")
+        gitops_config_yaml = yaml_load(gitops_config_content)
+    return GitOpsConfig.from_yaml(gitops_config_yaml)
+
+
+def __load_gitops_config_yaml_from_clone(git_repo_api: GitRepoApi) -> Any:
     with GitRepo(git_repo_api) as git_repo:
-        git_repo.clone()
-        gitops_config_file_path = git_repo.get_full_file_path(".gitops.config.yaml")
+        git_repo.clone(sparse_paths=[GITOPS_CONFIG_FILE])
+        gitops_config_file_path = git_repo.get_full_file_path(GITOPS_CONFIG_FILE)
         try:
-            gitops_config_yaml = yaml_file_load(gitops_config_file_path)
+            return yaml_file_load(gitops_config_file_path)
         except FileNotFoundError as ex:
-            raise GitOpsException("No such file: .gitops.config.yaml") from ex
-    return GitOpsConfig.from_yaml(gitops_config_yaml)
+            raise GitOpsException(f"No such file: {GITOPS_CONFIG_FILE}") from ex
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from gitopscli.git_api import GitApiConfig, GitRepoApiFactory
 
 from .command import Command
+from .common import load_gitops_config
 from .create_preview import CreatePreviewCommand
 
+if TYPE_CHECKING:
+    from gitopscli.gitops_config import GitOpsConfig
+
 
 class CreatePrPreviewCommand(Command):
     @dataclass(frozen=True)
@@ -25,6 +30,15 @@ class CreatePrPreviewCommand(Command):
 
     def __init__(self, args: CreatePrPreviewCommand.Args) -> None:
         self.__args = args
+        self.__gitops_config: GitOpsConfig | None = None
+
+    def get_written_repositories(self) -> list[tuple[str, str]]:
+        if self.__gitops_config is None:
+            self.__gitops_config = load_gitops_config(
+                self.__args, self.__args.organisation, self.__args.repository_name
+            )
+        gitops_config = self.__gitops_config
+        return [(gitops_config.preview_target_organisation, gitops_config.preview_target_repository)]
 
     def execute(self) -> None:
         args = self.__args
@@ -51,6 +65,7 @@ class CreatePrPreviewCommand(Command):
                 git_hash=git_hash,
                 preview_id=pr_branch,  # use pr_branch as preview id
             ),
+            self.__gitops_config,  # already loaded if the written repositories were determined
         )
         create_preview_command.register_callbacks(
             deployment_already_up_to_date_callback=add_pr_comment,
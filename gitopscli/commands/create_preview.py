@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import logging
 import shutil
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -9,13 +11,32 @@ from typing import TYPE_CHECKING, Any
 from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApi, GitRepoApiFactory
 from gitopscli.gitops_config import GitOpsConfig
 from gitopscli.gitops_exception import GitOpsException
-from gitopscli.io_api.yaml_util import YAMLException, update_yaml_file, yaml_file_dump
+from gitopscli.io_api.yaml_util import YAMLException, YAMLKeyError, update_yaml_file_values, yaml_file_dump
+from gitopscli.tracing import span
 
 from .command import Command
 from .common import load_gitops_config
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Generator
+
+PREVIEW_INFO_FILE = "/tmp/gitopscli-preview-info.yaml"  # noqa: S108
+
+_preview_info_file: ContextVar[str] = ContextVar("gitopscli_preview_info_file", default=PREVIEW_INFO_FILE)
+
+
+def get_preview_info_file() -> str:
+    return _preview_info_file.get()
+
+
+@contextmanager
+def redirect_preview_info_file(file_path: str) -> Generator[None, None, None]:
+    """Write the preview info file of the create-preview commands in the current context to `file_path` instead."""
+    token = _preview_info_file.set(file_path)
+    try:
+        yield
+    finally:
+        _preview_info_file.reset(token)
 
 
 class CreatePreviewCommand(Command):
@@ -33,8 +54,9 @@ class CreatePreviewCommand(Command):
         git_hash: str
         preview_id: str
 
-    def __init__(self, args: CreatePreviewCommand.Args) -> None:
+    def __init__(self, args: CreatePreviewCommand.Args, gitops_config: GitOpsConfig | None = None) -> None:
         self.__args = args
+        self.__gitops_config = gitops_config  # loaded on first use if not given
         self.__deployment_already_up_to_date_callback: Callable[[str], None] = lambda _: None
         self.__deployment_updated_callback: Callable[[str], None] = lambda _: None
         self.__deployment_created_callback: Callable[[str], None] = lambda _: None
@@ -49,13 +71,22 @@ class CreatePreviewCommand(Command):
         self.__deployment_updated_callback = deployment_updated_callback
         self.__deployment_created_callback = deployment_created_callback
 
+    def get_written_repositories(self) -> list[tuple[str, str]]:
+        gitops_config = self.__get_gitops_config()
+        return [(gitops_config.preview_target_organisation, gitops_config.preview_target_repository)]
+
     def execute(self) -> None:
         gitops_config = self.__get_gitops_config()
         self.__create_preview_info_file(gitops_config)
 
+        preview_folder_path = gitops_config.get_preview_folder_path(self.__args.preview_id)
+        preview_target_sparse_paths = [preview_folder_path]
+        if gitops_config.is_preview_template_equal_target():
+            preview_target_sparse_paths.append(gitops_config.preview_template_path)
+
         preview_target_git_repo_api = self.__create_preview_target_git_repo_api(gitops_config)
         with GitRepo(preview_target_git_repo_api) as preview_target_git_repo:
-            preview_target_git_repo.clone(gitops_config.preview_target_branch)
+            preview_target_git_repo.clone(gitops_config.preview_target_branch, sparse_paths=preview_target_sparse_paths)
 
             if gitops_config.is_preview_template_equal_target():
                 preview_template_repo = preview_target_git_repo
@@ -67,7 +98,10 @@ class CreatePreviewCommand(Command):
             else:
                 preview_template_git_repo_api = self.__create_preview_template_git_repo_api(gitops_config)
                 with GitRepo(preview_template_git_repo_api) as preview_template_repo:
-                    preview_template_repo.clone(gitops_config.preview_template_branch)
+                    preview_template_repo.clone(
+                        gitops_config.preview_template_branch,
+                        sparse_paths=[gitops_config.preview_template_path],
+                    )
                     created_new_preview = self.__create_preview_from_template_if_not_existing(
                         preview_template_repo,
                         preview_target_git_repo,
@@ -104,12 +138,17 @@ class CreatePreviewCommand(Command):
             self.__args.git_author_name,
             self.__args.git_author_email,
             message,
+            paths=git_repo.get_changed_paths(),
         )
         git_repo.pull_rebase()
         git_repo.push()
 
     def __get_gitops_config(self) -> GitOpsConfig:
-        return load_gitops_config(self.__args, self.__args.organisation, self.__args.repository_name)
+        if self.__gitops_config is None:
+            self.__gitops_config = load_gitops_config(
+                self.__args, self.__args.organisation, self.__args.repository_name
+            )
+        return self.__gitops_config
 
     def __create_preview_template_git_repo_api(self, gitops_config: GitOpsConfig) -> GitRepoApi:
         return GitRepoApiFactory.create(
@@ -142,7 +181,9 @@ class CreatePreviewCommand(Command):
         if not Path(full_preview_template_folder_path).is_dir():
             raise GitOpsException(f"The preview template folder does not exist: {gitops_config.preview_template_path}")
         logging.info("Using the preview template folder: %s", gitops_config.preview_template_path)
-        shutil.copytree(full_preview_template_folder_path, full_preview_folder_path)
+        with span("preview.copy_template"):
+            shutil.copytree(full_preview_template_folder_path, full_preview_folder_path)
+        target_git_repo.mark_changed(preview_folder_path)
         return True
 
     def __replace_values(self, git_repo: GitRepo, gitops_config: GitOpsConfig) -> bool:
@@ -151,24 +192,16 @@ class CreatePreviewCommand(Command):
         context = GitOpsConfig.Replacement.PreviewContext(gitops_config, preview_id, self.__args.git_hash)
         any_value_replaced = False
         for file, replacements in gitops_config.replacements.items():
-            for replacement in replacements:
-                replacement_value = replacement.get_value(context)
-                value_replaced = self.__update_yaml_file(
-                    git_repo,
-                    f"{preview_folder_path}/{file}",
-                    replacement.path,
-                    replacement_value,
-                )
-                if value_replaced:
+            values = {replacement.path: replacement.get_value(context) for replacement in replacements}
+            replaced_values = self.__update_yaml_file_values(git_repo, f"{preview_folder_path}/{file}", values)
+            if replaced_values:
+                git_repo.mark_changed(f"{preview_folder_path}/{file}")
+            for key, value in values.items():
+                if key in replaced_values:
                     any_value_replaced = True
-                    logging.info(
-                        "Replaced property '%s' in '%s' with value: %s",
-                        replacement.path,
-                        file,
-                        replacement_value,
-                    )
+                    logging.info("Replaced property '%s' in '%s' with value: %s", key, file, value)
                 else:
-                    logging.info("Keep property '%s' in '%s' value: %s", replacement.path, file, replacement_value)
+                    logging.info("Keep property '%s' in '%s' value: %s", key, file, value)
         return any_value_replaced
 
     def __create_preview_info_file(self, gitops_config: GitOpsConfig) -> None:
@@ -180,17 +213,17 @@ class CreatePreviewCommand(Command):
                 "routeHost": gitops_config.get_preview_host(preview_id),
                 "namespace": gitops_config.get_preview_namespace(preview_id),
             },
-            "/tmp/gitopscli-preview-info.yaml",  # noqa: S108
+            get_preview_info_file(),
         )
 
     @staticmethod
-    def __update_yaml_file(git_repo: GitRepo, file_path: str, key: str, value: Any) -> bool:
+    def __update_yaml_file_values(git_repo: GitRepo, file_path: str, values: dict[str, Any]) -> dict[str, Any]:
         full_file_path = git_repo.get_full_file_path(file_path)
         try:
-            return update_yaml_file(full_file_path, key, value)
+            return update_yaml_file_values(full_file_path, values)
         except (FileNotFoundError, IsADirectoryError) as ex:
             raise GitOpsException(f"No such file: {file_path}") from ex
         except YAMLException as ex:
             raise GitOpsException(f"Error loading file: {file_path}") from ex
-        except KeyError as ex:
-            raise GitOpsException(f"Key '{key}' not found in file: {file_path}") from ex
+        except YAMLKeyError as ex:
+            raise GitOpsException(f"Key '{ex.key}' not found in file: {file_path}") from ex
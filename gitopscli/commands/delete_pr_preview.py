@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from gitopscli.git_api import GitApiConfig
 
 from .command import Command
+from .common import load_gitops_config
 from .delete_preview import DeletePreviewCommand
 
+if TYPE_CHECKING:
+    from gitopscli.gitops_config import GitOpsConfig
+
 
 class DeletePrPreviewCommand(Command):
     @dataclass(frozen=True)
@@ -25,6 +30,15 @@ class DeletePrPreviewCommand(Command):
 
     def __init__(self, args: DeletePrPreviewCommand.Args) -> None:
         self.__args = args
+        self.__gitops_config: GitOpsConfig | None = None
+
+    def get_written_repositories(self) -> list[tuple[str, str]]:
+        if self.__gitops_config is None:
+            self.__gitops_config = load_gitops_config(
+                self.__args, self.__args.organisation, self.__args.repository_name
+            )
+        gitops_config = self.__gitops_config
+        return [(gitops_config.preview_target_organisation, gitops_config.preview_target_repository)]
 
     def execute(self) -> None:
         args = self.__args
@@ -43,4 +57,5 @@ class DeletePrPreviewCommand(Command):
                 preview_id=args.branch,  # use branch as preview id
                 expect_preview_exists=args.expect_preview_exists,
             ),
+            self.__gitops_config,  # already loaded if the written repositories were determined
         ).execute()
@@ -31,8 +31,13 @@ class DeletePreviewCommand(Command):
         preview_id: str
         expect_preview_exists: bool
 
-    def __init__(self, args: DeletePreviewCommand.Args) -> None:
+    def __init__(self, args: DeletePreviewCommand.Args, gitops_config: GitOpsConfig | None = None) -> None:
         self.__args = args
+        self.__gitops_config = gitops_config  # loaded on first use if not given
+
+    def get_written_repositories(self) -> list[tuple[str, str]]:
+        gitops_config = self.__get_gitops_config()
+        return [(gitops_config.preview_target_organisation, gitops_config.preview_target_repository)]
 
     def execute(self) -> None:
         gitops_config = self.__get_gitops_config()
@@ -40,9 +45,8 @@ class DeletePreviewCommand(Command):
 
         preview_target_git_repo_api = self.__create_preview_target_git_repo_api(gitops_config)
         with GitRepo(preview_target_git_repo_api) as preview_target_git_repo:
-            preview_target_git_repo.clone(gitops_config.preview_target_branch)
-
             preview_folder_path = gitops_config.get_preview_folder_path(preview_id)
+            preview_target_git_repo.clone(gitops_config.preview_target_branch, sparse_paths=[preview_folder_path])
             logging.info("Preview folder: %s", preview_folder_path)
 
             preview_folder_exists = self.__delete_folder_if_exists(preview_target_git_repo, preview_folder_path)
@@ -62,7 +66,11 @@ class DeletePreviewCommand(Command):
             )
 
     def __get_gitops_config(self) -> GitOpsConfig:
-        return load_gitops_config(self.__args, self.__args.organisation, self.__args.repository_name)
+        if self.__gitops_config is None:
+            self.__gitops_config = load_gitops_config(
+                self.__args, self.__args.organisation, self.__args.repository_name
+            )
+        return self.__gitops_config
 
     def __create_preview_target_git_repo_api(self, gitops_config: GitOpsConfig) -> GitRepoApi:
         return GitRepoApiFactory.create(
@@ -78,6 +86,7 @@ class DeletePreviewCommand(Command):
             self.__args.git_author_name,
             self.__args.git_author_email,
             message,
+            paths=git_repo.get_changed_paths(),
         )
         git_repo.pull_rebase()
         git_repo.push()
@@ -88,4 +97,5 @@ class DeletePreviewCommand(Command):
         if not Path(folder_full_path).exists():
             return False
         shutil.rmtree(folder_full_path, ignore_errors=True)
+        git_repo.mark_changed(folder_name)
         return True
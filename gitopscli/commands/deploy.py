@@ -7,8 +7,11 @@ from dataclasses import dataclass
 from typing import Any, Literal
 
 from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApi, GitRepoApiFactory
+from gitopscli.git_api.http_session_registry import get_http_session_registry
+from gitopscli.git_api.merge_readiness_poller import MergeReadinessPoller
 from gitopscli.gitops_exception import GitOpsException
-from gitopscli.io_api.yaml_util import YAMLException, update_yaml_file, yaml_dump
+from gitopscli.io_api.yaml_util import YAMLException, update_yaml_values, yaml_dump
+from gitopscli.tracing import get_current_trace
 
 from .command import Command
 
@@ -43,10 +46,13 @@ class DeployCommand(Command):
         self.__args = args
         self.__commit_hashes: list[str] = []
 
+    def get_written_repositories(self) -> list[tuple[str, str]]:
+        return [(self.__args.organisation, self.__args.repository_name)]
+
     def execute(self) -> None:
         git_repo_api = self.__create_git_repo_api()
         with GitRepo(git_repo_api) as git_repo:
-            git_repo.clone()
+            git_repo.clone(sparse_paths=[])  # the file is read and committed without checking it out
 
             if self.__args.create_pr:
                 pr_branch = f"gitopscli-deploy-{str(uuid.uuid4())[:8]}"
@@ -66,6 +72,7 @@ class DeployCommand(Command):
             if self.__args.pr_labels:
                 git_repo_api.add_pull_request_label(pr_id, self.__args.pr_labels)
             if self.__args.auto_merge:
+                self.__wait_until_mergeable(git_repo_api, pr_id)
                 if self.__args.merge_parameters:
                     git_repo_api.merge_pull_request(pr_id, self.__args.merge_method, self.__args.merge_parameters)
                 else:
@@ -73,7 +80,22 @@ class DeployCommand(Command):
                 git_repo_api.delete_branch(pr_branch)
 
         if self.__args.json:
-            print(json.dumps({"commits": [{"hash": h} for h in self.__commit_hashes]}, indent=4))  # noqa: T201
+            output = {
+                "commits": [{"hash": h} for h in self.__commit_hashes],
+                "rate_limits": get_http_session_registry().rate_limiter.get_budgets(),
+                "phases": trace.get_phases() if (trace := get_current_trace()) else {},
+            }
+            print(json.dumps(output, indent=4))  # noqa: T201
+
+    def __wait_until_mergeable(self, git_repo_api: GitRepoApi, pr_id: int) -> None:
+        if self.__args.merge_parameters or self.__args.merge_method == "rebase":
+            # the provider decides when to merge (e.g. merge_when_pipeline_succeeds) or the merge request is rebased
+            # first, so the merge is attempted right away (merges which are not ready yet are retried)
+            return
+        # merging right after creation fails while the provider is still checking the pull request
+        merge_status = MergeReadinessPoller.from_env().wait_until_checked(git_repo_api, pr_id)
+        if merge_status is GitRepoApi.MergeStatus.BLOCKED:
+            raise GitOpsException(f"Pull request {pr_id} can't be merged (e.g. conflicts or failed checks)")
 
     def __create_git_repo_api(self) -> GitRepoApi:
         return GitRepoApiFactory.create(self.__args, self.__args.organisation, self.__args.repository_name)
@@ -81,27 +103,29 @@ class DeployCommand(Command):
     def __update_values(self, git_repo: GitRepo) -> dict[str, Any]:
         args = self.__args
         single_commit = args.single_commit or args.commit_message
-        full_file_path = git_repo.get_full_file_path(args.file)
-        updated_values = {}
-        for key, value in args.values.items():
-            try:
-                updated_value = update_yaml_file(full_file_path, key, value)
-            except (FileNotFoundError, IsADirectoryError) as ex:
-                raise GitOpsException(f"No such file: {args.file}") from ex
-            except YAMLException as ex:
-                raise GitOpsException(f"Error loading file: {args.file}") from ex
-            except KeyError as ex:
-                raise GitOpsException(str(ex)) from ex
-
-            if not updated_value:
-                logging.info("Yaml property %s already up-to-date", key)
-                continue
 
+        source = git_repo.read_file(args.file)
+        if source is None:
+            raise GitOpsException(f"No such file: {args.file}")
+
+        def commit_update(key: str, value: Any, updated_source: str) -> None:
             logging.info("Updated yaml property %s to %s", key, value)
-            updated_values[key] = value
+            self.__commit(git_repo, f"changed '{key}' to '{value}' in {args.file}", updated_source)
 
-            if not single_commit:
-                self.__commit(git_repo, f"changed '{key}' to '{value}' in {args.file}")
+        try:
+            updated_source, updated_values = update_yaml_values(
+                source, args.values, on_update=None if single_commit else commit_update
+            )
+        except YAMLException as ex:
+            raise GitOpsException(f"Error loading file: {args.file}") from ex
+        except KeyError as ex:
+            raise GitOpsException(str(ex)) from ex
+
+        for key, value in args.values.items():
+            if key not in updated_values:
+                logging.info("Yaml property %s already up-to-date", key)
+            elif single_commit:
+                logging.info("Updated yaml property %s to %s", key, value)
 
         if single_commit and updated_values:
             if args.commit_message:
@@ -113,7 +137,7 @@ class DeployCommand(Command):
                 updates_count = len(updated_values)
                 message = f"updated {updates_count} value{'s' if updates_count > 1 else ''} in {args.file}"
                 message += f"\n\n{yaml_dump(updated_values)}"
-            self.__commit(git_repo, message)
+            self.__commit(git_repo, message, updated_source)
 
         return updated_values
 
@@ -126,13 +150,14 @@ class DeployCommand(Command):
         description += f"```yaml\n{yaml_dump(updated_values)}\n```\n"
         return title, description
 
-    def __commit(self, git_repo: GitRepo, message: str) -> None:
-        commit_hash = git_repo.commit(
+    def __commit(self, git_repo: GitRepo, message: str, source: str) -> None:
+        commit_hash = git_repo.commit_files(
             self.__args.git_user,
             self.__args.git_email,
             self.__args.git_author_name,
             self.__args.git_author_email,
             message,
+            {self.__args.file: source},
         )
         if commit_hash:
             self.__commit_hashes.append(commit_hash)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApiFactory
+from gitopscli.git_api.git_push_retry_policy import get_push_retries
+from gitopscli.git_api.http_session_registry import get_http_session_registry
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.io_api.yaml_util import YAMLException, update_yaml_file_values, yaml_dump, yaml_file_load
+from gitopscli.tracing import get_current_trace, span, submit_in_context
+
+from .command import Command
+
+
+class DeployBatchCommand(Command):
+    @dataclass(frozen=True)
+    class Args(GitApiConfig):
+        git_user: str
+        git_email: str
+
+        git_author_name: str | None
+        git_author_email: str | None
+
+        manifest: str
+        single_commit: bool
+        max_workers: int
+        json: bool
+
+    @dataclass(frozen=True)
+    class RepositoryDeployment:
+        organisation: str
+        repository_name: str
+        files: dict[str, dict[str, Any]]
+
+    def __init__(self, args: DeployBatchCommand.Args) -> None:
+        self.__args = args
+
+    def get_written_repositories(self) -> list[tuple[str, str]]:
+        return [(deployment.organisation, deployment.repository_name) for deployment in self.__load_manifest()]
+
+    def execute(self) -> None:
+        start_time = time.perf_counter()
+        push_retries_before = get_push_retries()
+        deployments = self.__load_manifest()
+        with ThreadPoolExecutor(max_workers=max(1, self.__args.max_workers)) as executor:
+            futures = [submit_in_context(executor, self.__deploy_repository, deployment) for deployment in deployments]
+            reports: list[dict[str, Any]] = [future.result() for future in futures]
+
+        if self.__args.json:
+            report = {
+                "repositories": reports,
+                "push_retries": get_push_retries() - push_retries_before,
+                "rate_limits": get_http_session_registry().rate_limiter.get_budgets(),
+                "phases": trace.get_phases() if (trace := get_current_trace()) else {},
+                "duration_seconds": round(time.perf_counter() - start_time, 3),
+            }
+            # default=str for values YAML loads as other types than JSON has (e.g. dates and timestamps)
+            print(json.dumps(report, indent=4, default=str))  # noqa: T201
+
+        failed_repositories = [f"{r['organisation']}/{r['repository_name']}" for r in reports if "error" in r]
+        if failed_repositories:
+            raise GitOpsException(f"Deployment failed for repositories: {', '.join(failed_repositories)}")
+
+    def __load_manifest(self) -> list[DeployBatchCommand.RepositoryDeployment]:
+        manifest_file = self.__args.manifest
+        try:
+            manifest = yaml_file_load(manifest_file)
+        except (FileNotFoundError, IsADirectoryError) as ex:
+            raise GitOpsException(f"No such file: {manifest_file}") from ex
+        except YAMLException as ex:
+            raise GitOpsException(f"Error loading file: {manifest_file}") from ex
+
+        repositories = manifest.get("repositories") if isinstance(manifest, dict) else None
+        if not isinstance(repositories, list):
+            raise GitOpsException(f"'repositories' should be a list in {manifest_file}")
+        return [
+            self.__parse_repository_deployment(manifest_file, index, repository)
+            for index, repository in enumerate(repositories)
+        ]
+
+    @staticmethod
+    def __parse_repository_deployment(
+        manifest_file: str, index: int, repository: object
+    ) -> DeployBatchCommand.RepositoryDeployment:
+        error = (
+            f"'repositories.[{index}]' should contain 'organisation', 'repository_name' and 'files' "
+            f"(file path -> values) in {manifest_file}"
+        )
+        if not isinstance(repository, dict):
+            raise GitOpsException(error)
+        organisation = repository.get("organisation")
+        repository_name = repository.get("repository_name")
+        files = repository.get("files")
+        if not isinstance(organisation, str) or not isinstance(repository_name, str) or not isinstance(files, dict):
+            raise GitOpsException(error)
+        deployment_files: dict[str, dict[str, Any]] = {}
+        for file, values in files.items():
+            if not isinstance(values, dict):
+                raise GitOpsException(error)
+            deployment_files[str(file)] = {str(key): value for key, value in values.items()}
+        return DeployBatchCommand.RepositoryDeployment(
+            organisation=organisation, repository_name=repository_name, files=deployment_files
+        )
+
+    def __deploy_repository(self, deployment: DeployBatchCommand.RepositoryDeployment) -> dict[str, Any]:
+        start_time = time.perf_counter()
+        report: dict[str, Any] = {
+            "organisation": deployment.organisation,
+            "repository_name": deployment.repository_name,
+            "commits": [],
+            "updated_values": {},
+        }
+        try:
+            git_repo_api = GitRepoApiFactory.create(self.__args, deployment.organisation, deployment.repository_name)
+            with (
+                span("deploy.repository", repository=f"{deployment.organisation}/{deployment.repository_name}"),
+                GitRepo(git_repo_api) as git_repo,
+            ):
+                git_repo.clone(sparse_paths=list(deployment.files))
+                for file, values in deployment.files.items():
+                    updated_values = self.__update_values(git_repo, file, values)
+                    if updated_values:
+                        git_repo.mark_changed(file)
+                        report["updated_values"][file] = updated_values
+                        if not self.__args.single_commit:
+                            message = self.__create_commit_message(file, updated_values)
+                            self.__commit(git_repo, message, report)
+                if not report["updated_values"]:
+                    logging.info("All values already up-to-date: %s", deployment.repository_name)
+                else:
+                    if self.__args.single_commit:
+                        message = self.__create_single_commit_message(report["updated_values"])
+                        self.__commit(git_repo, message, report)
+                    git_repo.pull_rebase()
+                    git_repo.push()
+        except GitOpsException as ex:
+            logging.error("Deployment failed for %s: %s", deployment.repository_name, ex)  # noqa: TRY400
+            report["error"] = str(ex)
+        report["duration_seconds"] = round(time.perf_counter() - start_time, 3)
+        return report
+
+    @staticmethod
+    def __update_values(git_repo: GitRepo, file: str, values: dict[str, Any]) -> dict[str, Any]:
+        try:
+            updated_values = update_yaml_file_values(git_repo.get_full_file_path(file), values)
+        except (FileNotFoundError, IsADirectoryError) as ex:
+            raise GitOpsException(f"No such file: {file}") from ex
+        except YAMLException as ex:
+            raise GitOpsException(f"Error loading file: {file}") from ex
+        except KeyError as ex:
+            raise GitOpsException(str(ex)) from ex
+        for key, value in values.items():
+            if key in updated_values:
+                logging.info("Updated yaml property %s to %s in %s", key, value, file)
+            else:
+                logging.info("Yaml property %s already up-to-date in %s", key, file)
+        return updated_values
+
+    @staticmethod
+    def __create_commit_message(file: str, updated_values: dict[str, Any]) -> str:
+        if len(updated_values) == 1:
+            key, value = next(iter(updated_values.items()))
+            return f"changed '{key}' to '{value}' in {file}"
+        return f"updated {len(updated_values)} values in {file}\n\n{yaml_dump(updated_values)}"
+
+    @staticmethod
+    def __create_single_commit_message(updated_values: dict[str, dict[str, Any]]) -> str:
+        if len(updated_values) == 1:
+            file, values = next(iter(updated_values.items()))
+            return DeployBatchCommand.__create_commit_message(file, values)
+        updates_count = sum(len(values) for values in updated_values.values())
+        return f"updated {updates_count} values in {len(updated_values)} files\n\n{yaml_dump(updated_values)}"
+
+    def __commit(self, git_repo: GitRepo, message: str, report: dict[str, Any]) -> None:
+        commit_hash = git_repo.commit(
+            self.__args.git_user,
+            self.__args.git_email,
+            self.__args.git_author_name,
+            self.__args.git_author_email,
+            message,
+            paths=git_repo.get_changed_paths(),
+        )
+        if commit_hash:
+            report["commits"].append({"hash": commit_hash})
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import os
+import signal
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from socketserver import ThreadingUnixStreamServer
+from typing import TYPE_CHECKING, Any, TextIO
+
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.io_api.yaml_util import yaml_file_load
+from gitopscli.tracing import TRACE_FILE_ENV, start_trace
+
+from .command import Command
+from .create_preview import redirect_preview_info_file
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+    from socketserver import BaseServer
+
+    from .command_factory import CommandArgs
+
+MAX_REQUEST_SIZE = 1024 * 1024
+TOKEN_ENV = "GITOPSCLI_SERVE_TOKEN"  # noqa: S105 (name of the env variable)
+LOG_FORMAT = "%(levelname)-2s %(funcName)s: %(message)s"
+
+
+class ServeCommand(Command):
+    @dataclass(frozen=True)
+    class Args:
+        host: str
+        port: int
+        socket: str | None
+
+    def __init__(
+        self,
+        args: ServeCommand.Args,
+        parse_args: Callable[[list[str]], tuple[bool, CommandArgs]],
+        create_command: Callable[[CommandArgs], Command],
+    ) -> None:
+        self.__args = args
+        self.__parse_args = parse_args
+        self.__create_command = create_command
+        self.__token = os.environ.get(TOKEN_ENV) or None
+        self.__trace_file = os.environ.get(TRACE_FILE_ENV)
+        self.__trace_file_lock = threading.Lock()
+        self.__stdout = ThreadLocalOutput(sys.stdout)
+        self.__stderr = ThreadLocalOutput(sys.stderr)
+        self.__repository_locks: dict[tuple[str, str, str], threading.Lock] = {}
+        self.__repository_locks_lock = threading.Lock()
+        self.__server: BaseServer | None = None
+        self.__server_ready = threading.Event()
+
+    def execute(self) -> None:
+        server = self.__create_server()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, signal.default_int_handler)  # shut down gracefully
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = self.__stdout, self.__stderr
+        try:
+            with server:
+                self.__server = server
+                self.__server_ready.set()
+                server.serve_forever()
+        except KeyboardInterrupt:
+            logging.info("Shutting down")
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+            if self.__args.socket:
+                Path(self.__args.socket).unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        self.__server_ready.wait()
+        if self.__server:
+            self.__server.shutdown()
+
+    def is_authorized(self, authorization: str | None) -> bool:
+        """Check the `Authorization: Bearer <token>` header if a token is configured."""
+        if self.__token is None:
+            return True
+        return hmac.compare_digest((authorization or "").encode(), f"Bearer {self.__token}".encode())
+
+    def handle_request(self, request: Any) -> tuple[HTTPStatus, dict[str, Any]]:
+        """Execute a command request like `{"command": "deploy", "args": {"file": "values.yaml", ...}}`.
+
+        The args are the fields of the command's `Args` dataclass and are parsed like the corresponding
+        command line arguments (e.g. missing credentials default to the server's GITOPSCLI_* env variables).
+        Requests writing to the same repository are executed one after another. Each request is recorded as a
+        separate trace. The preview info of create-preview requests is returned as `preview_info`.
+        """
+        if not isinstance(request, dict) or not isinstance(request.get("command"), str):
+            return HTTPStatus.BAD_REQUEST, {"success": False, "error": "Request must contain a 'command'"}
+        command_name = request["command"]
+        args = request.get("args", {})
+        if command_name == "serve" or not isinstance(args, dict):
+            return HTTPStatus.BAD_REQUEST, {"success": False, "error": f"Invalid request for command: {command_name}"}
+
+        output = StringIO()
+        with (
+            self.__stdout.redirect(output),
+            self.__stderr.redirect(output),
+            self.__capture_logs(output),
+            tempfile.TemporaryDirectory(prefix="gitopscli-serve-") as tmp_dir,
+        ):
+            # each request gets its own preview info file, so concurrent create-preview requests don't overwrite it
+            preview_info_file = Path(tmp_dir) / "preview-info.yaml"
+            try:
+                verbose, command_args = self.__parse_args([command_name, *self.__to_raw_args(args)])
+            except SystemExit:
+                error = f"Invalid arguments for command: {command_name}"
+                return HTTPStatus.BAD_REQUEST, {"success": False, "error": error, "output": output.getvalue()}
+
+            logging.info("Executing command: %s", command_name)
+            trace = None
+            try:
+                command = self.__create_command(command_args)
+                with (
+                    start_trace(type(command).__name__) as trace,
+                    redirect_preview_info_file(str(preview_info_file)),
+                    self.__lock_repositories(command_args, command.get_written_repositories()),
+                ):
+                    command.execute()
+            except GitOpsException as ex:
+                if verbose:
+                    logging.exception(ex)  # noqa: TRY401
+                else:
+                    logging.error(ex)  # noqa: TRY400
+                error = str(ex)
+                return HTTPStatus.UNPROCESSABLE_ENTITY, {"success": False, "error": error, "output": output.getvalue()}
+            except Exception as ex:
+                logging.exception("Error executing command: %s", command_name)
+                error = f"Unexpected error: {ex}"
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"success": False, "error": error, "output": output.getvalue()}
+            finally:
+                if trace and self.__trace_file:
+                    with self.__trace_file_lock:
+                        trace.write_otlp_file(self.__trace_file)
+            response: dict[str, Any] = {"success": True, "output": output.getvalue()}
+            if preview_info_file.exists():
+                response["preview_info"] = dict(yaml_file_load(str(preview_info_file)))
+        return HTTPStatus.OK, response
+
+    def __create_server(self) -> BaseServer:
+        command = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                content_length = int(self.headers.get("Content-Length", 0))
+                if not command.is_authorized(self.headers.get("Authorization")):
+                    self.__reject(content_length, HTTPStatus.UNAUTHORIZED, "Unauthorized")
+                    return
+                # browsers can't send this content type cross-site without a CORS preflight
+                if self.headers.get_content_type() != "application/json":
+                    self.__reject(
+                        content_length, HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Content-Type must be application/json"
+                    )
+                    return
+                if content_length > MAX_REQUEST_SIZE:
+                    self.__reject(content_length, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request too large")
+                    return
+                try:
+                    request = json.loads(self.rfile.read(content_length))
+                except ValueError:
+                    self.__respond(HTTPStatus.BAD_REQUEST, {"success": False, "error": "Request must be JSON"})
+                    return
+                self.__respond(*command.handle_request(request))
+
+            def __reject(self, content_length: int, status: HTTPStatus, error: str) -> None:
+                # read the body first (up to the limit), otherwise a client which is still sending it gets a broken
+                # pipe or connection reset instead of the response
+                remaining = min(content_length, MAX_REQUEST_SIZE)
+                while remaining > 0 and (chunk := self.rfile.read(min(remaining, 64 * 1024))):
+                    remaining -= len(chunk)
+                self.close_connection = True
+                self.__respond(status, {"success": False, "error": error}, {"Connection": "close"})
+
+            def __respond(
+                self, status: HTTPStatus, body: dict[str, Any], headers: dict[str, str] | None = None
+            ) -> None:
+                response = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                logging.debug(format, *args)
+
+        if self.__args.socket:
+            Path(self.__args.socket).unlink(missing_ok=True)
+            logging.info("Serving on unix socket: %s", self.__args.socket)
+            return ThreadingUnixStreamServer(self.__args.socket, RequestHandler)
+        if self.__token is None:
+            raise GitOpsException(f"Serving on host and port requires a token in {TOKEN_ENV} (or use --socket)")
+        logging.info("Serving on http://%s:%s", self.__args.host, self.__args.port)
+        return ThreadingHTTPServer((self.__args.host, self.__args.port), RequestHandler)
+
+    @staticmethod
+    @contextmanager
+    def __capture_logs(output: TextIO) -> Generator[None, None, None]:
+        handler = logging.StreamHandler(output)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        thread_id = threading.get_ident()
+        handler.addFilter(lambda record: record.thread == thread_id)
+        logging.getLogger().addHandler(handler)
+        try:
+            yield
+        finally:
+            logging.getLogger().removeHandler(handler)
+
+    @contextmanager
+    def __lock_repositories(
+        self, command_args: CommandArgs, repositories: list[tuple[str, str]]
+    ) -> Generator[None, None, None]:
+        git_provider_url = getattr(command_args, "git_provider_url", None) or ""
+        repository_keys = sorted({(git_provider_url, organisation, name) for organisation, name in repositories})
+        with self.__repository_locks_lock:
+            locks = [self.__repository_locks.setdefault(key, threading.Lock()) for key in repository_keys]
+        for lock in locks:  # always acquired in the same (sorted) order to avoid deadlocks
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @staticmethod
+    def __to_raw_args(args: dict[str, Any]) -> list[str]:
+        raw_args = []
+        for key, value in args.items():
+            if value is None:
+                continue
+            raw_args.append(f"--{key.replace('_', '-')}")
+            raw_args.append(value if isinstance(value, str) else json.dumps(value))
+        return raw_args
+
+
+class ThreadLocalOutput:
+    """Replacement of sys.stdout/sys.stderr which writes to a separate buffer per request thread."""
+
+    def __init__(self, default: TextIO) -> None:
+        self.__default = default
+        self.__local = threading.local()
+
+    @contextmanager
+    def redirect(self, target: TextIO) -> Generator[None, None, None]:
+        self.__local.target = target
+        try:
+            yield
+        finally:
+            del self.__local.target
+
+    def write(self, text: str) -> int:
+        return self.__get_target().write(text)
+
+    def flush(self) -> None:
+        self.__get_target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__get_target(), name)
+
+    def __get_target(self) -> TextIO:
+        return getattr(self.__local, "target", self.__default)
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from urllib.parse import urlsplit
 
-from gitopscli.appconfig_api.app_tenant_config import create_app_tenant_config_from_repo
-from gitopscli.appconfig_api.root_repo import create_root_repo
+from gitopscli.appconfig_api.app_tenant_config import AppTenantConfig, create_app_tenant_config_from_repo
+from gitopscli.appconfig_api.root_repo import RootRepo, create_root_repo
+from gitopscli.appconfig_api.sync_state import SyncStateStore, TenantSyncState, get_applications_hash
 from gitopscli.commands.command import Command
-from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApiFactory
+from gitopscli.git_api import GitApiConfig, GitRepo, GitRepoApi, GitRepoApiFactory
 from gitopscli.gitops_exception import GitOpsException
-from gitopscli.io_api.yaml_util import yaml_file_dump
+from gitopscli.io_api.yaml_util import YAMLException, yaml_file_dump, yaml_load
+from gitopscli.tracing import submit_in_context
 
 
 class SyncAppsCommand(Command):
@@ -20,27 +24,44 @@ class SyncAppsCommand(Command):
         git_author_name: str | None
         git_author_email: str | None
 
-        organisation: str
-        repository_name: str
+        organisation: str | None
+        repository_name: str | None
 
         root_organisation: str
         root_repository_name: str
 
+        all_tenants: bool = False
+        max_workers: int = 4
+
     def __init__(self, args: SyncAppsCommand.Args) -> None:
         self.__args = args
 
+    def get_written_repositories(self) -> list[tuple[str, str]]:
+        return [(self.__args.root_organisation, self.__args.root_repository_name)]
+
     def execute(self) -> None:
-        _sync_apps_command(self.__args)
+        if self.__args.all_tenants:
+            _sync_all_tenants_command(self.__args)
+        else:
+            _sync_apps_command(self.__args)
 
 
 def _sync_apps_command(args: SyncAppsCommand.Args) -> None:
+    if not args.organisation or not args.repository_name:
+        raise GitOpsException("Please provide --organisation and --repository-name (or --all-tenants)")
     team_config_git_repo_api = GitRepoApiFactory.create(args, args.organisation, args.repository_name)
     root_config_git_repo_api = GitRepoApiFactory.create(args, args.root_organisation, args.root_repository_name)
+    sync_state_store = SyncStateStore.from_env()
     with (
         GitRepo(team_config_git_repo_api) as team_config_git_repo,
         GitRepo(root_config_git_repo_api) as root_config_git_repo,
     ):
-        __sync_apps(
+        tenant_commit = None
+        if sync_state_store:
+            tenant_commit = team_config_git_repo.get_remote_head_hash()
+            if __is_already_synced(sync_state_store, root_config_git_repo_api, team_config_git_repo, tenant_commit):
+                return
+        tenant_name, root_repo_tenant = __sync_apps(
             team_config_git_repo,
             root_config_git_repo,
             args.git_user,
@@ -48,6 +69,41 @@ def _sync_apps_command(args: SyncAppsCommand.Args) -> None:
             args.git_author_name,
             args.git_author_email,
         )
+        if sync_state_store and tenant_commit:
+            sync_state_store.put(
+                root_config_git_repo.get_clone_url(),
+                _get_sync_state_tenant_repo(team_config_git_repo.get_clone_url()),
+                TenantSyncState(tenant_name, tenant_commit, get_applications_hash(root_repo_tenant.list_apps())),
+            )
+
+
+def __is_already_synced(
+    sync_state_store: SyncStateStore,
+    root_config_git_repo_api: GitRepoApi,
+    team_config_git_repo: GitRepo,
+    tenant_commit: str,
+) -> bool:
+    """Whether the apps repository is still at the last synchronized commit and the root repository's tenant file
+    still has the synchronized applications (read via the API, so neither repository is cloned).
+    """
+    tenant_repo_url = team_config_git_repo.get_clone_url()
+    sync_state = sync_state_store.get(
+        root_config_git_repo_api.get_clone_url(), _get_sync_state_tenant_repo(tenant_repo_url)
+    )
+    if sync_state is None or sync_state.tenant_commit != tenant_commit:
+        return False
+    tenant_file = root_config_git_repo_api.get_file_content(f"apps/{sync_state.tenant_name}.yaml")
+    if tenant_file is None:
+        return False
+    try:
+        root_repo_tenant = AppTenantConfig(yaml=yaml_load(tenant_file))
+        applications_hash = get_applications_hash(root_repo_tenant.list_apps())
+    except (GitOpsException, YAMLException, KeyError, TypeError):
+        return False
+    if applications_hash != sync_state.applications_hash:
+        return False
+    logging.info("Apps repository %s already synchronized at commit %s", tenant_repo_url, tenant_commit)
+    return True
 
 
 def __sync_apps(
@@ -57,13 +113,14 @@ def __sync_apps(
     git_email: str,
     git_author_name: str | None,
     git_author_email: str | None,
-) -> None:
+) -> tuple[str, AppTenantConfig]:
     logging.info("Team config repository: %s", tenant_git_repo.get_clone_url())
     logging.info("Root config repository: %s", root_git_repo.get_clone_url())
     root_repo = create_root_repo(root_repo=root_git_repo)
-    root_repo_tenant = root_repo.get_tenant_by_repo_url(tenant_git_repo.get_clone_url())
-    if root_repo_tenant is None:
+    tenant_name = root_repo.get_tenant_name_by_repo_url(tenant_git_repo.get_clone_url())
+    if tenant_name is None:
         raise GitOpsException("Couldn't find config file for apps repository in root repository's 'apps/' directory")
+    root_repo_tenant = root_repo.tenants[tenant_name]
     tenant_from_repo = create_app_tenant_config_from_repo(tenant_repo=tenant_git_repo)
     logging.info(
         "Found %s app(s) in apps repository: %s",
@@ -71,10 +128,10 @@ def __sync_apps(
         ", ".join(tenant_from_repo.list_apps().keys()),
     )
     root_repo.validate_tenant(tenant_from_repo)
-    root_repo_tenant.merge_applications(tenant_from_repo)
-    if root_repo_tenant.dirty:
-        logging.info("Appling changes to: %s", root_repo_tenant.file_path)
-        yaml_file_dump(root_repo_tenant.yaml, root_repo_tenant.file_path)
+    root_repo.merge_applications(root_repo_tenant, tenant_from_repo)
+    if root_repo_tenant.dirty and yaml_file_dump(root_repo_tenant.yaml, root_repo_tenant.file_path):
+        logging.info("Applied changes to: %s", root_repo_tenant.file_path)
+        root_git_repo.mark_changed(f"apps/{tenant_name}.yaml")
         logging.info("Commiting and pushing changes to %s", root_git_repo.get_clone_url())
         __commit_and_push(
             tenant_git_repo,
@@ -87,6 +144,7 @@ def __sync_apps(
         )
     else:
         logging.info("No changes applied to %s", root_repo_tenant.file_path)
+    return tenant_name, root_repo_tenant
 
 
 def __commit_and_push(
@@ -105,6 +163,154 @@ def __commit_and_push(
         git_author_name,
         git_author_email,
         f"{author} updated " + app_file_name,
+        paths=root_config_git_repo.get_changed_paths(),
     )
     root_config_git_repo.pull_rebase()
     root_config_git_repo.push()
+
+
+@dataclass(frozen=True)
+class _TenantFromRepo:
+    config: AppTenantConfig
+    author: str
+    commit: str | None  # only tracked with a sync state store
+    already_synced: bool = False  # unchanged since the last synchronization, not cloned
+
+
+def _sync_all_tenants_command(args: SyncAppsCommand.Args) -> None:
+    if args.organisation or args.repository_name:
+        raise GitOpsException("Please provide either --all-tenants or --organisation and --repository-name")
+    root_config_git_repo_api = GitRepoApiFactory.create(args, args.root_organisation, args.root_repository_name)
+    sync_state_store = SyncStateStore.from_env()
+    with GitRepo(root_config_git_repo_api) as root_config_git_repo:
+        root_repo_url = root_config_git_repo.get_clone_url()
+        logging.info("Root config repository: %s", root_repo_url)
+        root_repo = create_root_repo(root_repo=root_config_git_repo)
+        tenants_from_repos, failed_tenants = __load_tenants_from_repos(args, root_repo, root_repo_url, sync_state_store)
+        root_repo.validate_tenants({name: tenant.config for name, tenant in tenants_from_repos.items()})
+        updates = []
+        for tenant_name, tenant_from_repo in tenants_from_repos.items():
+            root_repo_tenant = root_repo.tenants[tenant_name]
+            root_repo.merge_applications(root_repo_tenant, tenant_from_repo.config)
+            if root_repo_tenant.dirty and yaml_file_dump(root_repo_tenant.yaml, root_repo_tenant.file_path):
+                logging.info("Applied changes to: %s", root_repo_tenant.file_path)
+                root_config_git_repo.mark_changed(f"apps/{tenant_name}.yaml")
+                updates.append(f"{tenant_from_repo.author} updated apps/{tenant_name}.yaml")
+        if updates:
+            logging.info("Commiting and pushing changes to %s", root_repo_url)
+            root_config_git_repo.commit(
+                args.git_user,
+                args.git_email,
+                args.git_author_name,
+                args.git_author_email,
+                f"Synchronized applications of {len(updates)} tenant(s)\n\n" + "\n".join(updates),
+                paths=root_config_git_repo.get_changed_paths(),
+            )
+            root_config_git_repo.pull_rebase()
+            root_config_git_repo.push()
+        else:
+            logging.info("No changes applied to root config repository")
+        if sync_state_store:
+            for tenant_name, tenant_from_repo in tenants_from_repos.items():
+                if tenant_from_repo.commit:
+                    applications_hash = get_applications_hash(root_repo.tenants[tenant_name].list_apps())
+                    sync_state_store.put(
+                        root_repo_url,
+                        _get_sync_state_tenant_repo(root_repo.tenants[tenant_name].repo_url),
+                        TenantSyncState(tenant_name, tenant_from_repo.commit, applications_hash),
+                    )
+    if failed_tenants:
+        raise GitOpsException(f"Synchronization failed for tenants: {', '.join(failed_tenants)}")
+
+
+def __load_tenants_from_repos(
+    args: SyncAppsCommand.Args,
+    root_repo: RootRepo,
+    root_repo_url: str,
+    sync_state_store: SyncStateStore | None,
+) -> tuple[dict[str, _TenantFromRepo], list[str]]:
+    """Clone the apps config repositories of all tenants in parallel and return their config and last author.
+
+    A tenant whose repository can't be loaded is skipped (and returned as failed), so it doesn't block the others.
+    Tenants that are unchanged since the last synchronization (see `SyncStateStore`) are skipped without cloning.
+    """
+
+    def load_tenant_from_repo(root_repo_tenant: AppTenantConfig) -> _TenantFromRepo:
+        return __load_tenant_from_repo(args, root_repo_tenant, root_repo_url, sync_state_store)
+
+    with ThreadPoolExecutor(max_workers=max(1, args.max_workers)) as executor:
+        futures: dict[str, Future[_TenantFromRepo]] = {
+            tenant_name: submit_in_context(executor, load_tenant_from_repo, tenant)
+            for tenant_name, tenant in root_repo.tenants.items()
+        }
+    tenants_from_repos: dict[str, _TenantFromRepo] = {}
+    failed_tenants = []
+    for tenant_name, future in futures.items():
+        try:
+            tenant_from_repo = future.result()
+        except GitOpsException as ex:
+            logging.error("Loading apps config repository of tenant %s failed: %s", tenant_name, ex)  # noqa: TRY400
+            failed_tenants.append(tenant_name)
+            continue
+        if not tenant_from_repo.already_synced:
+            tenants_from_repos[tenant_name] = tenant_from_repo
+    return tenants_from_repos, failed_tenants
+
+
+def __load_tenant_from_repo(
+    args: SyncAppsCommand.Args,
+    root_repo_tenant: AppTenantConfig,
+    root_repo_url: str,
+    sync_state_store: SyncStateStore | None,
+) -> _TenantFromRepo:
+    repo_url = root_repo_tenant.repo_url
+    organisation, repository_name = _get_organisation_and_repository_name(repo_url)
+    tenant_git_repo_api = GitRepoApiFactory.create(args, organisation, repository_name)
+    with GitRepo(tenant_git_repo_api) as tenant_git_repo:
+        tenant_commit = None
+        if sync_state_store:
+            tenant_commit = tenant_git_repo.get_remote_head_hash()
+            sync_state = sync_state_store.get(root_repo_url, _get_sync_state_tenant_repo(repo_url))
+            if (
+                sync_state
+                and sync_state.tenant_commit == tenant_commit
+                and sync_state.applications_hash == get_applications_hash(root_repo_tenant.list_apps())
+            ):
+                logging.info("Apps repository %s already synchronized at commit %s", repo_url, tenant_commit)
+                return _TenantFromRepo(root_repo_tenant, "", tenant_commit, already_synced=True)
+        tenant_from_repo = create_app_tenant_config_from_repo(tenant_repo=tenant_git_repo)
+        logging.info(
+            "Found %s app(s) in apps repository %s: %s",
+            len(tenant_from_repo.list_apps().keys()),
+            repo_url,
+            ", ".join(tenant_from_repo.list_apps().keys()),
+        )
+        return _TenantFromRepo(tenant_from_repo, tenant_git_repo.get_author_from_last_commit(), tenant_commit)
+
+
+def _get_sync_state_tenant_repo(repo_url: str) -> str:
+    """Identifies an apps repository in the `SyncStateStore`, e.g. `https://github.com/Org/Repo.git` -> `org/repo`.
+
+    A single repository is synchronized by the provider's clone URL and `--all-tenants` by the URL of the root
+    repository's tenant file. These may differ in form (e.g. `.git` suffix, SSH or case), so both are normalized.
+    """
+    organisation, repository_name = _get_organisation_and_repository_name(repo_url)
+    return f"{organisation}/{repository_name}".lower()
+
+
+def _get_organisation_and_repository_name(repo_url: str) -> tuple[str, str]:
+    """Organisation and repository name of a clone URL, e.g. `https://github.com/org/repo.git` -> (org, repo).
+
+    Supports Bitbucket Server (`/scm/<project>/<repo>.git`), Azure DevOps (`/<org>/<project>/_git/<repo>`),
+    GitLab subgroups (`/<group>/<subgroup>/<repo>.git`) and SSH URLs (`git@host:org/repo.git`).
+    """
+    path = urlsplit(repo_url).path if "://" in repo_url else repo_url.partition(":")[2]
+    parts = [part for part in path.removesuffix(".git").split("/") if part]
+    if "_git" in parts[1:-1]:
+        index = parts.index("_git")
+        parts = [parts[index - 1], parts[index + 1]]
+    elif parts and parts[0] == "scm":
+        parts = parts[1:]
+    if len(parts) < 2:  # noqa: PLR2004
+        raise GitOpsException(f"Cannot determine organisation and repository name of '{repo_url}'")
+    return "/".join(parts[:-1]), parts[-1]
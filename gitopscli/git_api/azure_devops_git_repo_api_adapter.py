@@ -1,19 +1,21 @@
-from collections.abc import Callable
 from typing import Any, Literal
 
 from azure.devops.connection import Connection
 from azure.devops.credentials import BasicAuthentication
+from azure.devops.v7_0.git.git_client import GitClient
 from azure.devops.v7_0.git.models import (
     Comment,
     GitPullRequest,
     GitPullRequestCommentThread,
     GitPullRequestCompletionOptions,
+    GitVersionDescriptor,
 )
 from msrest.exceptions import ClientException
 
 from gitopscli.gitops_exception import GitOpsException
 
 from .git_repo_api import GitRepoApi
+from .http_session_registry import HttpSessionRegistry
 
 
 class AzureDevOpsGitRepoApiAdapter(GitRepoApi):
@@ -26,7 +28,7 @@ class AzureDevOpsGitRepoApiAdapter(GitRepoApi):
         password: str | None,
         organisation: str,
         repository_name: str,
-        sleep_func: Callable[[int], None] | None,
+        session_registry: HttpSessionRegistry | None = None,
     ) -> None:
         # In Azure DevOps:
         # git_provider_url = https://dev.azure.com/organization (e.g. https://dev.azure.com/org)
@@ -38,17 +40,32 @@ class AzureDevOpsGitRepoApiAdapter(GitRepoApi):
         self.__project_name = organisation  # In Azure DevOps, "organisation" param is actually the project
         self.__repository_name = repository_name
 
-        if not sleep_func:
-            raise GitOpsException("Sleep function is required for Azure DevOps")
-
-        self.__sleep_func = sleep_func
-
         if not password:
             raise GitOpsException("Password (Personal Access Token) is required for Azure DevOps")
 
+        if session_registry:
+            # the Azure DevOps SDK can't be given a session, but its git client keeps (per thread) one alive
+            registry = session_registry
+            self.__git_client = registry.get_client(
+                ("azure_devops", self.__base_url, self.__username, password),
+                lambda: self.__create_git_client(password, registry),
+            )
+        else:
+            self.__git_client = self.__create_git_client(password)
+
+    def __create_git_client(self, password: str, session_registry: HttpSessionRegistry | None = None) -> GitClient:
         credentials = BasicAuthentication(self.__username, password)
-        self.__connection = Connection(base_url=self.__base_url, creds=credentials)
-        self.__git_client = self.__connection.clients.get_git_client()
+        connection = Connection(base_url=self.__base_url, creds=credentials)
+        git_client = connection.clients.get_git_client()
+        if session_registry:
+            git_client.config.connection.timeout = session_registry.timeout_seconds
+
+            def configure_session(session: Any, *_: Any, **kwargs: Any) -> dict[str, Any]:
+                session_registry.mount_rate_limited_adapter(session)
+                return kwargs
+
+            git_client.config.session_configuration_callback = configure_session
+        return git_client
 
     def get_username(self) -> str | None:
         return self.__username
@@ -114,10 +131,6 @@ class AzureDevOpsGitRepoApiAdapter(GitRepoApi):
         merge_parameters: dict[str, Any] | None = None,
     ) -> None:
         try:
-            # Required because of race-condition before PullRequest is first properly created+queued
-            # and the PullRequest completion can be requested
-            self.__sleep_func(3)
-
             pr = self.__git_client.get_pull_request(
                 repository_id=self.__repository_name,
                 pull_request_id=pr_id,
@@ -165,6 +178,30 @@ class AzureDevOpsGitRepoApiAdapter(GitRepoApi):
         except Exception as ex:
             raise GitOpsException(f"Error connecting to '{self.__base_url}'") from ex
 
+    def get_pull_request_merge_status(self, pr_id: int) -> GitRepoApi.MergeStatus:
+        try:
+            pr = self.__git_client.get_pull_request(
+                repository_id=self.__repository_name,
+                pull_request_id=pr_id,
+                project=self.__project_name,
+            )
+        except ClientException as ex:
+            error_msg = str(ex)
+            if "401" in error_msg:
+                raise GitOpsException("Bad credentials") from ex
+            if "404" in error_msg:
+                raise GitOpsException(f"Pull request with ID '{pr_id}' does not exist") from ex
+            raise GitOpsException(f"Error getting pull request: {error_msg}") from ex
+        except Exception as ex:
+            raise GitOpsException(f"Error connecting to '{self.__base_url}'") from ex
+
+        # the pull request can only be completed once its merge is no longer queued
+        if pr.merge_status in (None, "notSet", "queued"):
+            return GitRepoApi.MergeStatus.PENDING
+        if pr.merge_status == "succeeded":
+            return GitRepoApi.MergeStatus.READY
+        return GitRepoApi.MergeStatus.BLOCKED
+
     def add_pull_request_comment(self, pr_id: int, text: str, parent_id: int | None = None) -> None:  # noqa: ARG002
         try:
             comment = Comment(content=text, comment_type="text")
@@ -254,6 +291,28 @@ class AzureDevOpsGitRepoApiAdapter(GitRepoApi):
         # This operation is silently ignored as labels aren't critical for GitOps operations
         pass
 
+    def get_file_content(self, path: str, ref: str | None = None) -> str | None:
+        try:
+            version_descriptor = GitVersionDescriptor(version=ref, version_type="branch") if ref else None
+            item = self.__git_client.get_item(
+                repository_id=self.__repository_name,
+                path=path,
+                project=self.__project_name,
+                version_descriptor=version_descriptor,
+                include_content=True,
+            )
+            return str(item.content)
+
+        except ClientException as ex:
+            error_msg = str(ex)
+            if "401" in error_msg:
+                raise GitOpsException("Bad credentials") from ex
+            if "404" in error_msg or getattr(ex, "type_key", None) == "GitItemNotFoundException":
+                return None
+            raise GitOpsException(f"Error reading file '{path}': {error_msg}") from ex
+        except Exception as ex:
+            raise GitOpsException(f"Error connecting to '{self.__base_url}'") from ex
+
     def __get_default_branch(self) -> str:
         try:
             repo = self.__git_client.get_repository(
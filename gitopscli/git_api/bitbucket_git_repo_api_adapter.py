@@ -1,3 +1,4 @@
+from http import HTTPStatus
 from typing import Any, Literal
 
 import requests
@@ -6,6 +7,7 @@ from atlassian import Bitbucket
 from gitopscli.gitops_exception import GitOpsException
 
 from .git_repo_api import GitRepoApi
+from .http_session_registry import HttpSessionRegistry
 
 
 class BitbucketGitRepoApiAdapter(GitRepoApi):
@@ -16,8 +18,19 @@ class BitbucketGitRepoApiAdapter(GitRepoApi):
         password: str | None,
         organisation: str,
         repository_name: str,
+        session_registry: HttpSessionRegistry | None = None,
     ) -> None:
-        self.__bitbucket = Bitbucket(git_provider_url, username, password)
+        if session_registry:
+            self.__bitbucket = Bitbucket(
+                git_provider_url,
+                username,
+                password,
+                # the session is keyed by credentials too, as atlassian stores them in the session
+                session=session_registry.get_session(git_provider_url, username, password),
+                timeout=session_registry.timeout_seconds,
+            )
+        else:
+            self.__bitbucket = Bitbucket(git_provider_url, username, password)
         self.__git_provider_url = git_provider_url
         self.__organisation = organisation
         self.__repository_name = repository_name
@@ -99,6 +112,16 @@ class BitbucketGitRepoApiAdapter(GitRepoApi):
             pull_request["version"],
         )
 
+    def get_pull_request_merge_status(self, pr_id: int) -> GitRepoApi.MergeStatus:
+        merge_check = self.__bitbucket.is_pull_request_can_be_merged(self.__organisation, self.__repository_name, pr_id)
+        if "errors" in merge_check:
+            raise GitOpsException(merge_check["errors"][0]["message"])
+        if merge_check.get("outcome") == "UNKNOWN":  # merge not computed yet
+            return GitRepoApi.MergeStatus.PENDING
+        if merge_check.get("canMerge"):
+            return GitRepoApi.MergeStatus.READY
+        return GitRepoApi.MergeStatus.BLOCKED
+
     def add_pull_request_comment(self, pr_id: int, text: str, parent_id: int | None = None) -> None:
         pull_request_comment = self.__bitbucket.add_pull_request_comment(
             self.__organisation,
@@ -136,3 +159,14 @@ class BitbucketGitRepoApiAdapter(GitRepoApi):
 
     def add_pull_request_label(self, pr_id: int, pr_labels: list[str]) -> None:
         pass
+
+    def get_file_content(self, path: str, ref: str | None = None) -> str | None:
+        try:
+            content = self.__bitbucket.get_content_of_file(self.__organisation, self.__repository_name, path, at=ref)
+        except requests.exceptions.HTTPError as ex:
+            if ex.response is not None and ex.response.status_code == HTTPStatus.NOT_FOUND:
+                return None
+            raise GitOpsException(f"Error reading file '{path}': {ex}") from ex
+        except requests.exceptions.RequestException as ex:
+            raise GitOpsException(f"Error connecting to '{self.__git_provider_url}'") from ex
+        return bytes(content).decode()
@@ -0,0 +1,160 @@
+import json
+import logging
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+METRICS_FILE_ENV = "GITOPSCLI_METRICS_FILE"
+LATENCY_BUCKETS_SECONDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class GitApiCallMetrics:
+    calls: int = 0
+    errors: dict[str, int] = field(default_factory=dict)  # by exception type
+    duration_seconds_sum: float = 0.0
+    duration_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_SECONDS) + 1))
+    sent_bytes: int = 0
+    received_bytes: int = 0
+
+
+_current_call: ContextVar[GitApiCallMetrics | None] = ContextVar("gitopscli_git_api_call", default=None)
+
+
+class GitApiMetrics:
+    """Call counts, latencies, errors and HTTP bytes transferred per git provider and `GitRepoApi` method.
+
+    Bytes are counted by the `RateLimitedHTTPAdapter`, so they are missing for GitHub (PyGithub brings its own
+    HTTP connections).
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__calls: dict[tuple[str, str], GitApiCallMetrics] = {}
+
+    @contextmanager
+    def measure(self, provider: str, method: str) -> Generator[None, None, None]:
+        with self.__lock:
+            call_metrics = self.__calls.setdefault((provider, method), GitApiCallMetrics())
+        token = _current_call.set(call_metrics)
+        start_time = time.perf_counter()
+        try:
+            yield
+        except Exception as ex:
+            self.__record_call(call_metrics, time.perf_counter() - start_time, type(ex).__name__)
+            raise
+        else:
+            self.__record_call(call_metrics, time.perf_counter() - start_time, None)
+        finally:
+            _current_call.reset(token)
+
+    def __record_call(self, call_metrics: GitApiCallMetrics, duration_seconds: float, error_type: str | None) -> None:
+        with self.__lock:
+            call_metrics.calls += 1
+            call_metrics.duration_seconds_sum += duration_seconds
+            call_metrics.duration_buckets[bisect_left(LATENCY_BUCKETS_SECONDS, duration_seconds)] += 1
+            if error_type:
+                call_metrics.errors[error_type] = call_metrics.errors.get(error_type, 0) + 1
+
+    def record_transfer(self, sent_bytes: int, received_bytes: int) -> None:
+        """Add the bytes of an HTTP request to the `GitRepoApi` call currently measured (if any)."""
+        call_metrics = _current_call.get()
+        if call_metrics is None:
+            return
+        with self.__lock:
+            call_metrics.sent_bytes += sent_bytes
+            call_metrics.received_bytes += received_bytes
+
+    def to_json(self) -> dict[str, Any]:
+        with self.__lock:
+            return {
+                "buckets_seconds": list(LATENCY_BUCKETS_SECONDS),
+                "calls": [
+                    {
+                        "provider": provider,
+                        "method": method,
+                        "calls": m.calls,
+                        "errors": dict(sorted(m.errors.items())),
+                        "duration_seconds_sum": round(m.duration_seconds_sum, 6),
+                        "duration_buckets": list(m.duration_buckets),
+                        "sent_bytes": m.sent_bytes,
+                        "received_bytes": m.received_bytes,
+                    }
+                    for (provider, method), m in sorted(self.__calls.items())
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format (e.g. for the node exporter's textfile collector)."""
+        lines = [
+            "# HELP gitopscli_git_api_calls_total Calls of the git provider API.",
+            "# TYPE gitopscli_git_api_calls_total counter",
+        ]
+        calls = self.to_json()["calls"]
+        lines.extend(f"gitopscli_git_api_calls_total{{{_labels(call)}}} {call['calls']}" for call in calls)
+        lines += [
+            "# HELP gitopscli_git_api_errors_total Failed calls of the git provider API by exception type.",
+            "# TYPE gitopscli_git_api_errors_total counter",
+        ]
+        for call in calls:
+            for exception, count in call["errors"].items():
+                lines.append(f'gitopscli_git_api_errors_total{{{_labels(call)},exception="{exception}"}} {count}')
+        lines += [
+            "# HELP gitopscli_git_api_call_duration_seconds Latency of the git provider API calls.",
+            "# TYPE gitopscli_git_api_call_duration_seconds histogram",
+        ]
+        for call in calls:
+            cumulative_count = 0
+            for bucket, count in zip((*LATENCY_BUCKETS_SECONDS, "+Inf"), call["duration_buckets"], strict=True):
+                cumulative_count += count
+                le = bucket if isinstance(bucket, str) else f"{bucket:g}"
+                lines.append(
+                    f'gitopscli_git_api_call_duration_seconds_bucket{{{_labels(call)},le="{le}"}} {cumulative_count}'
+                )
+            lines.append(
+                f"gitopscli_git_api_call_duration_seconds_sum{{{_labels(call)}}} {call['duration_seconds_sum']}"
+            )
+            lines.append(f"gitopscli_git_api_call_duration_seconds_count{{{_labels(call)}}} {call['calls']}")
+        for direction in ("sent", "received"):
+            lines += [
+                f"# HELP gitopscli_git_api_{direction}_bytes_total HTTP bytes {direction} by git provider API calls.",
+                f"# TYPE gitopscli_git_api_{direction}_bytes_total counter",
+            ]
+            for call in calls:
+                value = call[f"{direction}_bytes"]
+                lines.append(f"gitopscli_git_api_{direction}_bytes_total{{{_labels(call)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, file_path: str) -> None:
+        """Write the metrics as JSON (`.json` files) or in the Prometheus text format (all other files).
+
+        The file is replaced atomically, so a Prometheus textfile collector never reads a partially written file.
+        """
+        path = Path(file_path)
+        content = json.dumps(self.to_json(), indent=4) + "\n" if path.suffix == ".json" else self.to_prometheus()
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+            ) as tmp_file:
+                tmp_file.write(content)
+            Path(tmp_file.name).replace(path)
+        except OSError as ex:
+            logging.warning("Could not write metrics file: %s", ex)
+
+
+def _labels(call: dict[str, Any]) -> str:
+    return f'provider="{call["provider"]}",method="{call["method"]}"'
+
+
+_metrics = GitApiMetrics()
+
+
+def get_git_api_metrics() -> GitApiMetrics:
+    return _metrics
@@ -0,0 +1,131 @@
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+from git import GitError, Repo
+
+from gitopscli.gitops_exception import GitOpsException
+
+MIRROR_CACHE_DIR_ENV = "GITOPSCLI_MIRROR_CACHE_DIR"
+MIRROR_CACHE_MAX_SIZE_MB_ENV = "GITOPSCLI_MIRROR_CACHE_MAX_SIZE_MB"
+DEFAULT_MAX_SIZE_MB = 10240
+
+
+class GitMirrorCache:
+    """Local cache of bare repository mirrors (keyed by clone URL) used as clone source."""
+
+    def __init__(self, cache_dir: str, max_size_bytes: int) -> None:
+        self.__cache_dir = Path(cache_dir)
+        self.__max_size_bytes = max_size_bytes
+
+    @staticmethod
+    def from_env() -> "GitMirrorCache | None":
+        cache_dir = os.environ.get(MIRROR_CACHE_DIR_ENV)
+        if not cache_dir:
+            return None
+        max_size_mb = os.environ.get(MIRROR_CACHE_MAX_SIZE_MB_ENV, str(DEFAULT_MAX_SIZE_MB))
+        try:
+            max_size_bytes = int(max_size_mb) * 1024 * 1024
+        except ValueError as ex:
+            raise GitOpsException(f"Invalid value for {MIRROR_CACHE_MAX_SIZE_MB_ENV}: '{max_size_mb}'") from ex
+        return GitMirrorCache(cache_dir, max_size_bytes)
+
+    @contextmanager
+    def mirror(self, url: str, credentials_file: str | None = None) -> Generator[str, None, None]:
+        """Fetch new objects into the mirror of `url` and yield its path.
+
+        The mirror is locked while the context is active, so it is neither fetched nor evicted
+        by a concurrent gitopscli process while a working tree is being cloned from it.
+        """
+        self.__cache_dir.mkdir(parents=True, exist_ok=True)
+        mirror_dir = self.__cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.git"
+        with self.__lock(mirror_dir) as lock:
+            self.__fetch(mirror_dir, url, credentials_file)
+            mirror_dir.touch()  # last usage timestamp for LRU eviction
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            yield str(mirror_dir)
+        self.__evict_least_recently_used(keep=mirror_dir)
+
+    @contextmanager
+    def __lock(self, mirror_dir: Path) -> Generator[IO[str], None, None]:
+        lock_file = self.__lock_file(mirror_dir)
+        while True:
+            with lock_file.open("a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                if self.__is_current_lock(lock, lock_file):
+                    yield lock
+                    return
+            # the mirror was evicted and its lock file removed while waiting for the lock
+
+    @staticmethod
+    def __fetch(mirror_dir: Path, url: str, credentials_file: str | None) -> None:
+        is_new_mirror = not mirror_dir.is_dir()
+        try:
+            if is_new_mirror:
+                logging.info("Creating mirror of repository: %s", url)
+                repo = Repo.init(mirror_dir, mkdir=True, bare=True)
+                repo.git.remote("add", "origin", url)
+                repo.git.config("remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+            else:
+                logging.info("Fetching into mirror of repository: %s", url)
+                repo = Repo(mirror_dir)
+            git = repo.git(c=f"credential.helper={credentials_file}") if credentials_file else repo.git
+            git.fetch("--prune", "origin")
+        except GitError as ex:
+            if is_new_mirror:
+                shutil.rmtree(mirror_dir, ignore_errors=True)
+            raise GitOpsException(f"Error fetching '{url}' into mirror cache") from ex
+
+    def __evict_least_recently_used(self, keep: Path) -> None:
+        mirrors = []
+        for mirror_dir in self.__cache_dir.glob("*.git"):
+            try:
+                mirrors.append((mirror_dir.stat().st_mtime, mirror_dir))
+            except FileNotFoundError:
+                continue  # evicted by another process
+        total_size = 0
+        for _, mirror_dir in sorted(mirrors, reverse=True):
+            size = self.__get_dir_size(mirror_dir)
+            total_size += size
+            if total_size <= self.__max_size_bytes or mirror_dir == keep:
+                continue
+            lock_file = self.__lock_file(mirror_dir)
+            with lock_file.open("a") as lock:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # mirror in use by another process
+                if not self.__is_current_lock(lock, lock_file):
+                    continue  # evicted by another process
+                logging.info("Evicting mirror from cache: %s", mirror_dir)
+                shutil.rmtree(mirror_dir, ignore_errors=True)
+                lock_file.unlink(missing_ok=True)
+                total_size -= size
+
+    @staticmethod
+    def __lock_file(mirror_dir: Path) -> Path:
+        return mirror_dir.with_suffix(".lock")
+
+    @staticmethod
+    def __is_current_lock(lock: IO[str], lock_file: Path) -> bool:
+        try:
+            return os.fstat(lock.fileno()).st_ino == lock_file.stat().st_ino
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def __get_dir_size(path: Path) -> int:
+        size = 0
+        for dir_path, _, file_names in os.walk(path):  # entries removed by a concurrent eviction are skipped
+            for file_name in file_names:
+                try:
+                    size += (Path(dir_path) / file_name).stat().st_size
+                except FileNotFoundError:
+                    continue
+        return size
@@ -0,0 +1,26 @@
+import threading
+
+from .retry_policy import RetryPolicy
+
+PUSH_RETRY_ENV_PREFIX = "GITOPSCLI_PUSH"
+DEFAULT_PUSH_RETRY_POLICY = RetryPolicy(max_attempts=5, base_delay_seconds=0.5, max_delay_seconds=10.0)
+NO_PUSH_RETRY_POLICY = RetryPolicy(max_attempts=1, base_delay_seconds=0.0, max_delay_seconds=0.0)
+
+_retries_lock = threading.Lock()
+_retries = 0
+
+
+def get_push_retry_policy() -> RetryPolicy:
+    """How often and how long to wait before a rejected (non-fast-forward) push is retried."""
+    return RetryPolicy.from_env(PUSH_RETRY_ENV_PREFIX, DEFAULT_PUSH_RETRY_POLICY)
+
+
+def record_push_retry() -> None:
+    global _retries  # noqa: PLW0603
+    with _retries_lock:
+        _retries += 1
+
+
+def get_push_retries() -> int:
+    """Number of push retries of this process."""
+    return _retries
@@ -1,23 +1,46 @@
+import contextlib
 import locale
 import logging
-from pathlib import Path
+import re
+import time
+from collections.abc import Iterable, Mapping
+from io import BytesIO
+from pathlib import Path, PurePosixPath
 from types import TracebackType
 from typing import Literal
 
-from git import GitCommandError, GitError, Repo
+from git import Actor, Blob, Commit, Git, GitCommandError, GitError, IndexFile, Repo
+from git.index.typ import BaseIndexEntry, IndexEntry
+from gitdb.base import IStream
 from typing_extensions import Self  # noqa: UP035
 
 from gitopscli.gitops_exception import GitOpsException
 from gitopscli.io_api.tmp_dir import create_tmp_dir, delete_tmp_dir
+from gitopscli.tracing import traced
 
+from .git_mirror_cache import GitMirrorCache
+from .git_push_retry_policy import NO_PUSH_RETRY_POLICY, get_push_retry_policy, record_push_retry
 from .git_repo_api import GitRepoApi
 
+_SPARSE_CHECKOUT_PATTERN_SPECIAL_CHARS = re.compile(r"([\\*?\[])")
+
+
+def _to_sparse_checkout_pattern(path: str) -> str:
+    relative_path = str(PurePosixPath("/", path).relative_to("/"))
+    return "/" + _SPARSE_CHECKOUT_PATTERN_SPECIAL_CHARS.sub(r"\\\1", relative_path)
+
+
+def _is_rejected_by_newer_commits(ex: GitCommandError) -> bool:
+    # "! [rejected] master -> master (fetch first)" or "(non-fast-forward)", but not "! [remote rejected]" of hooks
+    return "[rejected]" in str(ex.stderr)
+
 
 class GitRepo:
     def __init__(self, git_repo_api: GitRepoApi) -> None:
         self.__api = git_repo_api
         self.__repo: Repo | None = None
         self.__tmp_dir: str | None = None
+        self.__changed_paths: set[str] = set()
 
     def __enter__(self) -> Self:
         return self
@@ -41,10 +64,16 @@ class GitRepo:
     def get_clone_url(self) -> str:
         return self.__api.get_clone_url()
 
-    def clone(self, branch: str | None = None) -> None:
+    @traced("git.clone")
+    def clone(self, branch: str | None = None, sparse_paths: list[str] | None = None) -> None:
+        """Clone the repository into a new temporary directory.
+
+        If `sparse_paths` are given, only these files and directories are checked out and only their
+        blobs are downloaded (partial clone). Changes outside these paths are not committed.
+        """
         self.__delete_tmp_dir()
         self.__tmp_dir = create_tmp_dir()
-        git_options = ["--depth=1"]
+        git_options: list[str] = []
         url = self.get_clone_url()
         if branch:
             logging.info("Cloning repository: %s (branch: %s)", url, branch)
@@ -52,22 +81,61 @@ class GitRepo:
             logging.info("Cloning repository: %s", url)
         username = self.__api.get_username()
         password = self.__api.get_password()
+        credentials_file = None
         try:
             if username is not None and password is not None:
                 credentials_file = self.__create_credentials_file(username, password)
                 git_options.append(f"--config credential.helper={credentials_file}")
             if branch:
                 git_options.append(f"--branch {branch}")
+            if sparse_paths is not None:
+                git_options.append("--no-checkout")
+            mirror_cache = GitMirrorCache.from_env()
+            if mirror_cache:
+                self.__clone_from_mirror(mirror_cache, url, git_options, credentials_file)
+            else:
+                remote_options = ["--depth=1"]
+                if sparse_paths is not None:
+                    remote_options.append("--filter=blob:none")
+                self.__repo = Repo.clone_from(
+                    url=url,
+                    to_path=f"{self.__tmp_dir}/repo",
+                    multi_options=[*remote_options, *git_options],
+                    allow_unsafe_options=True,
+                )
+            if sparse_paths is not None:
+                self.__sparse_checkout(sparse_paths)
+        except GitError as ex:
+            if branch:
+                raise GitOpsException(f"Error cloning branch '{branch}' of '{url}'") from ex
+            raise GitOpsException(f"Error cloning '{url}'") from ex
+
+    def __clone_from_mirror(
+        self,
+        mirror_cache: GitMirrorCache,
+        url: str,
+        git_options: list[str],
+        credentials_file: str | None,
+    ) -> None:
+        # no --depth and --filter here: local clones hardlink the mirror's objects instead of copying them
+        with mirror_cache.mirror(url, credentials_file) as mirror_dir:
             self.__repo = Repo.clone_from(
-                url=url,
+                url=mirror_dir,
                 to_path=f"{self.__tmp_dir}/repo",
                 multi_options=git_options,
                 allow_unsafe_options=True,
             )
-        except GitError as ex:
-            if branch:
-                raise GitOpsException(f"Error cloning branch '{branch}' of '{url}'") from ex
-            raise GitOpsException(f"Error cloning '{url}'") from ex
+        self.__repo.remote("origin").set_url(url)
+
+    def __sparse_checkout(self, sparse_paths: list[str]) -> None:
+        repo = self.__get_repo()
+        # non-cone patterns (anchored to the repository root) also allow single files
+        patterns = [_to_sparse_checkout_pattern(path) for path in sparse_paths]
+        if not patterns:
+            patterns = ["!/*"]  # git falls back to the top-level files for an empty pattern list
+        logging.info("Sparse checkout of: %s", ", ".join(sparse_paths))
+        repo.git.sparse_checkout("set", "--no-cone", *patterns)
+        repo.git.checkout()
 
     def new_branch(self, branch: str) -> None:
         logging.info("Creating new branch: %s", branch)
@@ -77,6 +145,15 @@ class GitRepo:
         except GitError as ex:
             raise GitOpsException(f"Error creating new branch '{branch}'.") from ex
 
+    def mark_changed(self, relative_path: str) -> None:
+        """Record that a file or directory of the working tree was written or deleted (see `get_changed_paths`)."""
+        self.__changed_paths.add(str(PurePosixPath(relative_path)))
+
+    def get_changed_paths(self) -> list[str]:
+        """The paths marked as changed since they were last committed, e.g. for `commit(..., paths=...)`."""
+        return sorted(self.__changed_paths)
+
+    @traced("git.commit")
     def commit(
         self,
         git_user: str,
@@ -84,12 +161,26 @@ class GitRepo:
         git_author_name: str | None,
         git_author_email: str | None,
         message: str,
+        paths: Iterable[str] | None = None,
     ) -> str | None:
+        """Commit all changes of the working tree, or only the changes of `paths` (relative to the repository root).
+
+        With `paths`, only these files and directories are staged, so git doesn't have to check the whole working
+        tree for changes. Without any paths, nothing is committed and git isn't invoked at all.
+        """
         self.__validate_git_author(git_author_name, git_author_email)
         repo = self.__get_repo()
+        pathspecs = None if paths is None else tuple(sorted({str(PurePosixPath(path)) for path in paths}))
+        if pathspecs is not None and not pathspecs:
+            return None
         try:
-            repo.git.add("--all")
-            if repo.index.diff("HEAD"):
+            if pathspecs is None:
+                repo.git.add("--all")
+                self.__changed_paths.clear()
+            else:
+                repo.git.add("--all", "--", *pathspecs)
+                self.__changed_paths.difference_update(pathspecs)
+            if repo.index.diff("HEAD", paths=pathspecs):
                 logging.info("Creating commit with message: %s", message)
                 repo.config_writer().set_value("user", "name", git_user).release()
                 repo.config_writer().set_value("user", "email", git_email).release()
@@ -102,10 +193,79 @@ class GitRepo:
             raise GitOpsException("Error creating commit.") from ex
         return None
 
+    @traced("git.commit")
+    def commit_files(
+        self,
+        git_user: str,
+        git_email: str,
+        git_author_name: str | None,
+        git_author_email: str | None,
+        message: str,
+        files: Mapping[str, str | None],
+    ) -> str | None:
+        """Commit the given file contents (None deletes the file) without using the working tree.
+
+        Blobs, trees and the commit are written directly into the object database, so this also
+        works for bare clones and for files outside of a sparse checkout. In a non-bare clone the
+        index and the checked out files are updated to the new commit afterwards.
+        """
+        self.__validate_git_author(git_author_name, git_author_email)
+        repo = self.__get_repo()
+        try:
+            parent = repo.head.commit
+            index = IndexFile.new(repo, parent.tree)
+            for path, content in files.items():
+                self.__stage_in_memory(repo, index, str(PurePosixPath(path)), content)
+            tree = index.write_tree()
+            if tree.binsha == parent.tree.binsha:
+                return None
+            logging.info("Creating commit with message: %s", message)
+            committer = Actor(git_user, git_email)
+            author = Actor(git_author_name, git_author_email) if git_author_name and git_author_email else committer
+            commit = Commit.create_from_tree(
+                repo,
+                tree,
+                message,
+                parent_commits=[parent],
+                author=author,
+                committer=committer,
+            )
+            if not repo.bare:  # before moving HEAD, so HEAD stays in sync with the working tree if this fails
+                repo.git.read_tree("-m", "-u", parent.hexsha, commit.hexsha)
+            repo.head.set_commit(commit, logmsg=f"commit: {message}")
+            with repo.config_writer() as config:  # committer identity for a later pull --rebase
+                config.set_value("user", "name", git_user)
+                config.set_value("user", "email", git_email)
+        except GitError as ex:
+            raise GitOpsException("Error creating commit.") from ex
+        return str(commit.hexsha)
+
+    @staticmethod
+    def __stage_in_memory(repo: Repo, index: IndexFile, path: str, content: str | None) -> None:
+        existing_entry = index.entries.pop((path, 0), None)
+        if content is None:
+            return
+        data = content.encode()
+        blob = repo.odb.store(IStream(Blob.type, len(data), BytesIO(data)))
+        mode = existing_entry.mode if existing_entry else Blob.file_mode
+        index.entries[(path, 0)] = IndexEntry.from_base(BaseIndexEntry((mode, blob.binsha, 0, path)))
+
+    def read_file(self, relative_path: str) -> str | None:
+        """Return the content of a file at HEAD (also outside of a sparse checkout) or None if it doesn't exist."""
+        repo = self.__get_repo()
+        try:
+            blob = repo.head.commit.tree / str(PurePosixPath(relative_path))
+        except KeyError:
+            return None
+        if not isinstance(blob, Blob):
+            return None
+        return bytes(blob.data_stream.read()).decode()
+
     def __validate_git_author(self, name: str | None, email: str | None) -> None:
         if (name and not email) or (not name and email):
             raise GitOpsException("Please provide the name and email address of the Git author or provide neither!")
 
+    @traced("git.pull_rebase")
     def pull_rebase(self) -> None:
         repo = self.__get_repo()
         branch = repo.git.branch("--show-current")
@@ -114,17 +274,74 @@ class GitRepo:
         logging.info("Pull and rebase: %s", branch)
         repo.git.pull("--rebase")
 
+    @traced("git.push")
     def push(self, branch: str | None = None) -> None:
+        """Push the branch to origin.
+
+        If the push is rejected because origin has new commits (e.g. a concurrent deployment to the same
+        repository), the local commits are rebased onto them and the push is retried with jittered
+        exponential backoff (see `get_push_retry_policy`).
+        """
         repo = self.__get_repo()
+        current_branch = repo.git.branch("--show-current")
         if not branch:
-            branch = repo.git.branch("--show-current")
-        logging.info("Pushing branch: %s", branch)
+            branch = current_branch
+        # only the checked out branch can be rebased
+        retry_policy = get_push_retry_policy() if branch == current_branch else NO_PUSH_RETRY_POLICY
+        start_time = time.monotonic()
+        attempt = 1
+        while True:
+            logging.info("Pushing branch: %s", branch)
+            try:
+                repo.git.push("--set-upstream", "origin", branch)
+            except GitCommandError as ex:
+                delay_seconds = retry_policy.get_delay_seconds(attempt)
+                can_retry = retry_policy.allows_retry(attempt, time.monotonic() - start_time, delay_seconds)
+                if not can_retry or not _is_rejected_by_newer_commits(ex):
+                    raise GitOpsException(f"Error pushing branch '{branch}' to origin: {ex.stderr}") from ex
+            except GitError as ex:
+                raise GitOpsException(f"Error pushing branch '{branch}' to origin.") from ex
+            else:
+                return
+            logging.info(
+                "Push rejected, origin has new commits. Retrying in %.1fs (attempt %s/%s): %s",
+                delay_seconds,
+                attempt + 1,
+                retry_policy.max_attempts,
+                branch,
+            )
+            record_push_retry()
+            time.sleep(delay_seconds)
+            self.__rebase_onto_origin(branch)
+            attempt += 1
+
+    def __rebase_onto_origin(self, branch: str) -> None:
+        repo = self.__get_repo()
         try:
-            repo.git.push("--set-upstream", "origin", branch)
-        except GitCommandError as ex:
-            raise GitOpsException(f"Error pushing branch '{branch}' to origin: {ex.stderr}") from ex
+            repo.git.pull("--rebase", "origin", branch)
+        except GitError as ex:
+            with contextlib.suppress(GitError):
+                repo.git.rebase("--abort")
+            raise GitOpsException(f"Error rebasing branch '{branch}' onto new commits of origin.") from ex
+
+    @traced("git.ls_remote")
+    def get_remote_head_hash(self) -> str:
+        """Return the commit hash of the remote's default branch (HEAD) without cloning the repository."""
+        url = self.get_clone_url()
+        username = self.__api.get_username()
+        password = self.__api.get_password()
+        git = Git()
+        try:
+            if username is not None and password is not None:
+                if not self.__tmp_dir:
+                    self.__tmp_dir = create_tmp_dir()
+                git = git(c=f"credential.helper={self.__create_credentials_file(username, password)}")
+            output = str(git.ls_remote(url, "HEAD"))
         except GitError as ex:
-            raise GitOpsException(f"Error pushing branch '{branch}' to origin.") from ex
+            raise GitOpsException(f"Error reading HEAD of '{url}'") from ex
+        if not output.strip():
+            raise GitOpsException(f"Repository '{url}' has no HEAD")
+        return output.split(maxsplit=1)[0]
 
     def get_author_from_last_commit(self) -> str:
         repo = self.__get_repo()
@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from enum import Enum
 from typing import Any, Literal, NamedTuple
 
 
@@ -7,6 +8,11 @@ class GitRepoApi(metaclass=ABCMeta):
         pr_id: int
         url: str
 
+    class MergeStatus(Enum):
+        READY = "ready"
+        PENDING = "pending"  # the provider is still checking whether the pull request can be merged
+        BLOCKED = "blocked"  # e.g. conflicts, failed or running pipelines, missing approvals
+
     @abstractmethod
     def get_username(self) -> str | None: ...
 
@@ -41,6 +47,9 @@ class GitRepoApi(metaclass=ABCMeta):
         merge_parameters: dict[str, Any] | None = None,
     ) -> None: ...
 
+    @abstractmethod
+    def get_pull_request_merge_status(self, pr_id: int) -> "MergeStatus": ...
+
     @abstractmethod
     def add_pull_request_comment(self, pr_id: int, text: str, parent_id: int | None = None) -> None: ...
 
@@ -55,3 +64,10 @@ class GitRepoApi(metaclass=ABCMeta):
 
     @abstractmethod
     def add_pull_request_label(self, pr_id: int, pr_labels: list[str]) -> None: ...
+
+    @abstractmethod
+    def get_file_content(self, path: str, ref: str | None = None) -> str | None:
+        """Return the content of the file at `path` on branch `ref` (default branch if omitted).
+
+        Returns None if the file does not exist.
+        """
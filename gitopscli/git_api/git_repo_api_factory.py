@@ -1,58 +1,72 @@
-from time import sleep
-
 from gitopscli.gitops_exception import GitOpsException
 
-from .azure_devops_git_repo_api_adapter import AzureDevOpsGitRepoApiAdapter
-from .bitbucket_git_repo_api_adapter import BitbucketGitRepoApiAdapter
 from .git_api_config import GitApiConfig
+from .git_api_metrics import get_git_api_metrics
 from .git_provider import GitProvider
 from .git_repo_api import GitRepoApi
 from .git_repo_api_logging_proxy import GitRepoApiLoggingProxy
-from .github_git_repo_api_adapter import GithubGitRepoApiAdapter
-from .gitlab_git_repo_api_adapter import GitlabGitRepoApiAdapter
+from .git_repo_api_metrics_proxy import GitRepoApiMetricsProxy
+from .git_repo_api_retry_proxy import GitRepoApiRetryProxy
+from .http_session_registry import get_http_session_registry
 
 
+# The adapters are imported on demand, so only the SDK of the selected git provider is loaded.
 class GitRepoApiFactory:
     @staticmethod
     def create(config: GitApiConfig, organisation: str, repository_name: str) -> GitRepoApi:
         git_repo_api: GitRepoApi | None
         if config.git_provider is GitProvider.GITHUB:
+            from .github_git_repo_api_adapter import GithubGitRepoApiAdapter  # noqa: PLC0415
+
             git_repo_api = GithubGitRepoApiAdapter(
                 username=config.username,
                 password=config.password,
                 organisation=organisation,
                 repository_name=repository_name,
+                session_registry=get_http_session_registry(),
             )
         elif config.git_provider is GitProvider.BITBUCKET:
             if not config.git_provider_url:
                 raise GitOpsException("Please provide url for Bitbucket!")
+            from .bitbucket_git_repo_api_adapter import BitbucketGitRepoApiAdapter  # noqa: PLC0415
+
             git_repo_api = BitbucketGitRepoApiAdapter(
                 git_provider_url=config.git_provider_url,
                 username=config.username,
                 password=config.password,
                 organisation=organisation,
                 repository_name=repository_name,
+                session_registry=get_http_session_registry(),
             )
         elif config.git_provider is GitProvider.GITLAB:
             provider_url = config.git_provider_url
             if not provider_url:
                 provider_url = "https://www.gitlab.com"
+            from .gitlab_git_repo_api_adapter import GitlabGitRepoApiAdapter  # noqa: PLC0415
+
             git_repo_api = GitlabGitRepoApiAdapter(
                 git_provider_url=provider_url,
                 username=config.username,
                 password=config.password,
                 organisation=organisation,
                 repository_name=repository_name,
+                session_registry=get_http_session_registry(),
             )
         elif config.git_provider is GitProvider.AZURE_DEVOPS:
             if not config.git_provider_url:
                 raise GitOpsException("Please provide url for Azure DevOps!")
+            from .azure_devops_git_repo_api_adapter import AzureDevOpsGitRepoApiAdapter  # noqa: PLC0415
+
             git_repo_api = AzureDevOpsGitRepoApiAdapter(
                 git_provider_url=config.git_provider_url,
                 username=config.username,
                 password=config.password,
                 organisation=organisation,
                 repository_name=repository_name,
-                sleep_func=sleep,
+                session_registry=get_http_session_registry(),
             )
-        return GitRepoApiLoggingProxy(git_repo_api)
+        # metrics are recorded per attempt, as every attempt counts against the rate limit
+        git_repo_api = GitRepoApiMetricsProxy(git_repo_api, config.git_provider, get_git_api_metrics())
+        return GitRepoApiLoggingProxy(
+            GitRepoApiRetryProxy(git_repo_api, config.git_provider, GitRepoApiRetryProxy.get_retry_policy())
+        )
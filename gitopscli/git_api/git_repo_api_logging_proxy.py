@@ -45,6 +45,9 @@ class GitRepoApiLoggingProxy(GitRepoApi):
         logging.info("Merging pull request %s", pr_id)
         self.__api.merge_pull_request(pr_id, merge_method=merge_method)
 
+    def get_pull_request_merge_status(self, pr_id: int) -> GitRepoApi.MergeStatus:
+        return self.__api.get_pull_request_merge_status(pr_id)
+
     def add_pull_request_comment(self, pr_id: int, text: str, parent_id: int | None = None) -> None:
         if parent_id:
             logging.info(
@@ -70,3 +73,6 @@ class GitRepoApiLoggingProxy(GitRepoApi):
     def add_pull_request_label(self, pr_id: int, pr_labels: list[str]) -> None:
         logging.info("Adding labels for pull request %s with content: %s", pr_id, pr_labels)
         self.__api.add_pull_request_label(pr_id, pr_labels)
+
+    def get_file_content(self, path: str, ref: str | None = None) -> str | None:
+        return self.__api.get_file_content(path, ref)
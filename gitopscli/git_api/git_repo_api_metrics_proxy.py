@@ -0,0 +1,84 @@
+from collections.abc import Callable
+from typing import Any, Literal, TypeVar
+
+from .git_api_metrics import GitApiMetrics
+from .git_provider import GitProvider
+from .git_repo_api import GitRepoApi
+
+T = TypeVar("T")
+
+
+class GitRepoApiMetricsProxy(GitRepoApi):
+    """Records count, latency, errors and bytes transferred of every `GitRepoApi` call in `GitApiMetrics`."""
+
+    def __init__(self, git_repo_api: GitRepoApi, git_provider: GitProvider, metrics: GitApiMetrics) -> None:
+        self.__api = git_repo_api
+        self.__provider = git_provider.name.lower()
+        self.__metrics = metrics
+
+    def get_username(self) -> str | None:
+        return self.__api.get_username()
+
+    def get_password(self) -> str | None:
+        return self.__api.get_password()
+
+    def get_clone_url(self) -> str:
+        return self.__measure("get_clone_url", self.__api.get_clone_url)
+
+    def create_pull_request_to_default_branch(
+        self,
+        from_branch: str,
+        title: str,
+        description: str,
+    ) -> GitRepoApi.PullRequestIdAndUrl:
+        return self.__measure(
+            "create_pull_request_to_default_branch",
+            lambda: self.__api.create_pull_request_to_default_branch(from_branch, title, description),
+        )
+
+    def create_pull_request(
+        self,
+        from_branch: str,
+        to_branch: str,
+        title: str,
+        description: str,
+    ) -> GitRepoApi.PullRequestIdAndUrl:
+        return self.__measure(
+            "create_pull_request",
+            lambda: self.__api.create_pull_request(from_branch, to_branch, title, description),
+        )
+
+    def merge_pull_request(
+        self,
+        pr_id: int,
+        merge_method: Literal["squash", "rebase", "merge"] = "merge",
+        merge_parameters: dict[str, Any] | None = None,
+    ) -> None:
+        self.__measure(
+            "merge_pull_request", lambda: self.__api.merge_pull_request(pr_id, merge_method, merge_parameters)
+        )
+
+    def get_pull_request_merge_status(self, pr_id: int) -> GitRepoApi.MergeStatus:
+        return self.__measure("get_pull_request_merge_status", lambda: self.__api.get_pull_request_merge_status(pr_id))
+
+    def add_pull_request_comment(self, pr_id: int, text: str, parent_id: int | None = None) -> None:
+        self.__measure("add_pull_request_comment", lambda: self.__api.add_pull_request_comment(pr_id, text, parent_id))
+
+    def delete_branch(self, branch: str) -> None:
+        self.__measure("delete_branch", lambda: self.__api.delete_branch(branch))
+
+    def get_branch_head_hash(self, branch: str) -> str:
+        return self.__measure("get_branch_head_hash", lambda: self.__api.get_branch_head_hash(branch))
+
+    def get_pull_request_branch(self, pr_id: int) -> str:
+        return self.__measure("get_pull_request_branch", lambda: self.__api.get_pull_request_branch(pr_id))
+
+    def add_pull_request_label(self, pr_id: int, pr_labels: list[str]) -> None:
+        self.__measure("add_pull_request_label", lambda: self.__api.add_pull_request_label(pr_id, pr_labels))
+
+    def get_file_content(self, path: str, ref: str | None = None) -> str | None:
+        return self.__measure("get_file_content", lambda: self.__api.get_file_content(path, ref))
+
+    def __measure(self, method: str, call: Callable[[], T]) -> T:
+        with self.__metrics.measure(self.__provider, method):
+            return call()
@@ -0,0 +1,229 @@
+import logging
+import time
+from collections.abc import Callable
+from http import HTTPStatus
+from typing import Any, Literal, TypeVar
+
+from gitopscli.tracing import span
+
+from .git_provider import GitProvider
+from .git_repo_api import GitRepoApi
+from .retry_policy import RetryPolicy
+
+API_RETRY_ENV_PREFIX = "GITOPSCLI_API"
+DEFAULT_API_RETRY_POLICY = RetryPolicy(
+    max_attempts=6, base_delay_seconds=1.0, max_delay_seconds=15.0, deadline_seconds=120.0
+)
+
+T = TypeVar("T")
+
+_TRANSIENT_STATUS_CODES = {
+    HTTPStatus.REQUEST_TIMEOUT,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+# requests, urllib3 and msrest errors of failed connections (matched by name, so no SDK has to be imported here)
+_TRANSIENT_ERROR_TYPES = {"ConnectionError", "Timeout", "ChunkedEncodingError", "ProtocolError", "ClientRequestError"}
+_GITHUB_MERGE_NOT_READY_MESSAGE = "Base branch was modified"
+_BITBUCKET_MERGE_NOT_READY_EXCEPTION = ".PullRequestOutOfDateException"
+
+
+def _get_causes(ex: BaseException) -> list[BaseException]:
+    """The exception and its causes (adapters map SDK errors to a GitOpsException raised from them)."""
+    causes = []
+    cause: BaseException | None = ex
+    while cause is not None and cause not in causes:
+        causes.append(cause)
+        cause = cause.__cause__
+    return causes
+
+
+def _get_status_code(ex: BaseException) -> int | None:
+    # PyGithub: status, python-gitlab: response_code, requests (atlassian): response.status_code
+    for status_code in (
+        getattr(ex, "status", None),
+        getattr(ex, "response_code", None),
+        getattr(getattr(ex, "response", None), "status_code", None),
+    ):
+        if isinstance(status_code, int):
+            return status_code
+    return None
+
+
+def _is_transient_error(ex: BaseException) -> bool:
+    if isinstance(ex, (ConnectionError, TimeoutError)):
+        return True
+    if any(error_type.__name__ in _TRANSIENT_ERROR_TYPES for error_type in type(ex).__mro__):
+        return True
+    return _get_status_code(ex) in _TRANSIENT_STATUS_CODES
+
+
+def _get_github_error_message(ex: BaseException) -> str:
+    data = getattr(ex, "data", None)  # PyGithub: the JSON body of the error response
+    if isinstance(data, dict):
+        return str(data.get("message", ""))
+    return str(data or "")
+
+
+def _get_bitbucket_exception_names(ex: BaseException) -> list[str]:
+    response = getattr(ex, "response", None)
+    try:
+        errors = response.json().get("errors", []) if response is not None else []
+    except ValueError:  # no JSON body
+        return []
+    if not isinstance(errors, list):
+        return []
+    return [str(error.get("exceptionName", "")) for error in errors if isinstance(error, dict)]
+
+
+def _is_merge_not_ready_error(git_provider: GitProvider, ex: BaseException) -> bool:
+    """Whether a merge failed because the provider is still processing the pull request (e.g. mergeability checks).
+
+    Merges which can't succeed (conflicts, a disallowed merge method, vetoing merge checks) are not retried.
+    """
+    if git_provider is GitProvider.GITLAB:
+        # "Branch cannot be merged" (405/406) while GitLab is still checking the merge request
+        return type(ex).__name__ == "GitlabMRClosedError"
+    if git_provider is GitProvider.GITHUB:
+        # the base branch changed while merging, GitHub asks to try again
+        return _get_status_code(ex) == HTTPStatus.METHOD_NOT_ALLOWED and _get_github_error_message(ex).startswith(
+            _GITHUB_MERGE_NOT_READY_MESSAGE
+        )
+    if git_provider is GitProvider.BITBUCKET:
+        # the pull request was updated after its version was read (the adapter reads it again for each merge)
+        return _get_status_code(ex) == HTTPStatus.CONFLICT and any(
+            name.endswith(_BITBUCKET_MERGE_NOT_READY_EXCEPTION) for name in _get_bitbucket_exception_names(ex)
+        )
+    return False  # Azure DevOps completes pull requests asynchronously
+
+
+class GitRepoApiRetryProxy(GitRepoApi):
+    """Retries failed `GitRepoApi` calls with jittered exponential backoff.
+
+    Transient errors (connection errors, 408, 5xx) are retried for all calls which are safe to repeat. Calls which
+    create something (pull requests, comments) are only retried if the provider was unavailable (503), so they are
+    not created twice. Merges are also retried while the provider isn't ready to merge the pull request yet.
+    """
+
+    def __init__(
+        self,
+        git_repo_api: GitRepoApi,
+        git_provider: GitProvider,
+        retry_policy: RetryPolicy,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.__api = git_repo_api
+        self.__git_provider = git_provider
+        self.__retry_policy = retry_policy
+        self.__sleep = sleep
+
+    @staticmethod
+    def get_retry_policy() -> RetryPolicy:
+        return RetryPolicy.from_env(API_RETRY_ENV_PREFIX, DEFAULT_API_RETRY_POLICY)
+
+    def get_username(self) -> str | None:
+        return self.__api.get_username()
+
+    def get_password(self) -> str | None:
+        return self.__api.get_password()
+
+    def get_clone_url(self) -> str:
+        return self.__retry("get clone url", self.__api.get_clone_url)
+
+    def create_pull_request_to_default_branch(
+        self,
+        from_branch: str,
+        title: str,
+        description: str,
+    ) -> GitRepoApi.PullRequestIdAndUrl:
+        return self.__retry(
+            "create pull request",
+            lambda: self.__api.create_pull_request_to_default_branch(from_branch, title, description),
+            is_retryable=self.__is_unavailable_error,
+        )
+
+    def create_pull_request(
+        self,
+        from_branch: str,
+        to_branch: str,
+        title: str,
+        description: str,
+    ) -> GitRepoApi.PullRequestIdAndUrl:
+        return self.__retry(
+            "create pull request",
+            lambda: self.__api.create_pull_request(from_branch, to_branch, title, description),
+            is_retryable=self.__is_unavailable_error,
+        )
+
+    def merge_pull_request(
+        self,
+        pr_id: int,
+        merge_method: Literal["squash", "rebase", "merge"] = "merge",
+        merge_parameters: dict[str, Any] | None = None,
+    ) -> None:
+        self.__retry(
+            "merge pull request",
+            lambda: self.__api.merge_pull_request(pr_id, merge_method, merge_parameters),
+            is_retryable=lambda ex: _is_transient_error(ex) or _is_merge_not_ready_error(self.__git_provider, ex),
+        )
+
+    def get_pull_request_merge_status(self, pr_id: int) -> GitRepoApi.MergeStatus:
+        return self.__retry("get pull request merge status", lambda: self.__api.get_pull_request_merge_status(pr_id))
+
+    def add_pull_request_comment(self, pr_id: int, text: str, parent_id: int | None = None) -> None:
+        self.__retry(
+            "add pull request comment",
+            lambda: self.__api.add_pull_request_comment(pr_id, text, parent_id),
+            is_retryable=self.__is_unavailable_error,
+        )
+
+    def delete_branch(self, branch: str) -> None:
+        self.__retry("delete branch", lambda: self.__api.delete_branch(branch))
+
+    def get_branch_head_hash(self, branch: str) -> str:
+        return self.__retry("get branch head hash", lambda: self.__api.get_branch_head_hash(branch))
+
+    def get_pull_request_branch(self, pr_id: int) -> str:
+        return self.__retry("get pull request branch", lambda: self.__api.get_pull_request_branch(pr_id))
+
+    def add_pull_request_label(self, pr_id: int, pr_labels: list[str]) -> None:
+        self.__retry("add pull request label", lambda: self.__api.add_pull_request_label(pr_id, pr_labels))
+
+    def get_file_content(self, path: str, ref: str | None = None) -> str | None:
+        return self.__retry("get file content", lambda: self.__api.get_file_content(path, ref))
+
+    @staticmethod
+    def __is_unavailable_error(ex: BaseException) -> bool:
+        return _get_status_code(ex) == HTTPStatus.SERVICE_UNAVAILABLE
+
+    def __retry(
+        self,
+        operation: str,
+        call: Callable[[], T],
+        is_retryable: Callable[[BaseException], bool] = _is_transient_error,
+    ) -> T:
+        start_time = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                with span(f"api.{operation.replace(' ', '_')}", attempt=attempt):
+                    return call()
+            except Exception as ex:
+                delay_seconds = self.__retry_policy.get_delay_seconds(attempt)
+                elapsed_seconds = time.monotonic() - start_time
+                if not any(is_retryable(cause) for cause in _get_causes(ex)) or not self.__retry_policy.allows_retry(
+                    attempt, elapsed_seconds, delay_seconds
+                ):
+                    raise
+                logging.warning(
+                    "Failed to %s, retrying in %.1fs (attempt %s/%s): %s",
+                    operation,
+                    delay_seconds,
+                    attempt + 1,
+                    self.__retry_policy.max_attempts,
+                    ex,
+                )
+            self.__sleep(delay_seconds)
+            attempt += 1
@@ -0,0 +1,39 @@
+import logging
+import os
+
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.io_api.json_file_store import JsonFileStore
+
+METADATA_CACHE_DIR_ENV = "GITOPSCLI_METADATA_CACHE_DIR"
+METADATA_CACHE_TTL_ENV = "GITOPSCLI_METADATA_CACHE_TTL"
+DEFAULT_TTL_SECONDS = 3600
+
+
+class GitRepoMetadataCache:
+    """Small disk cache (with a TTL) for rarely changing repository metadata like clone URL and default branch."""
+
+    def __init__(self, cache_dir: str, ttl_seconds: int) -> None:
+        self.__store = JsonFileStore(cache_dir)
+        self.__ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def from_env() -> "GitRepoMetadataCache | None":
+        cache_dir = os.environ.get(METADATA_CACHE_DIR_ENV)
+        if not cache_dir:
+            return None
+        ttl = os.environ.get(METADATA_CACHE_TTL_ENV, str(DEFAULT_TTL_SECONDS))
+        try:
+            ttl_seconds = int(ttl)
+        except ValueError as ex:
+            raise GitOpsException(f"Invalid value for {METADATA_CACHE_TTL_ENV}: '{ttl}'") from ex
+        return GitRepoMetadataCache(cache_dir, ttl_seconds)
+
+    def get(self, key: str) -> dict[str, str] | None:
+        metadata = self.__store.get(key, max_age_seconds=self.__ttl_seconds)
+        return metadata if isinstance(metadata, dict) else None
+
+    def put(self, key: str, metadata: dict[str, str]) -> None:
+        try:
+            self.__store.put(key, metadata)
+        except OSError as ex:
+            logging.warning("Could not write repository metadata cache: %s", ex)
@@ -1,8 +1,10 @@
 from typing import Any, Literal
 
+import requests
 from github import (
     BadCredentialsException,
     Github,
+    GithubException,
     GitRef,
     PullRequest,
     Repository,
@@ -12,6 +14,9 @@ from github import (
 from gitopscli.gitops_exception import GitOpsException
 
 from .git_repo_api import GitRepoApi
+from .git_repo_metadata_cache import GitRepoMetadataCache
+from .http_session_registry import HttpSessionRegistry
+from .rate_limiter import RateLimitBudget, RateLimiter
 
 
 class GithubGitRepoApiAdapter(GitRepoApi):
@@ -21,12 +26,39 @@ class GithubGitRepoApiAdapter(GitRepoApi):
         password: str | None,
         organisation: str,
         repository_name: str,
+        session_registry: HttpSessionRegistry | None = None,
     ) -> None:
-        self.__github = Github(username, password)
+        if session_registry:
+            # PyGithub can't be given a session, but its client keeps the connections alive and is thread-safe
+            registry = session_registry
+            self.__github = registry.get_client(
+                ("github", username, password),
+                lambda: self.__create_github(username, password, registry),
+            )
+        else:
+            self.__github = Github(username, password)
         self.__username = username
         self.__password = password
         self.__organisation = organisation
         self.__repository_name = repository_name
+        self.__repo: Repository.Repository | None = None
+        self.__metadata: dict[str, str] | None = None
+        self.__metadata_cache = GitRepoMetadataCache.from_env()
+
+    @staticmethod
+    def __create_github(username: str | None, password: str | None, registry: HttpSessionRegistry) -> Github:
+        github = Github(username, password, timeout=registry.timeout_seconds, pool_size=registry.pool_size)
+        requester = github.requester
+
+        # PyGithub itself waits for the rate limit reset and honours Retry-After, the budget is only reported
+        def get_budget() -> RateLimitBudget | None:
+            remaining, limit = requester.rate_limiting
+            if remaining < 0:
+                return None  # no request yet
+            return RateLimitBudget(limit=limit, remaining=remaining, reset_at=requester.rate_limiting_resettime)
+
+        registry.rate_limiter.record(RateLimiter.get_key(requester.base_url, password), get_budget)
+        return github
 
     def get_username(self) -> str | None:
         return self.__username
@@ -35,7 +67,7 @@ class GithubGitRepoApiAdapter(GitRepoApi):
         return self.__password
 
     def get_clone_url(self) -> str:
-        return self.__get_repo().clone_url
+        return self.__get_metadata()["clone_url"]
 
     def create_pull_request_to_default_branch(
         self,
@@ -43,7 +75,7 @@ class GithubGitRepoApiAdapter(GitRepoApi):
         title: str,
         description: str,
     ) -> GitRepoApi.PullRequestIdAndUrl:
-        to_branch = self.__get_repo().default_branch
+        to_branch = self.__get_metadata()["default_branch"]
         return self.create_pull_request(from_branch, to_branch, title, description)
 
     def create_pull_request(
@@ -66,6 +98,24 @@ class GithubGitRepoApiAdapter(GitRepoApi):
         pull_request = self.__get_pull_request(pr_id)
         pull_request.merge(merge_method=merge_method)
 
+    def get_pull_request_merge_status(self, pr_id: int) -> GitRepoApi.MergeStatus:
+        pull_request = self.__get_pull_request(pr_id)
+        # mergeable is null until GitHub computed the test merge commit
+        if pull_request.mergeable is None or pull_request.mergeable_state == "unknown":
+            return GitRepoApi.MergeStatus.PENDING
+        if pull_request.mergeable_state == "blocked" and self.__has_pending_checks(pull_request):
+            return GitRepoApi.MergeStatus.PENDING  # required checks are still running
+        if not pull_request.mergeable or pull_request.mergeable_state in ("dirty", "blocked"):
+            return GitRepoApi.MergeStatus.BLOCKED
+        return GitRepoApi.MergeStatus.READY
+
+    def __has_pending_checks(self, pull_request: PullRequest.PullRequest) -> bool:
+        commit = self.__get_repo().get_commit(pull_request.head.sha)
+        combined_status = commit.get_combined_status()
+        if combined_status.total_count and combined_status.state == "pending":
+            return True
+        return any(check_run.status != "completed" for check_run in commit.get_check_runs())
+
     def add_pull_request_comment(
         self,
         pr_id: int,
@@ -101,7 +151,23 @@ class GithubGitRepoApiAdapter(GitRepoApi):
         except UnknownObjectException as ex:
             raise GitOpsException(f"Pull request with ID '{pr_id}' does not exist.") from ex
 
+    def __get_metadata(self) -> dict[str, str]:
+        if self.__metadata is None:
+            cache_key = f"github/{self.__organisation}/{self.__repository_name}"
+            self.__metadata = self.__metadata_cache.get(cache_key) if self.__metadata_cache else None
+            if self.__metadata is None or not {"clone_url", "default_branch"} <= self.__metadata.keys():
+                repo = self.__get_repo()
+                self.__metadata = {"clone_url": repo.clone_url, "default_branch": repo.default_branch}
+                if self.__metadata_cache:
+                    self.__metadata_cache.put(cache_key, self.__metadata)
+        return self.__metadata
+
     def __get_repo(self) -> Repository.Repository:
+        if self.__repo is None:
+            self.__repo = self.__fetch_repo()
+        return self.__repo
+
+    def __fetch_repo(self) -> Repository.Repository:
         try:
             return self.__github.get_repo(f"{self.__organisation}/{self.__repository_name}")
         except BadCredentialsException as ex:
@@ -114,3 +180,19 @@ class GithubGitRepoApiAdapter(GitRepoApi):
     def add_pull_request_label(self, pr_id: int, pr_labels: str | Any) -> None:
         pull_request = self.__get_pull_request(pr_id)
         pull_request.set_labels(pr_labels)
+
+    def get_file_content(self, path: str, ref: str | None = None) -> str | None:
+        try:
+            repo = self.__get_repo()
+            content_file = repo.get_contents(path) if ref is None else repo.get_contents(path, ref=ref)
+        except UnknownObjectException:
+            return None
+        except BadCredentialsException as ex:
+            raise GitOpsException("Bad credentials") from ex
+        except GithubException as ex:
+            raise GitOpsException(f"Error reading file '{path}': {ex.data}") from ex
+        except requests.exceptions.RequestException as ex:
+            raise GitOpsException(f"Error reading file '{path}': {ex}") from ex
+        if isinstance(content_file, list):
+            raise GitOpsException(f"'{path}' is not a file")
+        return content_file.decoded_content.decode()
@@ -1,5 +1,3 @@
-import logging
-import time
 from http import HTTPStatus
 from typing import Any, Literal
 
@@ -9,8 +7,17 @@ import requests
 from gitopscli.gitops_exception import GitOpsException
 
 from .git_repo_api import GitRepoApi
+from .http_session_registry import HttpSessionRegistry
 
-MAX_MERGE_RETRIES = 5
+_PENDING_MERGE_STATUSES = {
+    "unchecked",
+    "checking",
+    "preparing",
+    "approvals_syncing",
+    "cannot_be_merged_recheck",
+    "ci_still_running",  # the pipeline is still running
+    "ci_must_pass",  # the pipeline must succeed first
+}
 
 
 class GitlabGitRepoApiAdapter(GitRepoApi):
@@ -21,9 +28,18 @@ class GitlabGitRepoApiAdapter(GitRepoApi):
         password: str | None,
         organisation: str,
         repository_name: str,
+        session_registry: HttpSessionRegistry | None = None,
     ) -> None:
         try:
-            self.__gitlab = gitlab.Gitlab(git_provider_url, private_token=password)
+            if session_registry:
+                self.__gitlab = gitlab.Gitlab(
+                    git_provider_url,
+                    private_token=password,
+                    session=session_registry.get_session(git_provider_url),
+                    timeout=session_registry.timeout_seconds,
+                )
+            else:
+                self.__gitlab = gitlab.Gitlab(git_provider_url, private_token=password)
             project = self.__gitlab.projects.get(f"{organisation}/{repository_name}")
         except requests.exceptions.ConnectionError as ex:
             raise GitOpsException(f"Error connecting to '{git_provider_url}''") from ex
@@ -34,6 +50,7 @@ class GitlabGitRepoApiAdapter(GitRepoApi):
                 raise GitOpsException(f"Repository '{organisation}/{repository_name}' does not exist") from ex
             raise GitOpsException(f"Error getting repository: '{ex.error_message}'") from ex
 
+        self.__git_provider_url = git_provider_url
         self.__token_name = username
         self.__access_token = password
         self.__project = project
@@ -75,28 +92,24 @@ class GitlabGitRepoApiAdapter(GitRepoApi):
         merge_parameters: dict[str, Any] | None = None,
     ) -> None:
         merge_request = self.__project.mergerequests.get(pr_id)
-
-        max_retries = MAX_MERGE_RETRIES
-        while max_retries > 0:
-            try:
-                if merge_method == "rebase":
-                    merge_request.rebase(merge_parameters)
-                    return
-                merge_request.merge(merge_parameters)
-            except gitlab.exceptions.GitlabMRClosedError as ex:
-                # "Branch cannot be merged" error can occur if the server
-                # is still processing the merge request internally
-                max_retries -= 1
-                logging.warning(
-                    "Retry merging pull request. Attempts: (%s/%s)",
-                    MAX_MERGE_RETRIES - max_retries,
-                    MAX_MERGE_RETRIES,
-                )
-                if max_retries == 0:
-                    raise GitOpsException("Error merging pull request: 'Branch cannot be merged'") from ex
-                time.sleep(2.5)
+        try:
+            if merge_method == "rebase":
+                merge_request.rebase(merge_parameters)
             else:
-                return
+                merge_request.merge(merge_parameters)
+        except gitlab.exceptions.GitlabMRClosedError as ex:
+            # can occur while the server is still processing the merge request (retried by GitRepoApiRetryProxy)
+            raise GitOpsException("Error merging pull request: 'Branch cannot be merged'") from ex
+
+    def get_pull_request_merge_status(self, pr_id: int) -> GitRepoApi.MergeStatus:
+        merge_request = self.__project.mergerequests.get(pr_id)
+        # detailed_merge_status since GitLab 15.6, merge_status before
+        merge_status = getattr(merge_request, "detailed_merge_status", None) or merge_request.merge_status
+        if merge_status in _PENDING_MERGE_STATUSES:
+            return GitRepoApi.MergeStatus.PENDING
+        if merge_status in ("mergeable", "can_be_merged"):
+            return GitRepoApi.MergeStatus.READY
+        return GitRepoApi.MergeStatus.BLOCKED
 
     def add_pull_request_comment(
         self,
@@ -119,13 +132,28 @@ class GitlabGitRepoApiAdapter(GitRepoApi):
         return str(merge_request.source_branch)
 
     def __get_default_branch(self) -> str:
-        branches = self.__project.branches.list(all=True)
-        default_branch = next(filter(lambda x: x.default, branches), None)
-        if default_branch is None:
+        # part of the project metadata fetched in __init__ (listing all branches is slow for projects with many)
+        default_branch = self.__project.default_branch
+        if not default_branch:
             raise GitOpsException("Default branch does not exist")
-        return str(default_branch.name)
+        return str(default_branch)
 
     def add_pull_request_label(self, pr_id: int, pr_labels: list[str]) -> None:
         merge_request = self.__project.mergerequests.get(pr_id)
         merge_request.labels = pr_labels
         merge_request.save()
+
+    def get_file_content(self, path: str, ref: str | None = None) -> str | None:
+        try:
+            content = self.__project.files.raw(file_path=path, ref=ref or self.__project.default_branch)
+        except requests.exceptions.RequestException as ex:
+            raise GitOpsException(f"Error connecting to '{self.__git_provider_url}'") from ex
+        except gitlab.exceptions.GitlabAuthenticationError as ex:
+            raise GitOpsException("Bad Personal Access Token") from ex
+        except gitlab.exceptions.GitlabGetError as ex:
+            if ex.response_code == HTTPStatus.NOT_FOUND:
+                return None
+            raise GitOpsException(f"Error reading file '{path}': '{ex.error_message}'") from ex
+        except gitlab.exceptions.GitlabError as ex:
+            raise GitOpsException(f"Error reading file '{path}': '{ex.error_message}'") from ex
+        return bytes(content).decode()
@@ -0,0 +1,99 @@
+import os
+import threading
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, TypeVar, cast
+from urllib.parse import urlsplit
+
+from gitopscli.gitops_exception import GitOpsException
+
+from .rate_limiter import DEFAULT_MAX_WAIT_SECONDS, RateLimiter
+
+if TYPE_CHECKING:
+    import requests
+
+HTTP_POOL_SIZE_ENV = "GITOPSCLI_HTTP_POOL_SIZE"
+HTTP_TIMEOUT_ENV = "GITOPSCLI_HTTP_TIMEOUT"
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT_SECONDS = 60
+
+T = TypeVar("T")
+
+
+class HttpSessionRegistry:
+    """Process-wide HTTP sessions and SDK clients, so git provider adapters reuse keep-alive connections.
+
+    Sessions are shared per provider host (and credentials, as some SDKs store them in the session).
+    SDKs which can't be given a session share the whole client instead. All requests of the sessions
+    go through the `rate_limiter`.
+    """
+
+    def __init__(self, pool_size: int, timeout_seconds: int, rate_limiter: RateLimiter | None = None) -> None:
+        self.pool_size = pool_size
+        self.timeout_seconds = timeout_seconds
+        self.rate_limiter = rate_limiter or RateLimiter(DEFAULT_MAX_WAIT_SECONDS)
+        self.__lock = threading.Lock()
+        self.__sessions: dict[Hashable, requests.Session] = {}
+        self.__clients: dict[Hashable, object] = {}
+
+    @staticmethod
+    def from_env() -> "HttpSessionRegistry":
+        return HttpSessionRegistry(
+            pool_size=HttpSessionRegistry.__get_env(HTTP_POOL_SIZE_ENV, DEFAULT_POOL_SIZE),
+            timeout_seconds=HttpSessionRegistry.__get_env(HTTP_TIMEOUT_ENV, DEFAULT_TIMEOUT_SECONDS),
+            rate_limiter=RateLimiter.from_env(),
+        )
+
+    @staticmethod
+    def __get_env(name: str, default: int) -> int:
+        value = os.environ.get(name)
+        if not value:
+            return default
+        try:
+            return int(value)
+        except ValueError as ex:
+            raise GitOpsException(f"Invalid value for {name}: '{value}'") from ex
+
+    def get_session(self, url: str, *credentials: str | None) -> "requests.Session":
+        import requests  # noqa: PLC0415 (only loaded together with the provider SDKs)
+
+        url_parts = urlsplit(url)
+        key = (url_parts.scheme, url_parts.netloc, *credentials)
+        with self.__lock:
+            session = self.__sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                self.mount_rate_limited_adapter(session)
+                self.__sessions[key] = session
+            return session
+
+    def mount_rate_limited_adapter(self, session: "requests.Session") -> None:
+        """Send the requests of a session created by an SDK through the rate limiter (keeping its retry config)."""
+        from .rate_limited_http_adapter import RateLimitedHTTPAdapter  # noqa: PLC0415
+
+        for prefix in ("https://", "http://"):
+            current_adapter = session.adapters.get(prefix)
+            if isinstance(current_adapter, RateLimitedHTTPAdapter):
+                continue
+            max_retries = getattr(current_adapter, "max_retries", 0)
+            adapter = RateLimitedHTTPAdapter(
+                self.rate_limiter, pool_connections=1, pool_maxsize=self.pool_size, max_retries=max_retries
+            )
+            session.mount(prefix, adapter)
+
+    def get_client(self, key: Hashable, create_client: Callable[[], T]) -> T:
+        with self.__lock:
+            if key not in self.__clients:
+                self.__clients[key] = create_client()
+            return cast("T", self.__clients[key])
+
+
+_registry: HttpSessionRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_http_session_registry() -> HttpSessionRegistry:
+    global _registry  # noqa: PLW0603
+    with _registry_lock:
+        if _registry is None:
+            _registry = HttpSessionRegistry.from_env()
+        return _registry
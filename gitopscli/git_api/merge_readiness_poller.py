@@ -0,0 +1,59 @@
+import logging
+import os
+import time
+from collections.abc import Callable
+
+from gitopscli.gitops_exception import GitOpsException
+
+from .git_repo_api import GitRepoApi
+
+MERGE_TIMEOUT_ENV = "GITOPSCLI_MERGE_TIMEOUT"
+DEFAULT_MERGE_TIMEOUT_SECONDS = 300
+INITIAL_POLL_INTERVAL_SECONDS = 0.25
+MAX_POLL_INTERVAL_SECONDS = 5.0
+
+
+class MergeReadinessPoller:
+    """Waits until the git provider has checked whether a new pull request can be merged.
+
+    Providers check the mergeability asynchronously after a pull request is created. The status is polled in short
+    intervals first (the check usually takes a second or less), which grow up to `MAX_POLL_INTERVAL_SECONDS`.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.__timeout_seconds = timeout_seconds
+        self.__sleep = sleep
+        self.__clock = clock
+
+    @staticmethod
+    def from_env() -> "MergeReadinessPoller":
+        timeout = os.environ.get(MERGE_TIMEOUT_ENV, str(DEFAULT_MERGE_TIMEOUT_SECONDS))
+        try:
+            return MergeReadinessPoller(float(timeout))
+        except ValueError as ex:
+            raise GitOpsException(f"Invalid value for {MERGE_TIMEOUT_ENV}: '{timeout}'") from ex
+
+    def wait_until_checked(self, git_repo_api: GitRepoApi, pr_id: int) -> GitRepoApi.MergeStatus:
+        """Poll the merge status of the pull request until it is no longer pending and return it."""
+        start_time = self.__clock()
+        poll_interval = INITIAL_POLL_INTERVAL_SECONDS
+        while True:
+            merge_status = git_repo_api.get_pull_request_merge_status(pr_id)
+            elapsed_seconds = self.__clock() - start_time
+            if merge_status is not GitRepoApi.MergeStatus.PENDING:
+                logging.info(
+                    "Merge status of pull request %s: %s (after %.1fs)", pr_id, merge_status.value, elapsed_seconds
+                )
+                return merge_status
+            remaining_seconds = self.__timeout_seconds - elapsed_seconds
+            if remaining_seconds <= 0:
+                raise GitOpsException(
+                    f"Timed out after {self.__timeout_seconds:g}s waiting for pull request {pr_id} to be checked"
+                )
+            self.__sleep(min(poll_interval, remaining_seconds))
+            poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL_SECONDS)
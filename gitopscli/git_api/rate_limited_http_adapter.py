@@ -0,0 +1,44 @@
+from typing import Any
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+
+from .git_api_metrics import get_git_api_metrics
+from .rate_limiter import RateLimiter
+
+MAX_RATE_LIMIT_RETRIES = 5
+_TOKEN_HEADERS = ("Authorization", "PRIVATE-TOKEN", "JOB-TOKEN")
+
+
+class RateLimitedHTTPAdapter(HTTPAdapter):
+    """requests transport adapter which sends every request through the `RateLimiter`.
+
+    Requests rejected because of the rate limit (429, or 403 with an exhausted budget) are retried after the budget
+    reset or Retry-After.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.__rate_limiter = rate_limiter
+
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        token = next((request.headers[name] for name in _TOKEN_HEADERS if name in request.headers), None)
+        key = RateLimiter.get_key(str(request.url), token)
+        retries = 0
+        while True:
+            self.__rate_limiter.wait(key)
+            response = super().send(request, *args, **kwargs)
+            self.__record_transfer(request, response, stream=kwargs.get("stream", False))
+            should_retry = self.__rate_limiter.update(key, response.status_code, response.headers)
+            if not should_retry or retries >= MAX_RATE_LIMIT_RETRIES:
+                return response
+            response.close()
+            retries += 1
+
+    @staticmethod
+    def __record_transfer(request: PreparedRequest, response: Response, *, stream: bool) -> None:
+        body = request.body
+        sent_bytes = len(body) if isinstance(body, (bytes, str)) else 0
+        # the content of a streamed response isn't read here (it may not even fit into memory)
+        received_bytes = int(response.headers.get("Content-Length", 0)) if stream else len(response.content)
+        get_git_api_metrics().record_transfer(sent_bytes, received_bytes)
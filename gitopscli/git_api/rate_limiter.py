@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from gitopscli.gitops_exception import GitOpsException
+
+RATE_LIMIT_MAX_WAIT_ENV = "GITOPSCLI_RATE_LIMIT_MAX_WAIT"
+DEFAULT_MAX_WAIT_SECONDS = 300
+# below this share of the budget, the remaining requests are spread until the budget resets
+PACING_THRESHOLD = 0.1
+DEFAULT_RETRY_DELAY_SECONDS = 1.0
+
+# GitHub, Bitbucket and Azure DevOps use the X- prefixed headers, GitLab the unprefixed ones
+_LIMIT_HEADERS = ("X-RateLimit-Limit", "RateLimit-Limit")
+_REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining")
+_RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+
+
+@dataclass
+class RateLimitBudget:
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None  # epoch seconds
+    blocked_until: float = 0.0  # set by Retry-After
+
+
+class RateLimiter:
+    """Tracks the rate limit budget of the git provider APIs per host and token and delays requests accordingly.
+
+    Requests wait until the budget resets instead of failing once it is exhausted, are paced once it runs low and
+    honour Retry-After. A single wait is capped at `max_wait_seconds`.
+    """
+
+    def __init__(
+        self,
+        max_wait_seconds: float,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.__max_wait_seconds = max_wait_seconds
+        self.__sleep = sleep
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__budgets: dict[str, RateLimitBudget] = {}
+        self.__budget_sources: dict[str, Callable[[], RateLimitBudget | None]] = {}
+
+    @staticmethod
+    def from_env() -> "RateLimiter":
+        max_wait = os.environ.get(RATE_LIMIT_MAX_WAIT_ENV, str(DEFAULT_MAX_WAIT_SECONDS))
+        try:
+            return RateLimiter(float(max_wait))
+        except ValueError as ex:
+            raise GitOpsException(f"Invalid value for {RATE_LIMIT_MAX_WAIT_ENV}: '{max_wait}'") from ex
+
+    @staticmethod
+    def get_key(url: str, token: str | bytes | None) -> str:
+        """Budget key of a host and token. Only a hash of the token is part of the key (which is logged)."""
+        host = urlsplit(url).netloc
+        if not token:
+            return host
+        token_bytes = token if isinstance(token, bytes) else token.encode()
+        return f"{host}/{hashlib.sha256(token_bytes).hexdigest()[:8]}"
+
+    def wait(self, key: str) -> None:
+        """Block until a request with the budget of `key` may be sent."""
+        with self.__lock:
+            budget = self.__budgets.get(key)
+            delay = self.__get_delay(budget) if budget else 0.0
+        if delay > 0:
+            delay = min(delay, self.__max_wait_seconds)
+            logging.info("Rate limit of %s: waiting %.1fs before next request", key, delay)
+            self.__sleep(delay)
+
+    def __get_delay(self, budget: RateLimitBudget) -> float:
+        now = self.__clock()
+        delay = budget.blocked_until - now
+        if budget.remaining is not None and budget.reset_at is not None and budget.reset_at > now:
+            if budget.remaining <= 0:
+                delay = max(delay, budget.reset_at - now)
+            elif budget.limit and budget.remaining < budget.limit * PACING_THRESHOLD:
+                delay = max(delay, (budget.reset_at - now) / budget.remaining)
+        return delay
+
+    def update(self, key: str, status_code: int, headers: Mapping[str, str]) -> bool:
+        """Update the budget of `key` from the response headers and return whether the request should be retried."""
+        now = self.__clock()
+        with self.__lock:
+            budget = self.__budgets.setdefault(key, RateLimitBudget())
+            limit = self.__get_header(headers, _LIMIT_HEADERS)
+            remaining = self.__get_header(headers, _REMAINING_HEADERS)
+            reset = self.__get_header(headers, _RESET_HEADERS)
+            if limit is not None:
+                budget.limit = int(limit)
+            if remaining is not None:
+                budget.remaining = int(remaining)
+            if reset is not None:
+                budget.reset_at = reset
+            retry_after = self.__parse_retry_after(headers.get("Retry-After"), now)
+            if retry_after is not None:
+                budget.blocked_until = now + retry_after
+            is_rate_limited = status_code == HTTPStatus.TOO_MANY_REQUESTS or (
+                status_code == HTTPStatus.FORBIDDEN and (retry_after is not None or budget.remaining == 0)
+            )
+            if is_rate_limited and retry_after is None and budget.remaining != 0:
+                budget.blocked_until = now + DEFAULT_RETRY_DELAY_SECONDS
+            return is_rate_limited
+
+    def record(self, key: str, budget_source: Callable[[], RateLimitBudget | None]) -> None:
+        """Register a budget tracked by an SDK itself (the rate limiter only reports it)."""
+        with self.__lock:
+            self.__budget_sources[key] = budget_source
+
+    def get_budgets(self) -> dict[str, dict[str, int | None]]:
+        with self.__lock:
+            budgets = dict(self.__budgets)
+            budget_sources = dict(self.__budget_sources)
+        for key, budget_source in budget_sources.items():
+            budget = budget_source()
+            if budget:
+                budgets[key] = budget
+        return {
+            key: {
+                "limit": budget.limit,
+                "remaining": budget.remaining,
+                "reset_at": int(budget.reset_at) if budget.reset_at is not None else None,
+            }
+            for key, budget in sorted(budgets.items())
+            if budget.remaining is not None
+        }
+
+    def log_budgets(self) -> None:
+        for key, budget in self.get_budgets().items():
+            logging.info(
+                "Rate limit of %s: %s/%s requests remaining (reset at %s)",
+                key,
+                budget["remaining"],
+                budget["limit"],
+                budget["reset_at"],
+            )
+
+    @staticmethod
+    def __get_header(headers: Mapping[str, str], names: tuple[str, ...]) -> float | None:
+        for name in names:
+            value = headers.get(name)
+            if value is not None:
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+        return None
+
+    @staticmethod
+    def __parse_retry_after(value: str | None, now: float) -> float | None:
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+        except (TypeError, ValueError):
+            return None
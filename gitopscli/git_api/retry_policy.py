@@ -0,0 +1,50 @@
+import os
+import random
+from dataclasses import dataclass
+
+from gitopscli.gitops_exception import GitOpsException
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long to wait before a failed operation is retried."""
+
+    max_attempts: int
+    base_delay_seconds: float
+    max_delay_seconds: float
+    deadline_seconds: float | None = None  # no retry is started after this time since the first attempt
+
+    @staticmethod
+    def from_env(env_prefix: str, default: "RetryPolicy") -> "RetryPolicy":
+        """Read the policy from the env variables `<env_prefix>_MAX_ATTEMPTS` and `<env_prefix>_RETRY_*`."""
+        max_attempts = RetryPolicy.__get_env(f"{env_prefix}_MAX_ATTEMPTS", default.max_attempts)
+        base_delay_seconds = RetryPolicy.__get_env(f"{env_prefix}_RETRY_BASE_DELAY", default.base_delay_seconds)
+        max_delay_seconds = RetryPolicy.__get_env(f"{env_prefix}_RETRY_MAX_DELAY", default.max_delay_seconds)
+        deadline_seconds = RetryPolicy.__get_env(f"{env_prefix}_RETRY_DEADLINE", default.deadline_seconds)
+        return RetryPolicy(
+            max_attempts=max(1, int(max_attempts or 1)),
+            base_delay_seconds=max(0.0, base_delay_seconds or 0.0),
+            max_delay_seconds=max(0.0, max_delay_seconds or 0.0),
+            deadline_seconds=deadline_seconds,
+        )
+
+    @staticmethod
+    def __get_env(name: str, default: float | None) -> float | None:
+        value = os.environ.get(name)
+        if not value:
+            return default
+        try:
+            return float(value)
+        except ValueError as ex:
+            raise GitOpsException(f"Invalid value for {name}: '{value}'") from ex
+
+    def get_delay_seconds(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, so concurrent clients don't retry in lockstep."""
+        max_delay = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1))
+        return random.uniform(0, max_delay)  # noqa: S311
+
+    def allows_retry(self, attempt: int, elapsed_seconds: float, delay_seconds: float) -> bool:
+        """Whether another attempt may follow `attempt` (1-based) after waiting `delay_seconds`."""
+        if attempt >= self.max_attempts:
+            return False
+        return self.deadline_seconds is None or elapsed_seconds + delay_seconds <= self.deadline_seconds
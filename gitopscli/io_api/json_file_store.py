@@ -0,0 +1,37 @@
+import hashlib
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+
+class JsonFileStore:
+    """JSON documents in a directory, one file per key (named after the SHA-256 hash of the key).
+
+    Documents are written to a temporary file which is then renamed, so concurrent gitopscli processes never
+    read a partially written document.
+    """
+
+    def __init__(self, store_dir: str) -> None:
+        self.__store_dir = Path(store_dir)
+
+    def get(self, key: str, max_age_seconds: float | None = None) -> Any | None:
+        """Return the document of `key`, or None if there is none, it's older than `max_age_seconds` or invalid."""
+        file_path = self.__file_path(key)
+        try:
+            if max_age_seconds is not None and time.time() - file_path.stat().st_mtime > max_age_seconds:
+                return None
+            return json.loads(file_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, document: Any) -> None:
+        """Write the document of `key`. Raises an `OSError` if it can't be written."""
+        self.__store_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=self.__store_dir, suffix=".tmp", delete=False) as tmp_file:
+            json.dump(document, tmp_file)
+        Path(tmp_file.name).replace(self.__file_path(key))
+
+    def __file_path(self, key: str) -> Path:
+        return self.__store_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
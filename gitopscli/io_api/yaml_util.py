@@ -1,68 +1,327 @@
 import locale
+import re
+import threading
+from collections.abc import Callable, Mapping
+from functools import lru_cache
 from io import StringIO
 from pathlib import Path
 from typing import Any
 
+from jsonpath_ng import Child, DatumInContext, Fields, Index, JSONPath
 from jsonpath_ng.exceptions import JSONPathError
 from jsonpath_ng.ext import parse
 from ruamel.yaml import YAML, YAMLError
+from ruamel.yaml.comments import CommentedMap, CommentedSeq
 
-YAML_INSTANCE = YAML()
-YAML_INSTANCE.preserve_quotes = True
+from gitopscli.tracing import span, traced
+
+_YAML_INSTANCES = threading.local()  # YAML instances are not thread-safe (e.g. `gitopscli serve`)
+
+JSONPATH_CACHE_SIZE = 256
+
+# plain keys like `image.tag` or `a.b[0].c` (reserved words of the JSONPath grammar are excluded)
+_SIMPLE_JSONPATH_SEGMENT = re.compile(
+    r"\.?(?:(?!(?:where(?:not)?|true|false)(?![\w-]))([A-Za-z_][\w-]*)|\[(\d+)\])", re.ASCII
+)
+
+_QUOTED_SCALAR = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_PLAIN_SCALAR_COMMENT = re.compile(r"\s#")
+
+
+def __get_yaml_instance() -> YAML:
+    yaml_instance = getattr(_YAML_INSTANCES, "yaml", None)
+    if yaml_instance is None:
+        yaml_instance = YAML()
+        yaml_instance.preserve_quotes = True
+        _YAML_INSTANCES.yaml = yaml_instance
+    return yaml_instance
 
 
 class YAMLException(Exception):  # noqa: N818
     pass
 
 
+class YAMLKeyError(KeyError):
+    def __init__(self, key: str, message: str) -> None:
+        super().__init__(message)
+        self.key = key
+
+
+@traced("yaml.load")
 def yaml_file_load(file_path: str) -> Any:
     with Path(file_path).open(encoding=locale.getpreferredencoding(do_setlocale=False)) as stream:
         try:
-            return YAML_INSTANCE.load(stream)
+            return __get_yaml_instance().load(stream)
         except YAMLError as ex:
             raise YAMLException(f"Error parsing YAML file: {file_path}") from ex
 
 
-def yaml_file_dump(yaml: Any, file_path: str) -> None:
-    with Path(file_path).open("w+", encoding=locale.getpreferredencoding(do_setlocale=False)) as stream:
-        YAML_INSTANCE.dump(yaml, stream)
+@traced("yaml.dump")
+def yaml_file_dump(yaml: Any, file_path: str) -> bool:
+    """Write `yaml` to the file unless the file already has exactly this content.
+
+    Returns whether the file was written. Skipping identical content keeps the file's mtime, so git doesn't
+    need to re-hash it and callers can skip committing.
+    """
+    stream = StringIO()
+    __get_yaml_instance().dump(yaml, stream)
+    content = stream.getvalue().encode(locale.getpreferredencoding(do_setlocale=False))
+    path = Path(file_path)
+    try:
+        if path.read_bytes() == content:
+            return False
+    except OSError:
+        pass  # raised again by the write below if the file can't be created
+    path.write_bytes(content)
+    return True
 
 
 def yaml_load(yaml_str: str) -> Any:
     try:
-        return YAML_INSTANCE.load(yaml_str)
+        return __get_yaml_instance().load(yaml_str)
     except YAMLError as ex:
         raise YAMLException(f"Error parsing YAML string '{yaml_str}'") from ex
 
 
 def yaml_dump(yaml: Any) -> str:
     stream = StringIO()
-    YAML_INSTANCE.dump(yaml, stream)
+    __get_yaml_instance().dump(yaml, stream)
     return stream.getvalue().rstrip()
 
 
 def update_yaml_file(file_path: str, key: str, value: Any) -> bool:
+    return bool(update_yaml_file_values(file_path, {key: value}))
+
+
+@traced("yaml.update_values")
+def update_yaml_file_values(
+    file_path: str,
+    values: Mapping[str, Any],
+    on_update: Callable[[str, Any], None] | None = None,
+) -> dict[str, Any]:
+    """Update all keys (JSONPath expressions) of `values` with a single load of the file.
+
+    Returns the keys that were actually updated together with their new values. The file is written once
+    at the end, or after every updated key followed by a call of `on_update(key, value)` if it is given
+    (e.g. to commit each change separately).
+
+    Replaced scalars are spliced into the original file content (see `_ScalarSplicer`), so all other lines keep
+    their bytes. Other updates fall back to dumping the whole YAML document.
+    """
+    source, content = __yaml_file_read(file_path)
+    splicer = _ScalarSplicer(source)
+    return __update_values(content, splicer, values, lambda: __write_yaml_file(content, splicer, file_path), on_update)
+
+
+@traced("yaml.update_values")
+def update_yaml_values(
+    source: str,
+    values: Mapping[str, Any],
+    on_update: Callable[[str, Any, str], None] | None = None,
+) -> tuple[str, dict[str, Any]]:
+    """Update all keys (JSONPath expressions) of `values` in YAML source held in memory.
+
+    Works like `update_yaml_file_values` (e.g. for a file read with `GitRepo.read_file`), but returns the updated
+    source along with the updated values, and `on_update(key, value, source)` also gets the source after every
+    updated key.
+    """
+    content = yaml_load(source)
+    splicer = _ScalarSplicer(source)
+    updated_source = source
+
+    def render() -> None:
+        nonlocal updated_source
+        updated_source = __render_yaml(content, splicer)
+
+    def notify(key: str, value: Any) -> None:
+        if on_update:
+            on_update(key, value, updated_source)
+
+    updated_values = __update_values(content, splicer, values, render, notify if on_update else None)
+    return updated_source, updated_values
+
+
+def __update_values(
+    content: Any,
+    splicer: "_ScalarSplicer",
+    values: Mapping[str, Any],
+    write: Callable[[], None],
+    on_update: Callable[[str, Any], None] | None,
+) -> dict[str, Any]:
+    updated_values = {}
+    for key, value in values.items():
+        matches = __update_yaml_content(content, key, value)
+        if not matches:
+            continue
+        for match in matches:
+            splicer.replace(match, value)
+        updated_values[key] = value
+        if on_update:
+            write()
+            on_update(key, value)
+    if updated_values and not on_update:
+        write()
+    return updated_values
+
+
+@traced("yaml.load")
+def __yaml_file_read(file_path: str) -> tuple[str, Any]:
+    source = Path(file_path).read_bytes().decode(locale.getpreferredencoding(do_setlocale=False))
+    try:
+        return source, __get_yaml_instance().load(source)
+    except YAMLError as ex:
+        raise YAMLException(f"Error parsing YAML file: {file_path}") from ex
+
+
+def __write_yaml_file(content: Any, splicer: "_ScalarSplicer", file_path: str) -> None:
+    spliced_source = splicer.get_source()
+    if spliced_source is None:
+        yaml_file_dump(content, file_path)
+        return
+    with span("yaml.splice"):
+        Path(file_path).write_bytes(spliced_source.encode(locale.getpreferredencoding(do_setlocale=False)))
+
+
+def __render_yaml(content: Any, splicer: "_ScalarSplicer") -> str:
+    spliced_source = splicer.get_source()
+    if spliced_source is not None:
+        return spliced_source
+    with span("yaml.dump"):
+        stream = StringIO()
+        __get_yaml_instance().dump(content, stream)
+        return stream.getvalue()
+
+
+class _ScalarSplicer:
+    """Replaces scalars in the source of a YAML file in place, without dumping the whole document.
+
+    A scalar is located by the line/column mark ruamel.yaml records while parsing. Only single-line plain or
+    quoted scalars of block collections are replaced. Anything else (e.g. a new mapping or a flow collection)
+    disables the splicer and `get_source()` returns None, so the caller has to dump the updated document.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.__lines = source.split("\n")
+        self.__replacements: dict[tuple[int, int], tuple[int, str]] = {}  # (line, column) -> (length, new text)
+        self.__disabled = source.startswith("\ufeff")  # BOMs aren't counted in column marks
+
+    def replace(self, match: DatumInContext, value: Any) -> None:
+        if self.__disabled:
+            return
+        location = self.__find_scalar(match)
+        text = self.__render_scalar(value)
+        if location is None or text is None:
+            self.__disabled = True
+            return
+        line, column, length = location
+        self.__replacements[(line, column)] = (length, text)
+
+    def get_source(self) -> str | None:
+        if self.__disabled:
+            return None
+        lines = list(self.__lines)
+        for (line, column), (length, text) in sorted(self.__replacements.items(), reverse=True):
+            lines[line] = lines[line][:column] + text + lines[line][column + length :]
+        return "\n".join(lines)
+
+    def __find_scalar(self, match: DatumInContext) -> tuple[int, int, int] | None:
+        old_value = match.value
+        mark = self.__get_value_mark(match) if isinstance(old_value, str | int | float) else None
+        if mark is None or mark[0] >= len(self.__lines):
+            return None
+        line, column = mark
+        scalar = self.__get_scalar_source(self.__lines[line][column:])
+        if not scalar:
+            return None
+        try:
+            parsed_scalar = yaml_load(scalar)
+        except YAMLException:
+            return None
+        # the mark points to an anchor, alias, tag or a multi-line scalar
+        if type(parsed_scalar) is not type(old_value) or parsed_scalar != old_value:
+            return None
+        return line, column, len(scalar)
+
+    @staticmethod
+    def __get_value_mark(match: DatumInContext) -> tuple[int, int] | None:
+        parent = match.context.value if match.context else None
+        path = match.path
+        try:
+            if isinstance(parent, CommentedMap) and isinstance(path, Fields) and len(path.fields) == 1:
+                line, column = parent.lc.value(path.fields[0])
+            elif isinstance(parent, CommentedSeq) and isinstance(path, Index) and len(path.indices) == 1:
+                line, column = parent.lc.item(path.indices[0] % len(parent))
+            else:
+                return None
+        except (KeyError, IndexError, TypeError):
+            return None
+        return None if parent.fa.flow_style() else (line, column)
+
+    @staticmethod
+    def __get_scalar_source(line_rest: str) -> str | None:
+        if line_rest[:1] in {"'", '"'}:
+            quoted = _QUOTED_SCALAR.match(line_rest)
+            return quoted.group() if quoted else None
+        if not line_rest or line_rest[0] in "&*!|>[{#":
+            return None
+        return _PLAIN_SCALAR_COMMENT.split(line_rest, maxsplit=1)[0].rstrip()
+
+    @staticmethod
+    def __render_scalar(value: Any) -> str | None:
+        if not isinstance(value, str | int | float):
+            return None
+        rendered = yaml_dump({"value": value})
+        if not rendered.startswith("value: ") or "\n" in rendered:
+            return None  # e.g. block scalars or strings folded into multiple lines
+        return rendered.removeprefix("value: ")
+
+
+@lru_cache(maxsize=JSONPATH_CACHE_SIZE)
+def parse_jsonpath(key: str) -> JSONPath:
+    """Compile a JSONPath expression. Plain dotted/indexed keys are built directly without the JSONPath parser."""
+    jsonpath_expr = __build_simple_jsonpath(key)
+    return jsonpath_expr if jsonpath_expr is not None else parse(key)
+
+
+def __build_simple_jsonpath(key: str) -> JSONPath | None:
+    jsonpath_expr: JSONPath | None = None
+    position = 0
+    while position < len(key):
+        segment = _SIMPLE_JSONPATH_SEGMENT.match(key, position)
+        if not segment:
+            return None
+        field, index = segment.groups()
+        has_dot = segment.group().startswith(".")
+        if has_dot if position == 0 else (field is not None and not has_dot):
+            return None
+        child = Fields(field) if field is not None else Index(int(index))
+        jsonpath_expr = child if jsonpath_expr is None else Child(jsonpath_expr, child)
+        position = segment.end()
+    return jsonpath_expr
+
+
+def __update_yaml_content(content: Any, key: str, value: Any) -> list[DatumInContext]:
+    """Returns the matches of `key` (with their previous values) if the content was updated."""
     if not key:
-        raise KeyError("Empty key!")
-    content = yaml_file_load(file_path)
+        raise YAMLKeyError(key, "Empty key!")
     try:
-        jsonpath_expr = parse(key)
+        jsonpath_expr = parse_jsonpath(key)
     except JSONPathError as ex:
-        raise KeyError(f"Key '{key}' is invalid JSONPath expression: {ex}!") from ex
+        raise YAMLKeyError(key, f"Key '{key}' is invalid JSONPath expression: {ex}!") from ex
     matches = jsonpath_expr.find(content)
     if not matches:
-        raise KeyError(f"Key '{key}' not found in YAML!")
+        raise YAMLKeyError(key, f"Key '{key}' not found in YAML!")
     if all(match.value == value for match in matches):
-        return False  # nothing to update
+        return []  # nothing to update
     try:
         jsonpath_expr.update(content, value)
     except TypeError as ex:
-        raise KeyError(f"Key '{key}' cannot be updated: {ex}!") from ex
-    yaml_file_dump(content, file_path)
-    return True
+        raise YAMLKeyError(key, f"Key '{key}' cannot be updated: {ex}!") from ex
+    return matches
 
 
-def merge_yaml_element(file_path: str, element_path: str, desired_value: Any) -> None:
+@traced("yaml.merge_element")
+def merge_yaml_element(file_path: str, element_path: str, desired_value: Any) -> bool:
     yaml_file_content = yaml_file_load(file_path)
     work_path = yaml_file_content
 
@@ -85,4 +344,4 @@ def merge_yaml_element(file_path: str, element_path: str, desired_value: Any) ->
         if key not in desired_value:
             del work_path[key]
 
-    yaml_file_dump(yaml_file_content, file_path)
+    return yaml_file_dump(yaml_file_content, file_path)
@@ -0,0 +1,191 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Generator
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+TRACE_FILE_ENV = "GITOPSCLI_TRACE_FILE"
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+AttributeValue = str | int | float | bool
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_span_id: str | None
+    start_time_ns: int
+    end_time_ns: int = 0
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_seconds(self) -> float:
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+
+class Trace:
+    """The spans of one command execution.
+
+    Spans are only recorded while a trace is active (see `start_trace`), otherwise `span` does nothing.
+    """
+
+    def __init__(self) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.__lock = threading.Lock()
+        self.__spans: list[Span] = []
+
+    def add(self, span: Span) -> None:
+        with self.__lock:
+            self.__spans.append(span)
+
+    def get_spans(self) -> list[Span]:
+        with self.__lock:
+            return sorted(self.__spans, key=lambda span: span.start_time_ns)
+
+    def get_phases(self) -> dict[str, dict[str, Any]]:
+        """Count and total duration of the finished spans per name (in order of their first start)."""
+        phases: dict[str, dict[str, Any]] = {}
+        for span in self.get_spans():
+            if not span.end_time_ns:
+                continue
+            phase = phases.setdefault(span.name, {"count": 0, "duration_seconds": 0.0})
+            phase["count"] += 1
+            phase["duration_seconds"] += span.duration_seconds
+        for phase in phases.values():
+            phase["duration_seconds"] = round(phase["duration_seconds"], 3)
+        return phases
+
+    def log_phases(self) -> None:
+        for name, phase in self.get_phases().items():
+            logging.info("Phase %s: %.3fs (%sx)", name, phase["duration_seconds"], phase["count"])
+
+    def to_otlp_json(self) -> dict[str, Any]:
+        """The spans in the OpenTelemetry protocol's JSON encoding (as exported by the OTLP/HTTP JSON exporters)."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_to_otlp_attribute("service.name", "gitopscli")]},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "gitopscli"},
+                            "spans": [self.__to_otlp_span(span) for span in self.get_spans() if span.end_time_ns],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def __to_otlp_span(self, span: Span) -> dict[str, Any]:
+        otlp_span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_time_ns),
+            "endTimeUnixNano": str(span.end_time_ns),
+            "attributes": [_to_otlp_attribute(key, value) for key, value in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_span_id:
+            otlp_span["parentSpanId"] = span.parent_span_id
+        return otlp_span
+
+    def write_otlp_file(self, file_path: str) -> None:
+        """Append the trace as a single line, so the file collects the traces of many runs (JSON Lines)."""
+        try:
+            with Path(file_path).open("a", encoding="utf-8") as trace_file:
+                trace_file.write(json.dumps(self.to_otlp_json(), separators=(",", ":")) + "\n")
+        except OSError as ex:
+            logging.warning("Could not write trace file: %s", ex)
+
+
+def _to_otlp_attribute(key: str, value: AttributeValue) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": value}}
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("gitopscli_trace", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("gitopscli_span", default=None)
+
+
+def get_current_trace() -> Trace | None:
+    return _current_trace.get()
+
+
+@contextmanager
+def start_trace(name: str, **attributes: AttributeValue) -> Generator[Trace, None, None]:
+    """Start a new trace with a root span `name`. Nested traces are recorded separately."""
+    trace = Trace()
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        with span(name, **attributes):
+            yield trace
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, **attributes: AttributeValue) -> Generator[None, None, None]:
+    """Record the duration of the enclosed block as span `name` of the current trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        span_id=os.urandom(8).hex(),
+        parent_span_id=parent.span_id if parent else None,
+        start_time_ns=time.time_ns(),
+        attributes=dict(attributes),
+    )
+    trace.add(current)
+    token = _current_span.set(current)
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    except BaseException as ex:
+        current.error = str(ex) or type(ex).__name__
+        raise
+    finally:
+        current.end_time_ns = current.start_time_ns + time.perf_counter_ns() - start_ns
+        _current_span.reset(token)
+
+
+def traced(name: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """Decorator recording each call of the function as span `name`."""
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def submit_in_context(executor: Executor, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+    """Submit `fn` to run in a copy of the current context, so its spans are recorded in the current trace."""
+    context = copy_context()
+    return executor.submit(lambda: context.run(fn, *args, **kwargs))
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from gitopscli.appconfig_api.app_tenant_config import create_app_tenant_config_from_repo
+from gitopscli.git_api import GitRepo
+from gitopscli.tracing import start_trace
+
+
+class AppTenantConfigTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.repo_dir = Path(tmp_dir.name)
+        self.tenant_repo = MagicMock(spec=GitRepo)
+        self.tenant_repo.get_clone_url.return_value = "https://repository.url/team/team-non-prod.git"
+        self.tenant_repo.get_full_file_path.side_effect = lambda path: str(self.repo_dir / path)
+
+    def create_app(self, app_name, custom_config=None):
+        (self.repo_dir / app_name).mkdir()
+        if custom_config is not None:
+            (self.repo_dir / app_name / ".config.yaml").write_text(custom_config)
+
+    def test_create_app_tenant_config_from_repo(self):
+        self.create_app("app-b", "customvalue: test\n")
+        self.create_app("app-a")
+        self.create_app("app: with # special chars")
+        self.create_app(".ignored")
+        (self.repo_dir / "README.md").write_text("not an app")
+
+        tenant_config = create_app_tenant_config_from_repo(self.tenant_repo)
+
+        self.tenant_repo.clone.assert_called_once_with()
+        self.assertEqual("https://repository.url/team/team-non-prod.git", tenant_config.repo_url)
+        self.assertEqual(
+            {"app-a": {}, "app-b": {"customAppConfig": {"customvalue": "test"}}, "app: with # special chars": {}},
+            tenant_config.list_apps(),
+        )
+        self.assertEqual(["app-a", "app-b", "app: with # special chars"], list(tenant_config.list_apps()))
+
+    def test_custom_configs_are_loaded_in_current_trace(self):
+        self.create_app("app-a", "replicas: 1\n")
+        self.create_app("app-b", "replicas: 2\n")
+
+        with start_trace("command") as trace:
+            create_app_tenant_config_from_repo(self.tenant_repo)
+
+        root = trace.get_spans()[0]
+        yaml_load_spans = [s for s in trace.get_spans() if s.name == "yaml.load"]
+        self.assertEqual(2, len(yaml_load_spans))
+        self.assertTrue(all(s.parent_span_id == root.span_id for s in yaml_load_spans))
+
+    def test_create_app_tenant_config_from_repo_with_many_apps(self):
+        app_count = 1_000
+        for i in range(app_count):
+            self.create_app(f"app-{i:04}", f"replicas: {i}\n" if i % 2 else None)
+
+        tenant_config = create_app_tenant_config_from_repo(self.tenant_repo)
+
+        apps = tenant_config.list_apps()
+        self.assertEqual(app_count, len(apps))
+        self.assertEqual({}, apps["app-0000"])
+        self.assertEqual({"customAppConfig": {"replicas": 999}}, apps["app-0999"])
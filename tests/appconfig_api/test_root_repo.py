@@ -0,0 +1,60 @@
+import unittest
+
+import pytest
+
+from gitopscli.appconfig_api.app_tenant_config import AppTenantConfig
+from gitopscli.appconfig_api.root_repo import RootRepo
+from gitopscli.gitops_exception import GitOpsException
+
+
+def tenant(name, *apps):
+    return AppTenantConfig(
+        yaml={"repository": f"https://repository.url/{name}.git", "applications": {app: {} for app in apps}},
+        file_path=f"/tmp/root-config-repo/apps/{name}.yaml",
+    )
+
+
+class RootRepoTest(unittest.TestCase):
+    def setUp(self):
+        self.testee = RootRepo({"team-a": tenant("team-a", "app-1", "app-2"), "team-b": tenant("team-b", "app-3")})
+
+    def test_get_tenant_by_repo_url(self):
+        self.assertIs(
+            self.testee.tenants["team-b"], self.testee.get_tenant_by_repo_url("https://repository.url/team-b.git")
+        )
+        self.assertIsNone(self.testee.get_tenant_by_repo_url("https://repository.url/unknown.git"))
+
+    def test_validate_tenant(self):
+        self.testee.validate_tenant(tenant("team-a", "app-1", "app-4"))
+        with pytest.raises(GitOpsException) as ex:
+            self.testee.validate_tenant(tenant("team-a", "app-1", "app-3"))
+        self.assertEqual("Application 'app-3' already exists in a different repository", str(ex.value))
+
+    def test_merge_applications_updates_app_index(self):
+        self.testee.merge_applications(self.testee.tenants["team-b"], tenant("team-b", "app-4"))
+
+        self.assertTrue(self.testee.tenants["team-b"].dirty)
+        self.assertEqual({"app-4": {}}, self.testee.tenants["team-b"].list_apps())
+        self.testee.validate_tenant(tenant("team-a", "app-3"))  # app-3 was removed from team-b
+        with pytest.raises(GitOpsException) as ex:
+            self.testee.validate_tenant(tenant("team-a", "app-4"))
+        self.assertEqual("Application 'app-4' already exists in a different repository", str(ex.value))
+
+    def test_lookup_and_validation_cost_with_many_tenants(self):
+        tenant_count, app_count = 1_000, 100
+        testee = RootRepo(
+            {
+                f"team-{t}": tenant(f"team-{t}", *(f"team-{t}-app-{a}" for a in range(app_count)))
+                for t in range(tenant_count)
+            }
+        )
+
+        for t in range(tenant_count):
+            repo_tenant = testee.get_tenant_by_repo_url(f"https://repository.url/team-{t}.git")
+            desired = tenant(f"team-{t}", *(f"team-{t}-app-{a}" for a in range(1, app_count + 1)))
+            testee.validate_tenant(desired)
+            testee.merge_applications(repo_tenant, desired)
+
+        self.assertEqual(tenant_count * app_count, len(testee.get_all_applications()))
+        with pytest.raises(GitOpsException):
+            testee.validate_tenant(tenant("team-0", "team-1-app-100"))
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gitopscli.appconfig_api.sync_state import (
+    SYNC_STATE_DIR_ENV,
+    SyncStateStore,
+    TenantSyncState,
+    get_applications_hash,
+)
+
+
+class SyncStateStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.state_dir = Path(tmp_dir.name) / "sync-state"
+        self.testee = SyncStateStore(str(self.state_dir))
+
+    def test_put_and_get(self):
+        state = TenantSyncState("team-a", "abc123", "hash")
+
+        self.assertIsNone(self.testee.get("<root-url>", "<tenant-url>"))
+        self.testee.put("<root-url>", "<tenant-url>", state)
+
+        self.assertEqual(state, self.testee.get("<root-url>", "<tenant-url>"))
+        self.assertIsNone(self.testee.get("<other-root-url>", "<tenant-url>"))
+        self.assertEqual(1, len(list(self.state_dir.iterdir())))
+
+    def test_invalid_state_file_is_ignored(self):
+        self.testee.put("<root-url>", "<tenant-url>", TenantSyncState("team-a", "abc123", "hash"))
+        (state_file,) = self.state_dir.iterdir()
+
+        for content in ["no json", '{"tenant_name": "team-a"}', "[]"]:
+            with self.subTest(content=content):
+                state_file.write_text(content)
+                self.assertIsNone(self.testee.get("<root-url>", "<tenant-url>"))
+
+    def test_from_env(self):
+        with patch.dict(os.environ, {SYNC_STATE_DIR_ENV: str(self.state_dir)}):
+            self.assertIsInstance(SyncStateStore.from_env(), SyncStateStore)
+        with patch.dict(os.environ, clear=True):
+            self.assertIsNone(SyncStateStore.from_env())
+
+    def test_applications_hash(self):
+        self.assertEqual(
+            get_applications_hash({"app-1": {}, "app-2": {"customAppConfig": {"a": 1, "b": 2}}}),
+            get_applications_hash({"app-2": {"customAppConfig": {"b": 2, "a": 1}}, "app-1": {}}),
+        )
+        self.assertNotEqual(
+            get_applications_hash({"app-1": {}}),
+            get_applications_hash({"app-1": {"customAppConfig": {"a": 1}}}),
+        )
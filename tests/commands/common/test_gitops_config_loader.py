@@ -1,3 +1,4 @@
+import logging
 import unittest
 from unittest.mock import call
 
@@ -7,7 +8,7 @@ from gitopscli.commands.common.gitops_config_loader import load_gitops_config
 from gitopscli.git_api import GitApiConfig, GitProvider, GitRepo, GitRepoApi, GitRepoApiFactory
 from gitopscli.gitops_config import GitOpsConfig
 from gitopscli.gitops_exception import GitOpsException
-from gitopscli.io_api.yaml_util import yaml_file_load
+from gitopscli.io_api.yaml_util import yaml_file_load, yaml_load
 from tests.commands.mock_mixin import MockMixin
 
 
@@ -25,7 +26,14 @@ class GitOpsConfigLoaderTest(MockMixin, unittest.TestCase):
         self.yaml_file_load_mock = self.monkey_patch(yaml_file_load)
         self.yaml_file_load_mock.return_value = {"dummy": "gitopsconfig"}
 
+        self.yaml_load_mock = self.monkey_patch(yaml_load)
+        self.yaml_load_mock.return_value = {"dummy": "gitopsconfig"}
+
+        self.logging_mock = self.monkey_patch(logging)
+        self.logging_mock.warning.return_value = None
+
         self.git_repo_api_mock = self.create_mock(GitRepoApi)
+        self.git_repo_api_mock.get_file_content.return_value = "dummy: gitopsconfig"
 
         self.git_repo_api_factory_mock = self.monkey_patch(GitRepoApiFactory)
         self.git_repo_api_factory_mock.create.return_value = self.git_repo_api_mock
@@ -48,14 +56,50 @@ class GitOpsConfigLoaderTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(self.git_api_config, "ORGA", "REPO"),
+            call.GitRepoApi.get_file_content(".gitops.config.yaml"),
+            call.yaml_load("dummy: gitopsconfig"),
+            call.GitOpsConfig.from_yaml({"dummy": "gitopsconfig"}),
+        ]
+
+    def test_file_not_found(self):
+        self.git_repo_api_mock.get_file_content.return_value = None
+
+        with pytest.raises(GitOpsException) as ex:
+            load_gitops_config(git_api_config=self.git_api_config, organisation="ORGA", repository_name="REPO")
+
+        self.assertEqual(str(ex.value), "No such file: .gitops.config.yaml")
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(self.git_api_config, "ORGA", "REPO"),
+            call.GitRepoApi.get_file_content(".gitops.config.yaml"),
+        ]
+
+    def test_clone_fallback_happy_flow(self):
+        api_exception = GitOpsException("api error")
+        self.git_repo_api_mock.get_file_content.side_effect = api_exception
+
+        gitops_config = load_gitops_config(
+            git_api_config=self.git_api_config, organisation="ORGA", repository_name="REPO"
+        )
+
+        assert gitops_config == self.gitops_config_mock
+
+        assert self.mock_manager.method_calls == [
+            call.GitRepoApiFactory.create(self.git_api_config, "ORGA", "REPO"),
+            call.GitRepoApi.get_file_content(".gitops.config.yaml"),
+            call.logging.warning(
+                "Cannot read %s via API, cloning repository instead: %s", ".gitops.config.yaml", api_exception
+            ),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo.clone(sparse_paths=[".gitops.config.yaml"]),
             call.GitRepo.get_full_file_path(".gitops.config.yaml"),
             call.yaml_file_load("/repo-dir/.gitops.config.yaml"),
             call.GitOpsConfig.from_yaml({"dummy": "gitopsconfig"}),
         ]
 
-    def test_file_not_found(self):
+    def test_clone_fallback_file_not_found(self):
+        api_exception = GitOpsException("api error")
+        self.git_repo_api_mock.get_file_content.side_effect = api_exception
         self.yaml_file_load_mock.side_effect = FileNotFoundError("file not found")
 
         with pytest.raises(GitOpsException) as ex:
@@ -65,8 +109,12 @@ class GitOpsConfigLoaderTest(MockMixin, unittest.TestCase):
 
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(self.git_api_config, "ORGA", "REPO"),
+            call.GitRepoApi.get_file_content(".gitops.config.yaml"),
+            call.logging.warning(
+                "Cannot read %s via API, cloning repository instead: %s", ".gitops.config.yaml", api_exception
+            ),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo.clone(sparse_paths=[".gitops.config.yaml"]),
             call.GitRepo.get_full_file_path(".gitops.config.yaml"),
             call.yaml_file_load("/repo-dir/.gitops.config.yaml"),
         ]
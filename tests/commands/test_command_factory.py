@@ -8,6 +8,8 @@ from gitopscli.commands.create_preview import CreatePreviewCommand
 from gitopscli.commands.delete_pr_preview import DeletePrPreviewCommand
 from gitopscli.commands.delete_preview import DeletePreviewCommand
 from gitopscli.commands.deploy import DeployCommand
+from gitopscli.commands.deploy_batch import DeployBatchCommand
+from gitopscli.commands.serve import ServeCommand
 from gitopscli.commands.sync_apps import SyncAppsCommand
 from gitopscli.commands.version import VersionCommand
 
@@ -18,6 +20,11 @@ class CommandFactoryTest(unittest.TestCase):
         command = CommandFactory.create(args)
         self.assertEqual(DeployCommand, type(command))
 
+    def test_create_deploy_batch_command(self):
+        args = Mock(spec=DeployBatchCommand.Args)
+        command = CommandFactory.create(args)
+        self.assertEqual(DeployBatchCommand, type(command))
+
     def test_create_sync_apps_command(self):
         args = Mock(spec=SyncAppsCommand.Args)
         command = CommandFactory.create(args)
@@ -52,3 +59,8 @@ class CommandFactoryTest(unittest.TestCase):
         args = Mock(spec=VersionCommand.Args)
         command = CommandFactory.create(args)
         self.assertEqual(VersionCommand, type(command))
+
+    def test_create_serve_command(self):
+        args = Mock(spec=ServeCommand.Args)
+        command = CommandFactory.create(args)
+        self.assertEqual(ServeCommand, type(command))
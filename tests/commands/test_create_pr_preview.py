@@ -1,12 +1,27 @@
 import unittest
 from unittest.mock import call
 
-from gitopscli.commands.create_pr_preview import CreatePreviewCommand, CreatePrPreviewCommand
+from gitopscli.commands.create_pr_preview import CreatePreviewCommand, CreatePrPreviewCommand, load_gitops_config
 from gitopscli.git_api import GitProvider, GitRepoApi, GitRepoApiFactory
+from gitopscli.gitops_config import GitOpsConfig
 
 from .mock_mixin import MockMixin
 
 DUMMY_GIT_HASH = "5f65cfa04c66444fcb756d6d7f39304d1c18b199"
+ARGS = CreatePrPreviewCommand.Args(
+    username="USERNAME",
+    password="PASSWORD",
+    git_user="GIT_USER",
+    git_email="GIT_EMAIL",
+    git_author_name=None,
+    git_author_email=None,
+    organisation="ORGA",
+    repository_name="REPO",
+    git_provider=GitProvider.GITHUB,
+    git_provider_url="URL",
+    pr_id=4711,
+    parent_id=42,
+)
 
 
 class CreatePrPreviewCommandTest(MockMixin, unittest.TestCase):
@@ -27,23 +42,32 @@ class CreatePrPreviewCommandTest(MockMixin, unittest.TestCase):
         self.git_repo_api_factory_mock = self.monkey_patch(GitRepoApiFactory)
         self.git_repo_api_factory_mock.create.return_value = self.git_repo_api_mock
 
+        self.gitops_config = GitOpsConfig(
+            api_version=0,
+            application_name="APP",
+            messages_created_template="created",
+            messages_updated_template="updated",
+            messages_uptodate_template="uptodate",
+            preview_host_template="www.foo.bar",
+            preview_template_organisation="PREVIEW_TEMPLATE_ORG",
+            preview_template_repository="PREVIEW_TEMPLATE_REPO",
+            preview_template_path_template=".preview-templates/my-app",
+            preview_template_branch=None,
+            preview_target_organisation="PREVIEW_TARGET_ORG",
+            preview_target_repository="PREVIEW_TARGET_REPO",
+            preview_target_branch=None,
+            preview_target_namespace_template="APP-${PREVIEW_ID_HASH}-preview",
+            preview_target_max_namespace_length=50,
+            preview_target_path_template="",
+            replacements={},
+        )
+        self.load_gitops_config_mock = self.monkey_patch(load_gitops_config)
+        self.load_gitops_config_mock.return_value = self.gitops_config
+
         self.seal_mocks()
 
     def test_create_pr_preview(self):
-        args = CreatePrPreviewCommand.Args(
-            username="USERNAME",
-            password="PASSWORD",
-            git_user="GIT_USER",
-            git_email="GIT_EMAIL",
-            git_author_name=None,
-            git_author_email=None,
-            organisation="ORGA",
-            repository_name="REPO",
-            git_provider=GitProvider.GITHUB,
-            git_provider_url="URL",
-            pr_id=4711,
-            parent_id=42,
-        )
+        args = ARGS
         CreatePrPreviewCommand(args).execute()
 
         callbacks = self.create_preview_command_mock.register_callbacks.call_args.kwargs
@@ -69,7 +93,8 @@ class CreatePrPreviewCommandTest(MockMixin, unittest.TestCase):
                     git_provider_url="URL",
                     git_hash=DUMMY_GIT_HASH,
                     preview_id="BRANCH_OF_PR_4711",
-                )
+                ),
+                None,
             ),
             call.CreatePreviewCommand.register_callbacks(
                 deployment_already_up_to_date_callback=deployment_already_up_to_date_callback,
@@ -117,3 +142,13 @@ class CreatePrPreviewCommandTest(MockMixin, unittest.TestCase):
                 42,
             )
         ]
+
+    def test_gitops_config_of_written_repositories_is_reused(self):
+        command = CreatePrPreviewCommand(ARGS)
+
+        self.assertEqual([("PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO")], command.get_written_repositories())
+        self.assertEqual([("PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO")], command.get_written_repositories())
+        command.execute()
+
+        self.load_gitops_config_mock.assert_called_once_with(ARGS, "ORGA", "REPO")
+        self.assertIs(self.gitops_config, self.create_preview_command_mock.call_args.args[1])
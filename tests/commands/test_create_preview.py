@@ -8,7 +8,7 @@ from gitopscli.commands.create_preview import CreatePreviewCommand, load_gitops_
 from gitopscli.git_api import GitApiConfig, GitProvider, GitRepo, GitRepoApi, GitRepoApiFactory
 from gitopscli.gitops_config import GitOpsConfig
 from gitopscli.gitops_exception import GitOpsException
-from gitopscli.io_api.yaml_util import YAMLException, update_yaml_file, yaml_file_dump
+from gitopscli.io_api.yaml_util import YAMLException, YAMLKeyError, update_yaml_file_values, yaml_file_dump
 
 from .mock_mixin import MockMixin
 
@@ -55,8 +55,8 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         self.logging_mock = self.monkey_patch(logging)
         self.logging_mock.info.return_value = None
 
-        self.update_yaml_file_mock = self.monkey_patch(update_yaml_file)
-        self.update_yaml_file_mock.return_value = True
+        self.update_yaml_file_values_mock = self.monkey_patch(update_yaml_file_values)
+        self.update_yaml_file_values_mock.side_effect = lambda _, values: dict(values)  # all values updated
 
         self.yaml_file_dump_mock = self.monkey_patch(yaml_file_dump)
         self.yaml_file_dump_mock.return_value = None
@@ -116,6 +116,9 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         self.target_git_repo_mock.__exit__.return_value = False
         self.target_git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/target-repo/{x}"
         self.target_git_repo_mock.clone.return_value = None
+        changed_paths = set()
+        self.target_git_repo_mock.mark_changed.side_effect = changed_paths.add
+        self.target_git_repo_mock.get_changed_paths.side_effect = lambda: sorted(changed_paths)
 
         def git_repo_constructor_mock(git_repo_api: GitRepoApi) -> GitRepo:
             if git_repo_api == self.template_git_repo_api_mock:
@@ -159,10 +162,10 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             ),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
             call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.Path("/tmp/target-repo/my-app-685912d3-preview"),
             call.Path.is_dir(),
@@ -174,41 +177,45 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.shutil.copytree(
                 "/tmp/template-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
             ),
+            call.GitRepo.mark_changed("my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
+            call.update_yaml_file_values(
+                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", {"name": "my-app-685912d3-preview"}
             ),
+            call.GitRepo.mark_changed("my-app-685912d3-preview/Chart.yaml"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"
             ),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
+            call.update_yaml_file_values(
                 "/tmp/target-repo/my-app-685912d3-preview/values.yaml",
-                "image.tag",
-                "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
+                {"image.tag": "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9", "route.host": "app.xy-685912d3.example.tld"},
             ),
+            call.GitRepo.mark_changed("my-app-685912d3-preview/values.yaml"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "image.tag",
                 "values.yaml",
                 "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
             ),
-            call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml", "route.host", "app.xy-685912d3.example.tld"
-            ),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "route.host",
                 "values.yaml",
                 "app.xy-685912d3.example.tld",
             ),
+            call.GitRepo.get_changed_paths(),
             call.GitRepo.commit(
                 "GIT_USER",
                 "GIT_EMAIL",
                 "GIT_AUTHOR_NAME",
                 "GIT_AUTHOR_EMAIL",
                 "Create new preview environment for 'my-app' and git hash '3361723dbd91fcfae7b5b8b8b7d462fbc14187a9'.",
+                paths=[
+                    "my-app-685912d3-preview",
+                    "my-app-685912d3-preview/Chart.yaml",
+                    "my-app-685912d3-preview/values.yaml",
+                ],
             ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
@@ -268,7 +275,7 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
                 ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"
             ),  # only clone once for template and target
             call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview", ".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.Path("/tmp/target-repo/my-app-685912d3-preview"),
             call.Path.is_dir(),
@@ -280,41 +287,45 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.shutil.copytree(
                 "/tmp/target-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
             ),
+            call.GitRepo.mark_changed("my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
+            call.update_yaml_file_values(
+                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", {"name": "my-app-685912d3-preview"}
             ),
+            call.GitRepo.mark_changed("my-app-685912d3-preview/Chart.yaml"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"
             ),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
+            call.update_yaml_file_values(
                 "/tmp/target-repo/my-app-685912d3-preview/values.yaml",
-                "image.tag",
-                "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
+                {"image.tag": "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9", "route.host": "app.xy-685912d3.example.tld"},
             ),
+            call.GitRepo.mark_changed("my-app-685912d3-preview/values.yaml"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "image.tag",
                 "values.yaml",
                 "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
             ),
-            call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml", "route.host", "app.xy-685912d3.example.tld"
-            ),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "route.host",
                 "values.yaml",
                 "app.xy-685912d3.example.tld",
             ),
+            call.GitRepo.get_changed_paths(),
             call.GitRepo.commit(
                 "GIT_USER",
                 "GIT_EMAIL",
                 "GIT_AUTHOR_NAME",
                 "GIT_AUTHOR_EMAIL",
                 "Create new preview environment for 'my-app' and git hash '3361723dbd91fcfae7b5b8b8b7d462fbc14187a9'.",
+                paths=[
+                    "my-app-685912d3-preview",
+                    "my-app-685912d3-preview/Chart.yaml",
+                    "my-app-685912d3-preview/values.yaml",
+                ],
             ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
@@ -342,49 +353,48 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
             call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.Path("/tmp/target-repo/my-app-685912d3-preview"),
             call.Path.is_dir(),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
+            call.update_yaml_file_values(
+                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", {"name": "my-app-685912d3-preview"}
             ),
+            call.GitRepo.mark_changed("my-app-685912d3-preview/Chart.yaml"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"
             ),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
+            call.update_yaml_file_values(
                 "/tmp/target-repo/my-app-685912d3-preview/values.yaml",
-                "image.tag",
-                "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
+                {"image.tag": "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9", "route.host": "app.xy-685912d3.example.tld"},
             ),
+            call.GitRepo.mark_changed("my-app-685912d3-preview/values.yaml"),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "image.tag",
                 "values.yaml",
                 "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
             ),
-            call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml", "route.host", "app.xy-685912d3.example.tld"
-            ),
             call.logging.info(
                 "Replaced property '%s' in '%s' with value: %s",
                 "route.host",
                 "values.yaml",
                 "app.xy-685912d3.example.tld",
             ),
+            call.GitRepo.get_changed_paths(),
             call.GitRepo.commit(
                 "GIT_USER",
                 "GIT_EMAIL",
                 "GIT_AUTHOR_NAME",
                 "GIT_AUTHOR_EMAIL",
                 "Update preview environment for 'my-app' and git hash '3361723dbd91fcfae7b5b8b8b7d462fbc14187a9'.",
+                paths=["my-app-685912d3-preview/Chart.yaml", "my-app-685912d3-preview/values.yaml"],
             ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
@@ -395,7 +405,7 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             True,  # /tmp/target-repo/my-app-685912d3-preview, already exists -> expect update
         ]
 
-        self.update_yaml_file_mock.return_value = False  # nothing updated -> expect already up to date
+        self.update_yaml_file_values_mock.side_effect = lambda _, __: {}  # nothing updated -> expect already up to date
 
         deployment_already_up_to_date_callback = Mock(return_value=None)
 
@@ -414,24 +424,23 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
             call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.Path("/tmp/target-repo/my-app-685912d3-preview"),
             call.Path.is_dir(),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
+            call.update_yaml_file_values(
+                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", {"name": "my-app-685912d3-preview"}
             ),
             call.logging.info("Keep property '%s' in '%s' value: %s", "name", "Chart.yaml", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
+            call.update_yaml_file_values(
                 "/tmp/target-repo/my-app-685912d3-preview/values.yaml",
-                "image.tag",
-                "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
+                {"image.tag": "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9", "route.host": "app.xy-685912d3.example.tld"},
             ),
             call.logging.info(
                 "Keep property '%s' in '%s' value: %s",
@@ -439,10 +448,6 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
                 "values.yaml",
                 "3361723dbd91fcfae7b5b8b8b7d462fbc14187a9",
             ),
-            call.GitRepo.get_full_file_path("my-app-685912d3-preview/values.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/values.yaml", "route.host", "app.xy-685912d3.example.tld"
-            ),
             call.logging.info(
                 "Keep property '%s' in '%s' value: %s", "route.host", "values.yaml", "app.xy-685912d3.example.tld"
             ),
@@ -466,10 +471,10 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
             call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.Path("/tmp/target-repo/my-app-685912d3-preview"),
             call.Path.is_dir(),
@@ -480,7 +485,7 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
         ]
 
     def test_create_preview_values_yaml_not_found(self):
-        self.update_yaml_file_mock.side_effect = FileNotFoundError()
+        self.update_yaml_file_values_mock.side_effect = FileNotFoundError()
 
         try:
             CreatePreviewCommand(ARGS).execute()
@@ -493,22 +498,22 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
             call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.Path("/tmp/target-repo/my-app-685912d3-preview"),
             call.Path.is_dir(),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
+            call.update_yaml_file_values(
+                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", {"name": "my-app-685912d3-preview"}
             ),
         ]
 
     def test_create_preview_values_yaml_parse_error(self):
-        self.update_yaml_file_mock.side_effect = YAMLException()
+        self.update_yaml_file_values_mock.side_effect = YAMLException()
 
         try:
             CreatePreviewCommand(ARGS).execute()
@@ -521,22 +526,22 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
             call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.Path("/tmp/target-repo/my-app-685912d3-preview"),
             call.Path.is_dir(),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
+            call.update_yaml_file_values(
+                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", {"name": "my-app-685912d3-preview"}
             ),
         ]
 
     def test_create_preview_with_invalid_replacement_path(self):
-        self.update_yaml_file_mock.side_effect = KeyError()
+        self.update_yaml_file_values_mock.side_effect = YAMLKeyError("name", "Key 'name' not found in YAML!")
 
         try:
             CreatePreviewCommand(ARGS).execute()
@@ -549,17 +554,17 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
             call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.Path("/tmp/target-repo/my-app-685912d3-preview"),
             call.Path.is_dir(),
             call.logging.info("Use existing folder for preview: %s", "my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
+            call.update_yaml_file_values(
+                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", {"name": "my-app-685912d3-preview"}
             ),
         ]
 
@@ -569,7 +574,7 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             True,  # /tmp/template-repo/.preview-templates/my-app
         ]
 
-        self.update_yaml_file_mock.side_effect = KeyError()
+        self.update_yaml_file_values_mock.side_effect = YAMLKeyError("name", "Key 'name' not found in YAML!")
 
         try:
             CreatePreviewCommand(ARGS).execute()
@@ -582,10 +587,10 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.yaml_file_dump(INFO_YAML, "/tmp/gitopscli-preview-info.yaml"),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.target_git_repo_api_mock),
-            call.GitRepo.clone(None),
+            call.GitRepo.clone(None, sparse_paths=["my-app-685912d3-preview"]),
             call.GitRepoApiFactory.create(ARGS, "PREVIEW_TEMPLATE_ORG", "PREVIEW_TEMPLATE_REPO"),
             call.GitRepo(self.template_git_repo_api_mock),
-            call.GitRepo.clone("template-branch"),
+            call.GitRepo.clone("template-branch", sparse_paths=[".preview-templates/my-app"]),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview"),
             call.Path("/tmp/target-repo/my-app-685912d3-preview"),
             call.Path.is_dir(),
@@ -597,9 +602,10 @@ class CreatePreviewCommandTest(MockMixin, unittest.TestCase):
             call.shutil.copytree(
                 "/tmp/template-repo/.preview-templates/my-app", "/tmp/target-repo/my-app-685912d3-preview"
             ),
+            call.GitRepo.mark_changed("my-app-685912d3-preview"),
             call.GitRepo.get_full_file_path("my-app-685912d3-preview/Chart.yaml"),
-            call.update_yaml_file(
-                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", "name", "my-app-685912d3-preview"
+            call.update_yaml_file_values(
+                "/tmp/target-repo/my-app-685912d3-preview/Chart.yaml", {"name": "my-app-685912d3-preview"}
             ),
         ]
 
@@ -49,6 +49,7 @@ class DeletePrPreviewCommandTest(MockMixin, unittest.TestCase):
                 git_provider_url="URL",
                 preview_id="some/branch",  # call DeletePreviewCommand with branch as preview_id
                 expect_preview_exists=True,
-            )
+            ),
+            None,
         )
         self.delete_preview_command_mock.execute.assert_called_once()
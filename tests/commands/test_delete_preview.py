@@ -64,6 +64,9 @@ class DeletePreviewCommandTest(MockMixin, unittest.TestCase):
         self.git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/created-tmp-dir/{x}"
         self.git_repo_mock.clone.return_value = None
         self.git_repo_mock.commit.return_value = None
+        changed_paths = set()
+        self.git_repo_mock.mark_changed.side_effect = changed_paths.add
+        self.git_repo_mock.get_changed_paths.side_effect = lambda: sorted(changed_paths)
         self.git_repo_mock.pull_rebase.return_value = None
         self.git_repo_mock.push.return_value = None
 
@@ -89,23 +92,48 @@ class DeletePreviewCommandTest(MockMixin, unittest.TestCase):
             call.load_gitops_config(args, "ORGA", "REPO"),
             call.GitRepoApiFactory.create(args, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone("target-branch"),
+            call.GitRepo.clone("target-branch", sparse_paths=["app-685912d3-preview"]),
             call.logging.info("Preview folder: %s", "app-685912d3-preview"),
             call.GitRepo.get_full_file_path("app-685912d3-preview"),
             call.Path("/tmp/created-tmp-dir/app-685912d3-preview"),
             call.Path.exists(),
             call.shutil.rmtree("/tmp/created-tmp-dir/app-685912d3-preview", ignore_errors=True),
+            call.GitRepo.mark_changed("app-685912d3-preview"),
+            call.GitRepo.get_changed_paths(),
             call.GitRepo.commit(
                 "GIT_USER",
                 "GIT_EMAIL",
                 "GIT_AUTHOR_NAME",
                 "GIT_AUTHOR_EMAIL",
                 "Delete preview environment for 'APP' and preview id 'PREVIEW_ID'.",
+                paths=["app-685912d3-preview"],
             ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
         ]
 
+    def test_get_written_repositories(self):
+        args = DeletePreviewCommand.Args(
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            git_author_name="GIT_AUTHOR_NAME",
+            git_author_email="GIT_AUTHOR_EMAIL",
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            preview_id="PREVIEW_ID",
+            expect_preview_exists=False,
+        )
+        command = DeletePreviewCommand(args)
+
+        self.assertEqual([("PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO")], command.get_written_repositories())
+        command.execute()
+
+        self.assertEqual(1, self.mock_manager.method_calls.count(call.load_gitops_config(args, "ORGA", "REPO")))
+
     def test_delete_missing_happy_flow(self):
         self.path_mock.exists.return_value = False
 
@@ -128,7 +156,7 @@ class DeletePreviewCommandTest(MockMixin, unittest.TestCase):
             call.load_gitops_config(args, "ORGA", "REPO"),
             call.GitRepoApiFactory.create(args, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone("target-branch"),
+            call.GitRepo.clone("target-branch", sparse_paths=["app-685912d3-preview"]),
             call.logging.info("Preview folder: %s", "app-685912d3-preview"),
             call.GitRepo.get_full_file_path("app-685912d3-preview"),
             call.Path("/tmp/created-tmp-dir/app-685912d3-preview"),
@@ -163,7 +191,7 @@ class DeletePreviewCommandTest(MockMixin, unittest.TestCase):
             call.load_gitops_config(args, "ORGA", "REPO"),
             call.GitRepoApiFactory.create(args, "PREVIEW_TARGET_ORG", "PREVIEW_TARGET_REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone("target-branch"),
+            call.GitRepo.clone("target-branch", sparse_paths=["app-685912d3-preview"]),
             call.logging.info("Preview folder: %s", "app-685912d3-preview"),
             call.GitRepo.get_full_file_path("app-685912d3-preview"),
             call.Path("/tmp/created-tmp-dir/app-685912d3-preview"),
@@ -12,7 +12,7 @@ import pytest
 from gitopscli.commands.deploy import DeployCommand
 from gitopscli.git_api import GitProvider, GitRepo, GitRepoApi, GitRepoApiFactory
 from gitopscli.gitops_exception import GitOpsException
-from gitopscli.io_api.yaml_util import YAMLException, update_yaml_file
+from gitopscli.io_api.yaml_util import YAMLException, update_yaml_values
 
 from .mock_mixin import MockMixin
 
@@ -21,8 +21,15 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
     def setUp(self):
         self.init_mock_manager(DeployCommand)
 
-        self.update_yaml_file_mock = self.monkey_patch(update_yaml_file)
-        self.update_yaml_file_mock.return_value = True
+        def update_all_values(source, values, on_update=None):
+            for key, value in values.items():
+                source += f"{key}: {value}\n"
+                if on_update:
+                    on_update(key, value, source)
+            return source, dict(values)
+
+        self.update_yaml_values_mock = self.monkey_patch(update_yaml_values)
+        self.update_yaml_values_mock.side_effect = update_all_values
 
         self.logging_mock = self.monkey_patch(logging)
         self.logging_mock.info.return_value = None
@@ -34,6 +41,7 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         self.git_repo_api_mock.create_pull_request_to_default_branch.return_value = GitRepoApi.PullRequestIdAndUrl(
             42, "<url of dummy pr>"
         )
+        self.git_repo_api_mock.get_pull_request_merge_status.return_value = GitRepoApi.MergeStatus.READY
         self.git_repo_api_mock.merge_pull_request.return_value = None
         self.git_repo_api_mock.delete_branch.return_value = None
 
@@ -47,10 +55,10 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         self.git_repo_mock.clone.return_value = None
         self.git_repo_mock.new_branch.return_value = None
         self.example_commit_hash = "5f3a443e7ecb3723c1a71b9744e2993c0b6dfc00"
-        self.git_repo_mock.commit.return_value = self.example_commit_hash
+        self.git_repo_mock.read_file.return_value = "a: b\n"
+        self.git_repo_mock.commit_files.return_value = self.example_commit_hash
         self.git_repo_mock.pull_rebase.return_value = None
         self.git_repo_mock.push.return_value = None
-        self.git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/created-tmp-dir/{x}"
 
         self.seal_mocks()
 
@@ -82,25 +90,26 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.clone(sparse_paths=[]),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo", "a.b.d": "bar"}, on_update=mock.ANY),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
-            call.GitRepo.commit(
+            call.GitRepo.commit_files(
                 "GIT_USER",
                 "GIT_EMAIL",
                 "GIT_AUTHOR_NAME",
                 "GIT_AUTHOR_EMAIL",
                 "changed 'a.b.c' to 'foo' in test/file.yml",
+                {"test/file.yml": "a: b\na.b.c: foo\n"},
             ),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
-            call.GitRepo.commit(
+            call.GitRepo.commit_files(
                 "GIT_USER",
                 "GIT_EMAIL",
                 "GIT_AUTHOR_NAME",
                 "GIT_AUTHOR_EMAIL",
                 "changed 'a.b.d' to 'bar' in test/file.yml",
+                {"test/file.yml": "a: b\na.b.c: foo\na.b.d: bar\n"},
             ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
@@ -137,13 +146,20 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo.clone(sparse_paths=[]),
             call.uuid.uuid4(),
             call.GitRepo.new_branch("gitopscli-deploy-b973b5bb"),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo"}, on_update=mock.ANY),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
-            call.GitRepo.commit("GIT_USER", "GIT_EMAIL", None, None, "changed 'a.b.c' to 'foo' in test/file.yml"),
+            call.GitRepo.commit_files(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "changed 'a.b.c' to 'foo' in test/file.yml",
+                {"test/file.yml": "a: b\na.b.c: foo\n"},
+            ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
             call.GitRepoApi.create_pull_request_to_default_branch(
@@ -159,7 +175,9 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
                     {{
                         "hash": "{self.example_commit_hash}"
                     }}
-                ]
+                ],
+                "rate_limits": {{}},
+                "phases": {{}}
             }}
             """
         self.assertMultiLineEqual(mock_print.getvalue(), dedent(expected_output))
@@ -192,16 +210,29 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo.clone(sparse_paths=[]),
             call.uuid.uuid4(),
             call.GitRepo.new_branch("gitopscli-deploy-b973b5bb"),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo", "a.b.d": "bar"}, on_update=mock.ANY),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
-            call.GitRepo.commit("GIT_USER", "GIT_EMAIL", None, None, "changed 'a.b.c' to 'foo' in test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
+            call.GitRepo.commit_files(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "changed 'a.b.c' to 'foo' in test/file.yml",
+                {"test/file.yml": "a: b\na.b.c: foo\n"},
+            ),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
-            call.GitRepo.commit("GIT_USER", "GIT_EMAIL", None, None, "changed 'a.b.d' to 'bar' in test/file.yml"),
+            call.GitRepo.commit_files(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "changed 'a.b.d' to 'bar' in test/file.yml",
+                {"test/file.yml": "a: b\na.b.c: foo\na.b.d: bar\n"},
+            ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
             call.GitRepoApi.create_pull_request_to_default_branch(
@@ -220,7 +251,9 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
                     {{
                         "hash": "{self.example_commit_hash}"
                     }}
-                ]
+                ],
+                "rate_limits": {{}},
+                "phases": {{}}
             }}
             """
         self.assertMultiLineEqual(mock_print.getvalue(), dedent(expected_output))
@@ -253,16 +286,29 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo.clone(sparse_paths=[]),
             call.uuid.uuid4(),
             call.GitRepo.new_branch("gitopscli-deploy-b973b5bb"),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo", "a.b.d": "bar"}, on_update=mock.ANY),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
-            call.GitRepo.commit("GIT_USER", "GIT_EMAIL", None, None, "changed 'a.b.c' to 'foo' in test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
+            call.GitRepo.commit_files(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "changed 'a.b.c' to 'foo' in test/file.yml",
+                {"test/file.yml": "a: b\na.b.c: foo\n"},
+            ),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
-            call.GitRepo.commit("GIT_USER", "GIT_EMAIL", None, None, "changed 'a.b.d' to 'bar' in test/file.yml"),
+            call.GitRepo.commit_files(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "changed 'a.b.d' to 'bar' in test/file.yml",
+                {"test/file.yml": "a: b\na.b.c: foo\na.b.d: bar\n"},
+            ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
             call.GitRepoApi.create_pull_request_to_default_branch(
@@ -270,6 +316,7 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
                 "Updated values in test/file.yml",
                 "Updated 2 values in `test/file.yml`:\n```yaml\na.b.c: foo\na.b.d: bar\n```\n",
             ),
+            call.GitRepoApi.get_pull_request_merge_status(42),
             call.GitRepoApi.merge_pull_request(42, "merge"),
             call.GitRepoApi.delete_branch("gitopscli-deploy-b973b5bb"),
         ]
@@ -277,6 +324,90 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         no_output = ""
         self.assertMultiLineEqual(mock_print.getvalue(), no_output)
 
+    def test_create_pr_and_merge_blocked(self):
+        self.git_repo_api_mock.get_pull_request_merge_status.return_value = GitRepoApi.MergeStatus.BLOCKED
+        args = DeployCommand.Args(
+            file="test/file.yml",
+            values={"a.b.c": "foo"},
+            username="USERNAME",
+            password="PASSWORD",
+            git_user="GIT_USER",
+            git_email="GIT_EMAIL",
+            git_author_name=None,
+            git_author_email=None,
+            create_pr=True,
+            auto_merge=True,
+            single_commit=False,
+            organisation="ORGA",
+            repository_name="REPO",
+            git_provider=GitProvider.GITHUB,
+            git_provider_url=None,
+            commit_message=None,
+            json=False,
+            pr_labels=None,
+            merge_parameters=None,
+        )
+        with pytest.raises(GitOpsException) as ex:
+            DeployCommand(args).execute()
+        self.assertEqual("Pull request 42 can't be merged (e.g. conflicts or failed checks)", str(ex.value))
+
+        self.assertEqual(
+            [
+                call.GitRepoApi.create_pull_request_to_default_branch(
+                    "gitopscli-deploy-b973b5bb",
+                    "Updated value in test/file.yml",
+                    "Updated 1 value in `test/file.yml`:\n```yaml\na.b.c: foo\n```\n",
+                ),
+                call.GitRepoApi.get_pull_request_merge_status(42),
+            ],
+            [c for c in self.mock_manager.method_calls if c[0].startswith("GitRepoApi.")],
+        )
+
+    def test_create_pr_and_merge_by_provider_does_not_wait_for_merge_status(self):
+        self.git_repo_api_mock.get_pull_request_merge_status.return_value = GitRepoApi.MergeStatus.BLOCKED
+        for merge_method, merge_parameters, expected_merge_call in [
+            ("merge", {"merge_when_pipeline_succeeds": True}, ("merge", {"merge_when_pipeline_succeeds": True})),
+            ("rebase", None, ("rebase",)),
+        ]:
+            with self.subTest(merge_method=merge_method, merge_parameters=merge_parameters):
+                self.mock_manager.reset_mock()
+                args = DeployCommand.Args(
+                    file="test/file.yml",
+                    values={"a.b.c": "foo"},
+                    username="USERNAME",
+                    password="PASSWORD",
+                    git_user="GIT_USER",
+                    git_email="GIT_EMAIL",
+                    git_author_name=None,
+                    git_author_email=None,
+                    create_pr=True,
+                    auto_merge=True,
+                    single_commit=False,
+                    organisation="ORGA",
+                    repository_name="REPO",
+                    git_provider=GitProvider.GITLAB,
+                    git_provider_url=None,
+                    commit_message=None,
+                    json=False,
+                    pr_labels=None,
+                    merge_method=merge_method,
+                    merge_parameters=merge_parameters,
+                )
+                DeployCommand(args).execute()
+
+                self.assertEqual(
+                    [
+                        call.GitRepoApi.create_pull_request_to_default_branch(
+                            "gitopscli-deploy-b973b5bb",
+                            "Updated value in test/file.yml",
+                            "Updated 1 value in `test/file.yml`:\n```yaml\na.b.c: foo\n```\n",
+                        ),
+                        call.GitRepoApi.merge_pull_request(42, *expected_merge_call),
+                        call.GitRepoApi.delete_branch("gitopscli-deploy-b973b5bb"),
+                    ],
+                    [c for c in self.mock_manager.method_calls if c[0].startswith("GitRepoApi.")],
+                )
+
     @mock.patch("sys.stdout", new_callable=StringIO)
     def test_single_commit_happy_flow(self, mock_print):
         args = DeployCommand.Args(
@@ -305,18 +436,18 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.clone(sparse_paths=[]),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo", "a.b.d": "bar"}, on_update=None),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
-            call.GitRepo.commit(
+            call.GitRepo.commit_files(
                 "GIT_USER",
                 "GIT_EMAIL",
                 None,
                 None,
                 "updated 2 values in test/file.yml\n\na.b.c: foo\na.b.d: bar",
+                {"test/file.yml": "a: b\na.b.c: foo\na.b.d: bar\n"},
             ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
@@ -353,11 +484,18 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.clone(sparse_paths=[]),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo"}, on_update=None),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
-            call.GitRepo.commit("GIT_USER", "GIT_EMAIL", None, None, "changed 'a.b.c' to 'foo' in test/file.yml"),
+            call.GitRepo.commit_files(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "changed 'a.b.c' to 'foo' in test/file.yml",
+                {"test/file.yml": "a: b\na.b.c: foo\n"},
+            ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
         ]
@@ -393,13 +531,14 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.clone(sparse_paths=[]),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo", "a.b.d": "bar"}, on_update=None),
             call.logging.info("Updated yaml property %s to %s", "a.b.c", "foo"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Updated yaml property %s to %s", "a.b.d", "bar"),
-            call.GitRepo.commit("GIT_USER", "GIT_EMAIL", None, None, "testcommit"),
+            call.GitRepo.commit_files(
+                "GIT_USER", "GIT_EMAIL", None, None, "testcommit", {"test/file.yml": "a: b\na.b.c: foo\na.b.d: bar\n"}
+            ),
             call.GitRepo.pull_rebase(),
             call.GitRepo.push(),
         ]
@@ -439,11 +578,11 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
+            call.GitRepo.clone(sparse_paths=[]),
         ]
 
     def test_file_not_found(self):
-        self.update_yaml_file_mock.side_effect = FileNotFoundError
+        self.git_repo_mock.read_file.return_value = None
 
         args = DeployCommand.Args(
             file="test/file.yml",
@@ -473,13 +612,12 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.clone(sparse_paths=[]),
+            call.GitRepo.read_file("test/file.yml"),
         ]
 
     def test_file_parse_error(self):
-        self.update_yaml_file_mock.side_effect = YAMLException
+        self.update_yaml_values_mock.side_effect = YAMLException
 
         args = DeployCommand.Args(
             file="test/file.yml",
@@ -509,13 +647,13 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.clone(sparse_paths=[]),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo", "a.b.d": "bar"}, on_update=mock.ANY),
         ]
 
     def test_key_not_found(self):
-        self.update_yaml_file_mock.side_effect = KeyError("dummy key error")
+        self.update_yaml_values_mock.side_effect = KeyError("dummy key error")
 
         args = DeployCommand.Args(
             file="test/file.yml",
@@ -545,13 +683,13 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.clone(sparse_paths=[]),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo", "a.b.d": "bar"}, on_update=mock.ANY),
         ]
 
     def test_nothing_to_update(self):
-        self.update_yaml_file_mock.return_value = False
+        self.update_yaml_values_mock.side_effect = lambda source, *_, **__: (source, {})
 
         args = DeployCommand.Args(
             file="test/file.yml",
@@ -579,11 +717,10 @@ class DeployCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.method_calls == [
             call.GitRepoApiFactory.create(args, "ORGA", "REPO"),
             call.GitRepo(self.git_repo_api_mock),
-            call.GitRepo.clone(),
-            call.GitRepo.get_full_file_path("test/file.yml"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.c", "foo"),
+            call.GitRepo.clone(sparse_paths=[]),
+            call.GitRepo.read_file("test/file.yml"),
+            call.update_yaml_values("a: b\n", {"a.b.c": "foo", "a.b.d": "bar"}, on_update=mock.ANY),
             call.logging.info("Yaml property %s already up-to-date", "a.b.c"),
-            call.update_yaml_file("/tmp/created-tmp-dir/test/file.yml", "a.b.d", "bar"),
             call.logging.info("Yaml property %s already up-to-date", "a.b.d"),
             call.logging.info("All values already up-to-date. I'm done here."),
         ]
@@ -0,0 +1,287 @@
+import json
+import logging
+import unittest
+from io import StringIO
+from unittest import mock
+from unittest.mock import call
+
+import pytest
+
+from gitopscli.commands.deploy_batch import DeployBatchCommand
+from gitopscli.git_api import GitProvider, GitRepo, GitRepoApi, GitRepoApiFactory
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.io_api.yaml_util import update_yaml_file_values, yaml_file_load, yaml_load
+
+from .mock_mixin import MockMixin
+
+MANIFEST = {
+    "repositories": [
+        {
+            "organisation": "ORGA",
+            "repository_name": "REPO_A",
+            "files": {
+                "app1/values.yaml": {"image.tag": "1.0.0"},
+                "app2/values.yaml": {"image.tag": "1.0.0", "replicas": 2},
+            },
+        },
+        {
+            "organisation": "ORGA",
+            "repository_name": "REPO_B",
+            "files": {"app3/values.yaml": {"image.tag": "1.0.0"}},
+        },
+    ]
+}
+
+
+def create_args(*, single_commit=False, json=False):
+    return DeployBatchCommand.Args(
+        username="USERNAME",
+        password="PASSWORD",
+        git_provider=GitProvider.GITHUB,
+        git_provider_url=None,
+        git_user="GIT_USER",
+        git_email="GIT_EMAIL",
+        git_author_name=None,
+        git_author_email=None,
+        manifest="/tmp/manifest.yaml",
+        single_commit=single_commit,
+        max_workers=1,  # deterministic order of mock calls
+        json=json,
+    )
+
+
+class DeployBatchCommandTest(MockMixin, unittest.TestCase):
+    def setUp(self):
+        self.init_mock_manager(DeployBatchCommand)
+
+        self.yaml_file_load_mock = self.monkey_patch(yaml_file_load)
+        self.yaml_file_load_mock.return_value = MANIFEST
+
+        self.update_yaml_file_values_mock = self.monkey_patch(update_yaml_file_values)
+        self.update_yaml_file_values_mock.side_effect = lambda _, values: dict(values)
+
+        self.logging_mock = self.monkey_patch(logging)
+        self.logging_mock.info.return_value = None
+        self.logging_mock.error.return_value = None
+
+        self.git_repo_api_mock = self.create_mock(GitRepoApi)
+
+        self.git_repo_api_factory_mock = self.monkey_patch(GitRepoApiFactory)
+        self.git_repo_api_factory_mock.create.return_value = self.git_repo_api_mock
+
+        self.git_repo_mock = self.monkey_patch(GitRepo)
+        self.git_repo_mock.return_value = self.git_repo_mock
+        self.git_repo_mock.__enter__.return_value = self.git_repo_mock
+        self.git_repo_mock.__exit__.return_value = False
+        self.git_repo_mock.clone.return_value = None
+        changed_paths = set()
+        commit_hashes = iter(["hash1", "hash2", "hash3"])
+
+        def commit(*_, paths):
+            changed_paths.difference_update(paths)
+            return next(commit_hashes)
+
+        self.git_repo_mock.commit.side_effect = commit
+        self.git_repo_mock.mark_changed.side_effect = changed_paths.add
+        self.git_repo_mock.get_changed_paths.side_effect = lambda: sorted(changed_paths)
+        self.git_repo_mock.pull_rebase.return_value = None
+        self.git_repo_mock.push.return_value = None
+        self.git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/created-tmp-dir/{x}"
+
+        self.seal_mocks()
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_commit_per_file_happy_flow_with_report(self, mock_print):
+        args = create_args(json=True)
+        DeployBatchCommand(args).execute()
+
+        assert self.mock_manager.method_calls == [
+            call.yaml_file_load("/tmp/manifest.yaml"),
+            call.GitRepoApiFactory.create(args, "ORGA", "REPO_A"),
+            call.GitRepo(self.git_repo_api_mock),
+            call.GitRepo.clone(sparse_paths=["app1/values.yaml", "app2/values.yaml"]),
+            call.GitRepo.get_full_file_path("app1/values.yaml"),
+            call.update_yaml_file_values("/tmp/created-tmp-dir/app1/values.yaml", {"image.tag": "1.0.0"}),
+            call.logging.info("Updated yaml property %s to %s in %s", "image.tag", "1.0.0", "app1/values.yaml"),
+            call.GitRepo.mark_changed("app1/values.yaml"),
+            call.GitRepo.get_changed_paths(),
+            call.GitRepo.commit(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "changed 'image.tag' to '1.0.0' in app1/values.yaml",
+                paths=["app1/values.yaml"],
+            ),
+            call.GitRepo.get_full_file_path("app2/values.yaml"),
+            call.update_yaml_file_values(
+                "/tmp/created-tmp-dir/app2/values.yaml", {"image.tag": "1.0.0", "replicas": 2}
+            ),
+            call.logging.info("Updated yaml property %s to %s in %s", "image.tag", "1.0.0", "app2/values.yaml"),
+            call.logging.info("Updated yaml property %s to %s in %s", "replicas", 2, "app2/values.yaml"),
+            call.GitRepo.mark_changed("app2/values.yaml"),
+            call.GitRepo.get_changed_paths(),
+            call.GitRepo.commit(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "updated 2 values in app2/values.yaml\n\nimage.tag: 1.0.0\nreplicas: 2",
+                paths=["app2/values.yaml"],
+            ),
+            call.GitRepo.pull_rebase(),
+            call.GitRepo.push(),
+            call.GitRepoApiFactory.create(args, "ORGA", "REPO_B"),
+            call.GitRepo(self.git_repo_api_mock),
+            call.GitRepo.clone(sparse_paths=["app3/values.yaml"]),
+            call.GitRepo.get_full_file_path("app3/values.yaml"),
+            call.update_yaml_file_values("/tmp/created-tmp-dir/app3/values.yaml", {"image.tag": "1.0.0"}),
+            call.logging.info("Updated yaml property %s to %s in %s", "image.tag", "1.0.0", "app3/values.yaml"),
+            call.GitRepo.mark_changed("app3/values.yaml"),
+            call.GitRepo.get_changed_paths(),
+            call.GitRepo.commit(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "changed 'image.tag' to '1.0.0' in app3/values.yaml",
+                paths=["app3/values.yaml"],
+            ),
+            call.GitRepo.pull_rebase(),
+            call.GitRepo.push(),
+        ]
+
+        report = json.loads(mock_print.getvalue())
+        self.assertIsInstance(report.pop("duration_seconds"), float)
+        for repository_report in report["repositories"]:
+            self.assertIsInstance(repository_report.pop("duration_seconds"), float)
+        self.assertEqual(
+            {
+                "repositories": [
+                    {
+                        "organisation": "ORGA",
+                        "repository_name": "REPO_A",
+                        "commits": [{"hash": "hash1"}, {"hash": "hash2"}],
+                        "updated_values": {
+                            "app1/values.yaml": {"image.tag": "1.0.0"},
+                            "app2/values.yaml": {"image.tag": "1.0.0", "replicas": 2},
+                        },
+                    },
+                    {
+                        "organisation": "ORGA",
+                        "repository_name": "REPO_B",
+                        "commits": [{"hash": "hash3"}],
+                        "updated_values": {"app3/values.yaml": {"image.tag": "1.0.0"}},
+                    },
+                ],
+                "push_retries": 0,
+                "rate_limits": {},
+                "phases": {},
+            },
+            report,
+        )
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_single_commit_per_repository(self, mock_print):
+        args = create_args(single_commit=True)
+        DeployBatchCommand(args).execute()
+
+        commit_calls = [c for c in self.mock_manager.method_calls if c[0] == "GitRepo.commit"]
+        assert commit_calls == [
+            call.GitRepo.commit(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "updated 3 values in 2 files\n\n"
+                "app1/values.yaml:\n  image.tag: 1.0.0\napp2/values.yaml:\n  image.tag: 1.0.0\n  replicas: 2",
+                paths=["app1/values.yaml", "app2/values.yaml"],
+            ),
+            call.GitRepo.commit(
+                "GIT_USER",
+                "GIT_EMAIL",
+                None,
+                None,
+                "changed 'image.tag' to '1.0.0' in app3/values.yaml",
+                paths=["app3/values.yaml"],
+            ),
+        ]
+        self.assertEqual("", mock_print.getvalue())
+
+    def test_nothing_to_update(self):
+        self.update_yaml_file_values_mock.side_effect = lambda _, __: {}
+
+        DeployBatchCommand(create_args()).execute()
+
+        self.assertNotIn(call.GitRepo.push(), self.mock_manager.method_calls)
+        self.assertIn(call.logging.info("All values already up-to-date: %s", "REPO_A"), self.mock_manager.method_calls)
+        self.assertIn(call.logging.info("All values already up-to-date: %s", "REPO_B"), self.mock_manager.method_calls)
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_failed_repository_does_not_stop_others(self, mock_print):
+        def update_yaml_file_values(file_path, values):
+            if "app1" in file_path:
+                raise KeyError("Key 'image.tag' not found in YAML!")
+            return dict(values)
+
+        self.update_yaml_file_values_mock.side_effect = update_yaml_file_values
+
+        with pytest.raises(GitOpsException) as ex:
+            DeployBatchCommand(create_args(json=True)).execute()
+        self.assertEqual("Deployment failed for repositories: ORGA/REPO_A", str(ex.value))
+
+        self.assertIn(
+            call.logging.error("Deployment failed for %s: %s", "REPO_A", mock.ANY), self.mock_manager.method_calls
+        )
+        self.assertEqual(1, self.mock_manager.method_calls.count(call.GitRepo.push()))  # only REPO_B
+
+        report = json.loads(mock_print.getvalue())
+        self.assertEqual("\"Key 'image.tag' not found in YAML!\"", report["repositories"][0]["error"])
+        self.assertNotIn("error", report["repositories"][1])
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_report_of_values_without_json_type(self, mock_print):
+        self.yaml_file_load_mock.return_value = yaml_load(
+            """\
+repositories:
+  - organisation: ORGA
+    repository_name: REPO_A
+    files:
+      app1/values.yaml:
+        releaseDate: 2024-01-15
+        deployedAt: 2024-01-15T10:00:00Z
+"""
+        )
+
+        DeployBatchCommand(create_args(json=True)).execute()
+
+        report = json.loads(mock_print.getvalue())
+        self.assertEqual(
+            {"app1/values.yaml": {"releaseDate": "2024-01-15", "deployedAt": "2024-01-15T10:00:00+00:00"}},
+            report["repositories"][0]["updated_values"],
+        )
+
+    def test_get_written_repositories(self):
+        self.assertEqual(
+            [("ORGA", "REPO_A"), ("ORGA", "REPO_B")], DeployBatchCommand(create_args()).get_written_repositories()
+        )
+
+    def test_invalid_manifest(self):
+        for manifest in [
+            None,
+            [],
+            {"repositories": {}},
+            {"repositories": [{"organisation": "ORGA"}]},
+            {"repositories": ["ORGA/REPO"]},
+            {"repositories": [{"organisation": "ORGA", "repository_name": "REPO", "files": {"values.yaml": "1.0"}}]},
+        ]:
+            with self.subTest(manifest=manifest):
+                self.yaml_file_load_mock.return_value = manifest
+                with pytest.raises(GitOpsException):
+                    DeployBatchCommand(create_args()).execute()
+
+    def test_manifest_not_found(self):
+        self.yaml_file_load_mock.side_effect = FileNotFoundError()
+        with pytest.raises(GitOpsException) as ex:
+            DeployBatchCommand(create_args()).execute()
+        self.assertEqual("No such file: /tmp/manifest.yaml", str(ex.value))
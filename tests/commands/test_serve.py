@@ -0,0 +1,357 @@
+import json
+import logging
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from http import HTTPStatus
+from http.client import HTTPConnection
+from types import SimpleNamespace
+from unittest.mock import Mock, call, patch
+
+import pytest
+
+from gitopscli.commands.command import Command
+from gitopscli.commands.create_preview import get_preview_info_file
+from gitopscli.commands.serve import ServeCommand
+from gitopscli.gitops_exception import GitOpsException
+from gitopscli.io_api.yaml_util import yaml_file_dump
+from gitopscli.tracing import get_current_trace, span
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class UnixSocketHTTPConnection(HTTPConnection):
+    def __init__(self, socket_path):
+        super().__init__("localhost")
+        self.__socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.__socket_path)
+
+
+class PrintingCommand(Command):
+    def __init__(self, output):
+        self.__output = output
+
+    def execute(self):
+        print(self.__output)  # noqa: T201
+
+
+class TracedCommand(Command):
+    def __init__(self):
+        self.phases = None
+
+    def execute(self):
+        with span("work"):
+            pass
+        self.phases = get_current_trace().get_phases()
+
+
+class PreviewInfoWritingCommand(Command):
+    def __init__(self, preview_id, barrier):
+        self.__preview_id = preview_id
+        self.__barrier = barrier
+
+    def execute(self):
+        yaml_file_dump({"previewId": self.__preview_id}, get_preview_info_file())
+        self.__barrier.wait(timeout=5)  # both requests wrote their file before either is read
+
+
+class ServeCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.parse_args_mock = Mock()
+        self.create_command_mock = Mock()
+        self.create_command_mock.return_value.get_written_repositories.return_value = [("ORGA", "REPO")]
+        self.command = ServeCommand(
+            ServeCommand.Args(host="127.0.0.1", port=0, socket=None), self.parse_args_mock, self.create_command_mock
+        )
+
+    def test_handle_request(self):
+        command_args = self.__command_args("ORGA", "REPO")
+        self.parse_args_mock.return_value = (False, command_args)
+        self.create_command_mock.return_value = PrintingCommand("done")
+
+        status, response = self.command.handle_request(
+            {
+                "command": "deploy",
+                "args": {
+                    "file": "values.yaml",
+                    "values": {"a.b": 1},
+                    "single_commit": True,
+                    "pr_labels": ["foo"],
+                    "commit_message": None,
+                },
+            }
+        )
+
+        self.assertEqual(HTTPStatus.OK, status)
+        self.assertTrue(response["success"])
+        self.assertEqual(
+            [
+                call(
+                    [
+                        "deploy",
+                        "--file",
+                        "values.yaml",
+                        "--values",
+                        '{"a.b": 1}',
+                        "--single-commit",
+                        "true",
+                        "--pr-labels",
+                        '["foo"]',
+                    ]
+                )
+            ],
+            self.parse_args_mock.call_args_list,
+        )
+        self.create_command_mock.assert_called_once_with(command_args)
+
+    def test_each_request_is_traced(self):
+        self.parse_args_mock.return_value = (False, self.__command_args("ORGA", "REPO"))
+        traced_commands = [TracedCommand(), TracedCommand()]
+        self.create_command_mock.side_effect = traced_commands
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_file = f"{tmp_dir}/traces.jsonl"
+            with patch.dict("os.environ", {"GITOPSCLI_TRACE_FILE": trace_file}):
+                command = ServeCommand(
+                    ServeCommand.Args(host="127.0.0.1", port=0, socket=None),
+                    self.parse_args_mock,
+                    self.create_command_mock,
+                )
+            for _ in range(2):
+                status, _ = command.handle_request({"command": "deploy"})
+                self.assertEqual(HTTPStatus.OK, status)
+
+            with open(trace_file) as traces:  # noqa: PTH123
+                trace_ids = [
+                    json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["traceId"] for line in traces
+                ]
+        self.assertEqual(2, len(set(trace_ids)))
+        self.assertEqual([{"work": 1}] * 2, [{k: v["count"] for k, v in c.phases.items()} for c in traced_commands])
+        self.assertIsNone(get_current_trace())
+
+    def test_concurrent_requests_have_separate_preview_info_files(self):
+        self.parse_args_mock.side_effect = lambda raw_args: (False, self.__command_args("ORGA", raw_args[2]))
+        barrier = threading.Barrier(2)
+        self.create_command_mock.side_effect = lambda command_args: PreviewInfoWritingCommand(
+            command_args.repository_name, barrier
+        )
+        responses = {}
+
+        def handle_request(repository_name):
+            responses[repository_name] = self.command.handle_request(
+                {"command": "create-preview", "args": {"repository_name": repository_name}}
+            )
+
+        threads = [threading.Thread(target=handle_request, args=(name,)) for name in ["REPO_A", "REPO_B"]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for repository_name, (status, response) in responses.items():
+            self.assertEqual(HTTPStatus.OK, status)
+            self.assertEqual({"previewId": repository_name}, response["preview_info"])
+        self.assertEqual("/tmp/gitopscli-preview-info.yaml", get_preview_info_file())
+
+    def test_handle_invalid_request(self):
+        for request in [[], {}, {"command": 42}, {"command": "deploy", "args": []}, {"command": "serve"}]:
+            with self.subTest(request=request):
+                status, response = self.command.handle_request(request)
+                self.assertEqual(HTTPStatus.BAD_REQUEST, status)
+                self.assertFalse(response["success"])
+        self.parse_args_mock.assert_not_called()
+
+    def test_handle_request_with_invalid_args(self):
+        self.parse_args_mock.side_effect = SystemExit(2)
+
+        status, response = self.command.handle_request({"command": "deploy", "args": {}})
+
+        self.assertEqual(HTTPStatus.BAD_REQUEST, status)
+        self.assertEqual("Invalid arguments for command: deploy", response["error"])
+        self.create_command_mock.assert_not_called()
+
+    def test_handle_request_with_gitops_exception(self):
+        self.parse_args_mock.return_value = (False, self.__command_args("ORGA", "REPO"))
+        self.create_command_mock.return_value.execute.side_effect = GitOpsException("Something went wrong")
+
+        status, response = self.command.handle_request({"command": "deploy", "args": {}})
+
+        self.assertEqual(HTTPStatus.UNPROCESSABLE_ENTITY, status)
+        self.assertEqual("Something went wrong", response["error"])
+        self.assertIn("ERROR handle_request: Something went wrong\n", response["output"])
+
+    def test_handle_request_with_unexpected_exception(self):
+        self.parse_args_mock.return_value = (False, self.__command_args("ORGA", "REPO"))
+        self.create_command_mock.return_value.execute.side_effect = ValueError("Boom")
+
+        with self.assertLogs(level=logging.ERROR):
+            status, response = self.command.handle_request({"command": "deploy", "args": {}})
+
+        self.assertEqual(HTTPStatus.INTERNAL_SERVER_ERROR, status)
+        self.assertEqual("Unexpected error: Boom", response["error"])
+
+    def test_requests_for_same_repository_are_serialized(self):
+        running = {"REPO": 0, "OTHER": 0}
+        max_running = dict(running)
+        lock = threading.Lock()
+        repo_running = threading.Event()
+        other_ran_concurrently = threading.Event()
+
+        def create_command(command_args):
+            repository_name = command_args.repository_name
+
+            def execute():
+                with lock:
+                    running[repository_name] += 1
+                    max_running[repository_name] = max(max_running[repository_name], running[repository_name])
+                if repository_name == "REPO":
+                    repo_running.set()
+                    time.sleep(0.05)
+                elif repo_running.wait(timeout=5):
+                    other_ran_concurrently.set()
+                with lock:
+                    running[repository_name] -= 1
+
+            return Mock(execute=execute, get_written_repositories=lambda: [("ORGA", repository_name)])
+
+        self.parse_args_mock.side_effect = lambda raw_args: (False, self.__command_args("ORGA", raw_args[2]))
+        self.create_command_mock.side_effect = create_command
+
+        threads = [
+            threading.Thread(
+                target=self.command.handle_request,
+                args=({"command": "deploy", "args": {"repository_name": repository_name}},),
+            )
+            for repository_name in ["REPO", "REPO", "OTHER", "REPO"]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({"REPO": 1, "OTHER": 1}, max_running)
+        self.assertTrue(other_ran_concurrently.is_set())
+
+    def test_serve_on_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            socket_path = f"{tmp_dir}/gitopscli.sock"
+            command = ServeCommand(
+                ServeCommand.Args(host="127.0.0.1", port=0, socket=socket_path),
+                self.parse_args_mock,
+                self.create_command_mock,
+            )
+            self.parse_args_mock.return_value = (False, self.__command_args("ORGA", "REPO"))
+            self.create_command_mock.return_value = PrintingCommand("GitOps CLI version 1.2.3")
+
+            server_thread = threading.Thread(target=command.execute)
+            server_thread.start()
+            try:
+                self.__wait_for_socket(socket_path)
+
+                connection = UnixSocketHTTPConnection(socket_path)
+                connection.request("POST", "/", body=json.dumps({"command": "version"}), headers=JSON_HEADERS)
+                response = connection.getresponse()
+                self.assertEqual(HTTPStatus.OK, response.status)
+                self.assertEqual("application/json", response.getheader("Content-Type"))
+                body = json.loads(response.read())
+                self.assertTrue(body["success"])
+                self.assertTrue(body["output"].endswith("GitOps CLI version 1.2.3\n"))
+
+                connection = UnixSocketHTTPConnection(socket_path)
+                connection.request("POST", "/", body="no json", headers=JSON_HEADERS)
+                self.assertEqual(HTTPStatus.BAD_REQUEST, connection.getresponse().status)
+
+                connection = UnixSocketHTTPConnection(socket_path)
+                connection.request("POST", "/", body=json.dumps({"command": "version"}))  # e.g. a cross-site form
+                self.assertEqual(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, connection.getresponse().status)
+
+                large_body = json.dumps({"command": "version", "padding": "x" * 512 * 1024})  # > socket buffer
+                for _ in range(5):
+                    connection = UnixSocketHTTPConnection(socket_path)
+                    connection.request("POST", "/", body=large_body, headers={"Content-Type": "text/plain"})
+                    response = connection.getresponse()
+                    self.assertEqual(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, response.status)
+                    self.assertEqual("close", response.getheader("Connection"))
+                    self.assertEqual("Content-Type must be application/json", json.loads(response.read())["error"])
+            finally:
+                command.shutdown()
+                server_thread.join()
+
+    def test_serve_on_port_requires_token(self):
+        with patch.dict("os.environ", {}, clear=True):
+            command = ServeCommand(
+                ServeCommand.Args(host="127.0.0.1", port=0, socket=None), self.parse_args_mock, self.create_command_mock
+            )
+
+        with pytest.raises(GitOpsException) as ex:
+            command.execute()
+        self.assertEqual(
+            "Serving on host and port requires a token in GITOPSCLI_SERVE_TOKEN (or use --socket)", str(ex.value)
+        )
+
+    def test_serve_on_port_with_token(self):
+        port = self.__get_free_port()
+        with patch.dict("os.environ", {"GITOPSCLI_SERVE_TOKEN": "s3cr3t"}):
+            command = ServeCommand(
+                ServeCommand.Args(host="127.0.0.1", port=port, socket=None),
+                self.parse_args_mock,
+                self.create_command_mock,
+            )
+        self.parse_args_mock.return_value = (False, self.__command_args("ORGA", "REPO"))
+        self.create_command_mock.return_value = PrintingCommand("done")
+
+        server_thread = threading.Thread(target=command.execute)
+        server_thread.start()
+        try:
+            for authorization, expected_status in [
+                (None, HTTPStatus.UNAUTHORIZED),
+                ("Bearer wrong", HTTPStatus.UNAUTHORIZED),
+                ("Bearer s3cr3t", HTTPStatus.OK),
+            ]:
+                with self.subTest(authorization=authorization):
+                    headers = {**JSON_HEADERS, "Authorization": authorization} if authorization else JSON_HEADERS
+                    connection = self.__wait_for_connection(port)
+                    connection.request("POST", "/", body=json.dumps({"command": "version"}), headers=headers)
+                    self.assertEqual(expected_status, connection.getresponse().status)
+        finally:
+            command.shutdown()
+            server_thread.join()
+        self.assertEqual(1, self.create_command_mock.call_count)
+
+    @staticmethod
+    def __command_args(organisation, repository_name):
+        return SimpleNamespace(organisation=organisation, repository_name=repository_name, git_provider_url=None)
+
+    @staticmethod
+    def __get_free_port():
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    @staticmethod
+    def __wait_for_connection(port):
+        for _ in range(100):
+            try:
+                with socket.create_connection(("127.0.0.1", port)):
+                    pass
+            except OSError:
+                time.sleep(0.05)
+            else:
+                break
+        return HTTPConnection("127.0.0.1", port)
+
+    @staticmethod
+    def __wait_for_socket(socket_path):
+        for _ in range(100):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(socket_path)
+            except OSError:
+                time.sleep(0.05)
+            else:
+                return
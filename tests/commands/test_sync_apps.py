@@ -1,10 +1,15 @@
+import dataclasses
 import logging
 import os
+import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import call, patch
+from unittest.mock import ANY, call, patch
 
-from gitopscli.commands.sync_apps import SyncAppsCommand
+import pytest
+
+from gitopscli.appconfig_api.sync_state import SyncStateStore, TenantSyncState, get_applications_hash
+from gitopscli.commands.sync_apps import SyncAppsCommand, _get_organisation_and_repository_name
 from gitopscli.git_api import GitProvider, GitRepo, GitRepoApi, GitRepoApiFactory
 from gitopscli.gitops_exception import GitOpsException
 from gitopscli.io_api.yaml_util import yaml_file_dump, yaml_file_load
@@ -26,6 +31,8 @@ ARGS = SyncAppsCommand.Args(
     git_provider_url=None,
 )
 
+ALL_TENANTS_ARGS = dataclasses.replace(ARGS, organisation=None, repository_name=None, all_tenants=True, max_workers=1)
+
 
 class UnreachableError(Exception):
     pass
@@ -54,6 +61,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
 
         self.logging_mock = self.monkey_patch(logging)
         self.logging_mock.info.return_value = None
+        self.logging_mock.error.return_value = None
 
         self.team_config_git_repo_api_mock = self.create_mock(GitRepoApi)
         self.root_config_git_repo_api_mock = self.create_mock(GitRepoApi)
@@ -66,6 +74,8 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         self.team_config_git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/team-config-repo/{x}"
         self.team_config_git_repo_mock.get_author_from_last_commit.return_value = "author"
 
+        self.__create_other_team_config_git_repo_mocks()
+
         self.root_config_git_repo_mock = self.create_mock(GitRepo, "GitRepo_root")
         self.root_config_git_repo_mock.__enter__.return_value = self.root_config_git_repo_mock
         self.root_config_git_repo_mock.__exit__.return_value = False
@@ -80,12 +90,15 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         self.git_repo_api_factory_mock.create.side_effect = lambda _, org, repo: {
             ("TEAM_ORGA", "TEAM_REPO"): self.team_config_git_repo_api_mock,
             ("ROOT_ORGA", "ROOT_REPO"): self.root_config_git_repo_api_mock,
+            ("team", "team-non-prod"): self.team_config_git_repo_api_mock,
+            ("other-team", "other-team-non-prod"): self.other_team_config_git_repo_api_mock,
         }[(org, repo)]
 
         self.git_repo_mock = self.monkey_patch(GitRepo)
         self.git_repo_mock.side_effect = lambda api: {
             id(self.team_config_git_repo_api_mock): self.team_config_git_repo_mock,
             id(self.root_config_git_repo_api_mock): self.root_config_git_repo_mock,
+            id(self.other_team_config_git_repo_api_mock): self.other_team_config_git_repo_mock,
         }[id(api)]
 
         patcher = patch("gitopscli.appconfig_api.root_repo.yaml_file_load", spec_set=yaml_file_load)
@@ -110,16 +123,52 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         }[file_path]
 
         self.yaml_file_dump_mock = self.monkey_patch(yaml_file_dump)
-        self.yaml_file_dump_mock.return_value = None
+        self.yaml_file_dump_mock.return_value = True
+
+        self.__create_sync_state_mocks()
 
         self.seal_mocks()
 
+    def __create_sync_state_mocks(self):
+        # only patch the factory, the class itself is still needed for the type annotations checked by typeguard
+        from_env_patcher = patch.object(SyncStateStore, "from_env", autospec=True)
+        self.addCleanup(from_env_patcher.stop)
+        self.sync_state_store_from_env_mock = from_env_patcher.start()
+        self.sync_state_store_from_env_mock.return_value = None
+        self.mock_manager.attach_mock(self.sync_state_store_from_env_mock, "SyncStateStore.from_env")
+
+        self.team_config_git_repo_mock.get_remote_head_hash.return_value = "team-commit"
+        self.other_team_config_git_repo_mock.get_remote_head_hash.return_value = "other-team-commit"
+        self.root_config_git_repo_api_mock.get_clone_url.return_value = "https://repository.url/root/root-config.git"
+
+        changed_paths = set()
+        self.root_config_git_repo_mock.mark_changed.side_effect = changed_paths.add
+        self.root_config_git_repo_mock.get_changed_paths.side_effect = lambda: sorted(changed_paths)
+        self.root_config_git_repo_api_mock.get_file_content.side_effect = {
+            "apps/team-non-prod.yaml": "repository: https://repository.url/team/team-non-prod.git\n"
+            "applications:\n  my-app: {}\n",
+        }.get
+
+    def __create_other_team_config_git_repo_mocks(self):
+        self.other_team_config_git_repo_api_mock = self.create_mock(GitRepoApi)
+
+        self.other_team_config_git_repo_mock = self.create_mock(GitRepo, "GitRepo_other_team")
+        self.other_team_config_git_repo_mock.__enter__.return_value = self.other_team_config_git_repo_mock
+        self.other_team_config_git_repo_mock.__exit__.return_value = False
+        self.other_team_config_git_repo_mock.get_clone_url.return_value = (
+            "https://repository.url/other-team/other-team-non-prod.git"
+        )
+        self.other_team_config_git_repo_mock.clone.return_value = None
+        self.other_team_config_git_repo_mock.get_full_file_path.side_effect = lambda x: f"/tmp/other-team-repo/{x}"
+        self.other_team_config_git_repo_mock.get_author_from_last_commit.return_value = "other-author"
+
     def test_sync_apps_happy_flow(self):
         SyncAppsCommand(ARGS).execute()
         # assert mock_call to verify path joins through __truediv__
         assert self.mock_manager.mock_calls == [
             call.GitRepoApiFactory.create(ARGS, "TEAM_ORGA", "TEAM_REPO"),
             call.GitRepoApiFactory.create(ARGS, "ROOT_ORGA", "ROOT_REPO"),
+            call.SyncStateStore.from_env(),
             call.GitRepo(self.team_config_git_repo_api_mock),
             call.GitRepo_team.__enter__(),
             call.GitRepo(self.root_config_git_repo_api_mock),
@@ -147,7 +196,6 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             call.Path("/tmp/team-config-repo/my-app/.config.yaml"),
             call.Path.exists(),
             call.logging.info("Found %s app(s) in apps repository: %s", 1, "my-app"),
-            call.logging.info("Appling changes to: %s", "/tmp/root-config-repo/apps/team-non-prod.yaml"),
             call.yaml_file_dump(
                 {
                     "config": {
@@ -157,15 +205,19 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
                 },
                 "/tmp/root-config-repo/apps/team-non-prod.yaml",
             ),
+            call.logging.info("Applied changes to: %s", "/tmp/root-config-repo/apps/team-non-prod.yaml"),
+            call.GitRepo_root.mark_changed("apps/team-non-prod.yaml"),
             call.GitRepo_root.get_clone_url(),
             call.logging.info("Commiting and pushing changes to %s", "https://repository.url/root/root-config.git"),
             call.GitRepo_team.get_author_from_last_commit(),
+            call.GitRepo_root.get_changed_paths(),
             call.GitRepo_root.commit(
                 "GIT_USER",
                 "GIT_EMAIL",
                 "GIT_AUTHOR_NAME",
                 "GIT_AUTHOR_EMAIL",
                 "author updated /tmp/root-config-repo/apps/team-non-prod.yaml",
+                paths=["apps/team-non-prod.yaml"],
             ),
             call.GitRepo_root.pull_rebase(),
             call.GitRepo_root.push(),
@@ -193,6 +245,7 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
         assert self.mock_manager.mock_calls == [
             call.GitRepoApiFactory.create(ARGS, "TEAM_ORGA", "TEAM_REPO"),
             call.GitRepoApiFactory.create(ARGS, "ROOT_ORGA", "ROOT_REPO"),
+            call.SyncStateStore.from_env(),
             call.GitRepo(self.team_config_git_repo_api_mock),
             call.GitRepo_team.__enter__(),
             call.GitRepo(self.root_config_git_repo_api_mock),
@@ -225,6 +278,18 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             call.GitRepo_team.__exit__(None, None, None),
         ]
 
+    def test_sync_apps_unchanged_file_content(self):
+        self.yaml_file_dump_mock.return_value = False  # merged config is identical to the file content
+
+        SyncAppsCommand(ARGS).execute()
+
+        self.yaml_file_dump_mock.assert_called_once()
+        self.logging_mock.info.assert_called_with(
+            "No changes applied to %s", "/tmp/root-config-repo/apps/team-non-prod.yaml"
+        )
+        self.root_config_git_repo_mock.commit.assert_not_called()
+        self.root_config_git_repo_mock.push.assert_not_called()
+
     def test_sync_apps_bootstrap_chart(self):
         self.yaml_file_load_mock.side_effect = lambda file_path: {
             "/tmp/root-config-repo/bootstrap/values.yaml": {
@@ -366,3 +431,257 @@ class SyncAppsCommandTest(MockMixin, unittest.TestCase):
             self.fail()
         except GitOpsException as ex:
             self.assertEqual("Application 'my-app' already exists in a different repository", str(ex))
+
+    def test_sync_apps_without_team_repo(self):
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsCommand(dataclasses.replace(ARGS, organisation=None)).execute()
+        self.assertEqual("Please provide --organisation and --repository-name (or --all-tenants)", str(ex.value))
+
+    def test_sync_all_tenants_with_team_repo(self):
+        for args in [
+            dataclasses.replace(ALL_TENANTS_ARGS, organisation="TEAM_ORGA"),
+            dataclasses.replace(ALL_TENANTS_ARGS, repository_name="TEAM_REPO"),
+        ]:
+            with self.subTest(args=args), pytest.raises(GitOpsException) as ex:
+                SyncAppsCommand(args).execute()
+            self.assertEqual(
+                "Please provide either --all-tenants or --organisation and --repository-name", str(ex.value)
+            )
+        assert self.mock_manager.method_calls == []
+
+    def test_sync_all_tenants(self):
+        self.os_mock.listdir.side_effect = lambda path: {
+            "/tmp/team-config-repo/.": ["my-app"],
+            "/tmp/other-team-repo/.": ["my-other-app"],
+        }[path]
+
+        SyncAppsCommand(ALL_TENANTS_ARGS).execute()
+
+        self.git_repo_api_factory_mock.create.assert_has_calls(
+            [
+                call(ALL_TENANTS_ARGS, "ROOT_ORGA", "ROOT_REPO"),
+                call(ALL_TENANTS_ARGS, "team", "team-non-prod"),
+                call(ALL_TENANTS_ARGS, "other-team", "other-team-non-prod"),
+            ]
+        )
+        self.root_config_git_repo_mock.clone.assert_called_once_with()
+        self.assertEqual(
+            [
+                call(
+                    {
+                        "config": {
+                            "repository": "https://repository.url/team/team-non-prod.git",
+                            "applications": {"my-app": {}},
+                        }
+                    },
+                    "/tmp/root-config-repo/apps/team-non-prod.yaml",
+                ),
+                call(
+                    {
+                        "repository": "https://repository.url/other-team/other-team-non-prod.git",
+                        "applications": {"my-other-app": {}},
+                    },
+                    "/tmp/root-config-repo/apps/other-team-non-prod.yaml",
+                ),
+            ],
+            self.yaml_file_dump_mock.call_args_list,
+        )
+        self.root_config_git_repo_mock.commit.assert_called_once_with(
+            "GIT_USER",
+            "GIT_EMAIL",
+            "GIT_AUTHOR_NAME",
+            "GIT_AUTHOR_EMAIL",
+            "Synchronized applications of 2 tenant(s)\n\n"
+            "author updated apps/team-non-prod.yaml\n"
+            "other-author updated apps/other-team-non-prod.yaml",
+            paths=["apps/other-team-non-prod.yaml", "apps/team-non-prod.yaml"],
+        )
+        self.root_config_git_repo_mock.pull_rebase.assert_called_once_with()
+        self.root_config_git_repo_mock.push.assert_called_once_with()
+
+    def test_sync_all_tenants_already_up_to_date(self):
+        self.os_mock.listdir.side_effect = lambda path: {
+            "/tmp/team-config-repo/.": ["some-other-app-1"],
+            "/tmp/other-team-repo/.": ["some-other-app-2"],
+        }[path]
+
+        SyncAppsCommand(ALL_TENANTS_ARGS).execute()
+
+        self.yaml_file_dump_mock.assert_not_called()
+        self.root_config_git_repo_mock.commit.assert_not_called()
+        self.root_config_git_repo_mock.push.assert_not_called()
+        self.logging_mock.info.assert_any_call("No changes applied to root config repository")
+
+    def test_sync_all_tenants_unchanged_file_content(self):
+        self.os_mock.listdir.side_effect = lambda path: {
+            "/tmp/team-config-repo/.": ["my-app"],
+            "/tmp/other-team-repo/.": ["my-other-app"],
+        }[path]
+        self.yaml_file_dump_mock.side_effect = lambda _, file_path: file_path.endswith("/other-team-non-prod.yaml")
+
+        SyncAppsCommand(ALL_TENANTS_ARGS).execute()
+
+        self.assertEqual(2, self.yaml_file_dump_mock.call_count)
+        self.root_config_git_repo_mock.commit.assert_called_once_with(
+            "GIT_USER",
+            "GIT_EMAIL",
+            "GIT_AUTHOR_NAME",
+            "GIT_AUTHOR_EMAIL",
+            "Synchronized applications of 1 tenant(s)\n\nother-author updated apps/other-team-non-prod.yaml",
+            paths=["apps/other-team-non-prod.yaml"],
+        )
+
+    def test_sync_all_tenants_app_name_collission(self):
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsCommand(ALL_TENANTS_ARGS).execute()  # both tenant repos contain "my-app"
+
+        self.assertEqual(
+            "Application 'my-app' exists in tenants 'team-non-prod' and 'other-team-non-prod'", str(ex.value)
+        )
+        self.yaml_file_dump_mock.assert_not_called()
+        self.root_config_git_repo_mock.commit.assert_not_called()
+
+    def test_sync_all_tenants_with_failing_tenant_repo(self):
+        self.other_team_config_git_repo_mock.clone.side_effect = GitOpsException("Error cloning")
+
+        with pytest.raises(GitOpsException) as ex:
+            SyncAppsCommand(ALL_TENANTS_ARGS).execute()
+
+        self.assertEqual("Synchronization failed for tenants: other-team-non-prod", str(ex.value))
+        self.logging_mock.error.assert_called_once_with(
+            "Loading apps config repository of tenant %s failed: %s", "other-team-non-prod", ANY
+        )
+        self.root_config_git_repo_mock.commit.assert_called_once_with(
+            "GIT_USER",
+            "GIT_EMAIL",
+            "GIT_AUTHOR_NAME",
+            "GIT_AUTHOR_EMAIL",
+            "Synchronized applications of 1 tenant(s)\n\nauthor updated apps/team-non-prod.yaml",
+            paths=["apps/team-non-prod.yaml"],
+        )
+        self.root_config_git_repo_mock.push.assert_called_once_with()
+
+    def test_get_organisation_and_repository_name(self):
+        for repo_url, expected in [
+            ("https://github.com/org/repo.git", ("org", "repo")),
+            ("https://github.com/org/repo", ("org", "repo")),
+            ("git@github.com:org/repo.git", ("org", "repo")),
+            ("https://gitlab.example.tld/group/subgroup/repo.git", ("group/subgroup", "repo")),
+            ("https://bitbucket.example.tld/scm/project/repo.git", ("project", "repo")),
+            ("https://dev.azure.com/org/project/_git/repo", ("project", "repo")),
+        ]:
+            with self.subTest(repo_url=repo_url):
+                self.assertEqual(expected, _get_organisation_and_repository_name(repo_url))
+        with pytest.raises(GitOpsException) as ex:
+            _get_organisation_and_repository_name("https://github.com/repo")
+        self.assertEqual(
+            "Cannot determine organisation and repository name of 'https://github.com/repo'", str(ex.value)
+        )
+
+    def __use_sync_state_store(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        sync_state_store = SyncStateStore(tmp_dir.name)
+        self.sync_state_store_from_env_mock.return_value = sync_state_store
+        return sync_state_store
+
+    def test_sync_apps_with_sync_state_skips_unchanged_apps_repository(self):
+        sync_state_store = self.__use_sync_state_store()
+
+        SyncAppsCommand(ARGS).execute()
+
+        self.assertEqual(
+            TenantSyncState("team-non-prod", "team-commit", get_applications_hash({"my-app": {}})),
+            sync_state_store.get("https://repository.url/root/root-config.git", "team/team-non-prod"),
+        )
+        self.root_config_git_repo_mock.push.assert_called_once_with()
+
+        SyncAppsCommand(ARGS).execute()  # nothing changed
+
+        self.team_config_git_repo_mock.clone.assert_called_once_with()
+        self.root_config_git_repo_mock.clone.assert_called_once_with()
+        self.root_config_git_repo_api_mock.get_file_content.assert_called_with("apps/team-non-prod.yaml")
+        self.logging_mock.info.assert_called_with(
+            "Apps repository %s already synchronized at commit %s",
+            "https://repository.url/team/team-non-prod.git",
+            "team-commit",
+        )
+
+    def test_sync_apps_with_sync_state_syncs_changed_repositories(self):
+        self.__use_sync_state_store()
+        SyncAppsCommand(ARGS).execute()
+
+        self.team_config_git_repo_mock.get_remote_head_hash.return_value = "new-team-commit"
+        SyncAppsCommand(ARGS).execute()  # new commit in the apps repository
+        self.assertEqual(2, self.team_config_git_repo_mock.clone.call_count)
+
+        self.root_config_git_repo_api_mock.get_file_content.side_effect = lambda _: (
+            "repository: https://repository.url/team/team-non-prod.git\napplications: {}\n"
+        )
+        SyncAppsCommand(ARGS).execute()  # tenant file in the root repository changed
+        self.assertEqual(3, self.team_config_git_repo_mock.clone.call_count)
+
+    def test_sync_all_tenants_uses_sync_state_of_single_apps_repository(self):
+        self.__use_sync_state_store()
+        SyncAppsCommand(ARGS).execute()
+
+        create_git_repo_api = self.git_repo_api_factory_mock.create.side_effect
+        self.git_repo_api_factory_mock.create.side_effect = lambda args, org, repo: create_git_repo_api(
+            args, "team" if org == "Team" else org, repo
+        )
+        self.os_mock.listdir.side_effect = lambda path: {"/tmp/other-team-repo/.": ["my-other-app"]}[path]
+        self.yaml_file_load_mock.side_effect = lambda file_path: {  # root repository after the first run
+            "/tmp/root-config-repo/bootstrap/values.yaml": {
+                "bootstrap": [{"name": "team-non-prod"}, {"name": "other-team-non-prod"}],
+            },
+            "/tmp/root-config-repo/apps/team-non-prod.yaml": {
+                "repository": "git@repository.url:Team/team-non-prod",  # other form of the team's clone URL
+                "applications": {"my-app": {}},
+            },
+            "/tmp/root-config-repo/apps/other-team-non-prod.yaml": {
+                "repository": "https://repository.url/other-team/other-team-non-prod.git",
+                "applications": {},
+            },
+        }[file_path]
+        SyncAppsCommand(ALL_TENANTS_ARGS).execute()
+
+        self.team_config_git_repo_mock.clone.assert_called_once_with()  # only by the first run
+        self.other_team_config_git_repo_mock.clone.assert_called_once_with()
+
+    def test_sync_all_tenants_with_sync_state_skips_unchanged_apps_repositories(self):
+        sync_state_store = self.__use_sync_state_store()
+        self.os_mock.listdir.side_effect = lambda path: {
+            "/tmp/team-config-repo/.": ["my-app"],
+            "/tmp/other-team-repo/.": ["my-other-app"],
+        }[path]
+        SyncAppsCommand(ALL_TENANTS_ARGS).execute()
+        self.assertEqual(
+            TenantSyncState("other-team-non-prod", "other-team-commit", get_applications_hash({"my-other-app": {}})),
+            sync_state_store.get("https://repository.url/root/root-config.git", "other-team/other-team-non-prod"),
+        )
+
+        self.yaml_file_load_mock.side_effect = lambda file_path: {  # root repository after the first run
+            "/tmp/root-config-repo/bootstrap/values.yaml": {
+                "bootstrap": [{"name": "team-non-prod"}, {"name": "other-team-non-prod"}],
+            },
+            "/tmp/root-config-repo/apps/team-non-prod.yaml": {
+                "repository": "https://repository.url/team/team-non-prod.git",
+                "applications": {"my-app": {}},
+            },
+            "/tmp/root-config-repo/apps/other-team-non-prod.yaml": {
+                "repository": "https://repository.url/other-team/other-team-non-prod.git",
+                "applications": {"my-other-app": {}},
+            },
+        }[file_path]
+        self.other_team_config_git_repo_mock.get_remote_head_hash.return_value = "new-other-team-commit"
+        SyncAppsCommand(ALL_TENANTS_ARGS).execute()
+
+        self.team_config_git_repo_mock.clone.assert_called_once_with()
+        self.assertEqual(2, self.other_team_config_git_repo_mock.clone.call_count)
+        self.root_config_git_repo_mock.commit.assert_called_once()  # the new commit didn't change the apps
+        self.assertEqual(
+            "new-other-team-commit",
+            sync_state_store.get(
+                "https://repository.url/root/root-config.git", "other-team/other-team-non-prod"
+            ).tenant_commit,
+        )
@@ -2,16 +2,16 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 from msrest.exceptions import ClientException
 
+from gitopscli.git_api import GitRepoApi
 from gitopscli.git_api.azure_devops_git_repo_api_adapter import AzureDevOpsGitRepoApiAdapter
+from gitopscli.git_api.http_session_registry import HttpSessionRegistry
+from gitopscli.git_api.rate_limited_http_adapter import RateLimitedHTTPAdapter
 from gitopscli.gitops_exception import GitOpsException
 
 
-def mock_sleep_func(_: int) -> None:
-    return
-
-
 class AzureDevOpsGitRepoApiAdapterTest(unittest.TestCase):
     def setUp(self):
         with patch("gitopscli.git_api.azure_devops_git_repo_api_adapter.Connection"):
@@ -21,7 +21,6 @@ class AzureDevOpsGitRepoApiAdapterTest(unittest.TestCase):
                 password="testtoken",
                 organisation="testproject",
                 repository_name="testrepo",
-                sleep_func=mock_sleep_func,
             )
 
     @patch("gitopscli.git_api.azure_devops_git_repo_api_adapter.Connection")
@@ -35,7 +34,6 @@ class AzureDevOpsGitRepoApiAdapterTest(unittest.TestCase):
             password="token",
             organisation="project",
             repository_name="repo",
-            sleep_func=mock_sleep_func,
         )
 
         self.assertEqual(adapter.get_username(), "user")
@@ -50,7 +48,6 @@ class AzureDevOpsGitRepoApiAdapterTest(unittest.TestCase):
                 password=None,
                 organisation="project",
                 repository_name="repo",
-                sleep_func=mock_sleep_func,
             )
         self.assertEqual(str(context.value), "Password (Personal Access Token) is required for Azure DevOps")
 
@@ -188,6 +185,25 @@ class AzureDevOpsGitRepoApiAdapterTest(unittest.TestCase):
         pr_update = call_args.kwargs["git_pull_request_to_update"]
         self.assertEqual(pr_update.completion_options.merge_strategy, "rebase")
 
+    def test_get_pull_request_merge_status(self):
+        mock_pr = MagicMock()
+        self.adapter._AzureDevOpsGitRepoApiAdapter__git_client.get_pull_request.return_value = mock_pr
+
+        for merge_status, expected in [
+            ("notSet", GitRepoApi.MergeStatus.PENDING),
+            ("queued", GitRepoApi.MergeStatus.PENDING),
+            ("succeeded", GitRepoApi.MergeStatus.READY),
+            ("conflicts", GitRepoApi.MergeStatus.BLOCKED),
+            ("rejectedByPolicy", GitRepoApi.MergeStatus.BLOCKED),
+        ]:
+            with self.subTest(merge_status=merge_status):
+                mock_pr.merge_status = merge_status
+                self.assertEqual(expected, self.adapter.get_pull_request_merge_status(123))
+
+        self.adapter._AzureDevOpsGitRepoApiAdapter__git_client.get_pull_request.assert_called_with(
+            repository_id="testrepo", pull_request_id=123, project="testproject"
+        )
+
     def test_add_pull_request_comment_success(self):
         self.adapter._AzureDevOpsGitRepoApiAdapter__git_client.create_thread.return_value = None
 
@@ -288,6 +304,67 @@ class AzureDevOpsGitRepoApiAdapterTest(unittest.TestCase):
 
         self.assertEqual(result, "main")  # Should fallback to "main"
 
+    def test_get_file_content_success(self):
+        mock_item = MagicMock()
+        mock_item.content = "foo: bar"
+        self.adapter._AzureDevOpsGitRepoApiAdapter__git_client.get_item.return_value = mock_item
+
+        result = self.adapter.get_file_content(".gitops.config.yaml", "develop")
+
+        self.assertEqual(result, "foo: bar")
+        call_args = self.adapter._AzureDevOpsGitRepoApiAdapter__git_client.get_item.call_args
+        self.assertEqual(call_args.kwargs["path"], ".gitops.config.yaml")
+        self.assertEqual(call_args.kwargs["version_descriptor"].version, "develop")
+        self.assertEqual(call_args.kwargs["version_descriptor"].version_type, "branch")
+        self.assertTrue(call_args.kwargs["include_content"])
+
+    def test_get_file_content_of_default_branch(self):
+        self.adapter._AzureDevOpsGitRepoApiAdapter__git_client.get_item.return_value = MagicMock(content="foo")
+
+        self.assertEqual(self.adapter.get_file_content(".gitops.config.yaml"), "foo")
+
+        call_args = self.adapter._AzureDevOpsGitRepoApiAdapter__git_client.get_item.call_args
+        self.assertIsNone(call_args.kwargs["version_descriptor"])
+
+    def test_get_file_content_not_found(self):
+        self.adapter._AzureDevOpsGitRepoApiAdapter__git_client.get_item.side_effect = ClientException("404 Not Found")
+
+        self.assertIsNone(self.adapter.get_file_content(".gitops.config.yaml"))
+
+    def test_get_file_content_error(self):
+        self.adapter._AzureDevOpsGitRepoApiAdapter__git_client.get_item.side_effect = ClientException(
+            "500 Internal Server Error"
+        )
+
+        with pytest.raises(GitOpsException) as context:
+            self.adapter.get_file_content(".gitops.config.yaml")
+
+        self.assertEqual(str(context.value), "Error reading file '.gitops.config.yaml': 500 Internal Server Error")
+
+    @patch("gitopscli.git_api.azure_devops_git_repo_api_adapter.Connection")
+    def test_session_registry(self, mock_connection):
+        mock_git_client = MagicMock()
+        mock_connection.return_value.clients.get_git_client.return_value = mock_git_client
+        session_registry = HttpSessionRegistry(pool_size=4, timeout_seconds=7)
+
+        for _ in range(2):
+            AzureDevOpsGitRepoApiAdapter(
+                git_provider_url="https://dev.azure.com/myorg",
+                username="user",
+                password="token",
+                organisation="project",
+                repository_name="repo",
+                session_registry=session_registry,
+            )
+
+        mock_connection.assert_called_once()  # git client is shared
+        self.assertEqual(7, mock_git_client.config.connection.timeout)
+
+        session = requests.Session()
+        request_kwargs = mock_git_client.config.session_configuration_callback(session, None, {}, timeout=7)
+        self.assertEqual({"timeout": 7}, request_kwargs)
+        self.assertIsInstance(session.get_adapter("https://dev.azure.com"), RateLimitedHTTPAdapter)
+
 
 if __name__ == "__main__":
     unittest.main()
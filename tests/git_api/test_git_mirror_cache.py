@@ -0,0 +1,97 @@
+import unittest
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from git import Repo
+
+from gitopscli.git_api.git_mirror_cache import GitMirrorCache
+from gitopscli.gitops_exception import GitOpsException
+
+
+class GitMirrorCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = self.__create_tmp_dir()
+        self.origin = self.__create_origin()
+
+    @staticmethod
+    def __create_tmp_dir():
+        tmp_dir_path = f"/tmp/gitopscli-test-{uuid.uuid4()}"
+        Path(tmp_dir_path).mkdir(parents=True)
+        return tmp_dir_path
+
+    def __create_origin(self):
+        repo = Repo.init(self.__create_tmp_dir(), initial_branch="master")
+        repo.config_writer().set_value("user", "name", "unit tester").release()
+        repo.config_writer().set_value("user", "email", "unit@tester.com").release()
+        self.__commit(repo, "README.md", "initial content")
+        return repo
+
+    @staticmethod
+    def __commit(repo, file_name, content):
+        with Path(f"{repo.working_dir}/{file_name}").open("w") as outfile:
+            outfile.write(content)
+        repo.git.add("--all")
+        repo.git.commit("-m", f"update {file_name}")
+        return repo.head.commit.hexsha
+
+    def test_from_env_not_configured(self):
+        with patch.dict("os.environ", {}, clear=True):
+            self.assertIsNone(GitMirrorCache.from_env())
+
+    def test_from_env_invalid_max_size(self):
+        env = {"GITOPSCLI_MIRROR_CACHE_DIR": self.cache_dir, "GITOPSCLI_MIRROR_CACHE_MAX_SIZE_MB": "lots"}
+        with patch.dict("os.environ", env), pytest.raises(GitOpsException) as ex:
+            GitMirrorCache.from_env()
+        self.assertEqual("Invalid value for GITOPSCLI_MIRROR_CACHE_MAX_SIZE_MB: 'lots'", str(ex.value))
+
+    def test_mirror_is_created_and_fetched_incrementally(self):
+        testee = GitMirrorCache(self.cache_dir, max_size_bytes=1024 * 1024 * 1024)
+
+        with testee.mirror(self.origin.working_dir) as mirror_dir:
+            self.assertEqual(self.origin.head.commit.hexsha, Repo(mirror_dir).git.rev_parse("master"))
+
+        new_commit_hash = self.__commit(self.origin, "README.md", "new content")
+        self.origin.git.branch("feature")
+
+        with testee.mirror(self.origin.working_dir) as same_mirror_dir:
+            self.assertEqual(mirror_dir, same_mirror_dir)
+            mirror = Repo(same_mirror_dir)
+            self.assertTrue(mirror.bare)
+            self.assertEqual(new_commit_hash, mirror.git.rev_parse("master"))
+            self.assertEqual(new_commit_hash, mirror.git.rev_parse("feature"))
+
+    def test_mirror_of_unknown_url(self):
+        testee = GitMirrorCache(self.cache_dir, max_size_bytes=1024 * 1024 * 1024)
+
+        with pytest.raises(GitOpsException) as ex, testee.mirror("/tmp/does-not-exist"):
+            pass
+        self.assertEqual("Error fetching '/tmp/does-not-exist' into mirror cache", str(ex.value))
+        self.assertEqual([], list(Path(self.cache_dir).glob("*.git")))
+
+    def test_least_recently_used_mirror_is_evicted(self):
+        other_origin = self.__create_origin()
+        testee = GitMirrorCache(self.cache_dir, max_size_bytes=1)
+
+        with testee.mirror(self.origin.working_dir) as first_mirror_dir:
+            pass
+        self.assertTrue(Path(first_mirror_dir).is_dir())
+
+        with testee.mirror(other_origin.working_dir) as second_mirror_dir:
+            pass
+        self.assertFalse(Path(first_mirror_dir).exists())
+        self.assertFalse(Path(first_mirror_dir).with_suffix(".lock").exists())
+        self.assertTrue(Path(second_mirror_dir).is_dir())
+
+        with testee.mirror(self.origin.working_dir) as recreated_mirror_dir:  # lock file is created again
+            self.assertEqual(first_mirror_dir, recreated_mirror_dir)
+        self.assertFalse(Path(second_mirror_dir).exists())
+
+    def test_eviction_ignores_mirrors_removed_concurrently(self):
+        testee = GitMirrorCache(self.cache_dir, max_size_bytes=1)
+        Path(self.cache_dir, "removed.git").symlink_to("/tmp/does-not-exist")  # stat() raises FileNotFoundError
+
+        with testee.mirror(self.origin.working_dir) as mirror_dir:
+            pass
+        self.assertTrue(Path(mirror_dir).is_dir())
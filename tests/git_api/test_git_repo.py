@@ -2,12 +2,13 @@ import stat
 import unittest
 import uuid
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 import pytest
-from git import Repo
+from git import Git, Repo
 
 from gitopscli.git_api import GitRepo, GitRepoApi
+from gitopscli.git_api.git_push_retry_policy import get_push_retries
 from gitopscli.gitops_exception import GitOpsException
 
 
@@ -56,6 +57,14 @@ class GitRepoTest(unittest.TestCase):
 
         return repo
 
+    def __add_origin_files(self, files):
+        for file_name, content in files.items():
+            file_path = Path(self.__origin.working_dir) / file_name
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(content)
+        self.__origin.git.add("--all")
+        self.__origin.git.commit("-m", "add files")
+
     def test_finalize(self):
         testee = GitRepo(self.__mock_repo_api)
 
@@ -176,6 +185,50 @@ echo password='Pass'
             commits = list(repo.iter_commits("master"))
             self.assertEqual(1, len(commits), "Clone should be shallow with depth 1")
 
+    def test_clone_sparse(self):
+        self.__add_origin_files({"apps/a/values.yaml": "a", "apps/b/values.yaml": "b", "docs/index.md": "docs"})
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone(sparse_paths=["apps/a", "./docs/index.md", "does/not/exist"])
+
+            self.assertTrue(Path(testee.get_full_file_path("apps/a/values.yaml")).is_file())
+            self.assertTrue(Path(testee.get_full_file_path("docs/index.md")).is_file())
+            self.assertFalse(Path(testee.get_full_file_path("apps/b")).exists())
+            self.assertFalse(Path(testee.get_full_file_path("README.md")).exists())
+
+            with Path(testee.get_full_file_path("apps/a/values.yaml")).open("w") as outfile:
+                outfile.write("changed")
+            testee.commit("john doe", "john@doe.com", None, None, "sparse commit")
+
+            repo = Repo(testee.get_full_file_path("."))
+            self.assertEqual(["apps/a/values.yaml"], list(repo.head.commit.stats.files))
+            self.assertEqual("", repo.git.status("--porcelain"))
+
+    def test_clone_sparse_from_mirror_cache(self):
+        self.__add_origin_files({"apps/a/values.yaml": "a", "apps/b/values.yaml": "b"})
+        with (
+            patch.dict("os.environ", {"GITOPSCLI_MIRROR_CACHE_DIR": self.__create_tmp_dir()}),
+            GitRepo(self.__mock_repo_api) as testee,
+        ):
+            testee.clone(sparse_paths=["apps/a"])
+
+            self.assertTrue(Path(testee.get_full_file_path("apps/a/values.yaml")).is_file())
+            self.assertFalse(Path(testee.get_full_file_path("apps/b")).exists())
+
+    def test_clone_from_mirror_cache(self):
+        cache_dir = self.__create_tmp_dir()
+        with patch.dict("os.environ", {"GITOPSCLI_MIRROR_CACHE_DIR": cache_dir}):
+            with GitRepo(self.__mock_repo_api) as testee:
+                testee.clone("xyz")
+
+                readme = self.__read_file(testee.get_full_file_path("README.md"))
+                self.assertEqual("xyz branch readme", readme)
+
+                repo = Repo(testee.get_full_file_path("."))
+                self.assertEqual(self.__origin.working_dir, repo.remote("origin").url)
+                self.assertEqual("xyz", repo.git.branch("--show-current"))
+
+            self.assertEqual(1, len(list(Path(cache_dir).glob("*.git"))))
+
     def test_get_full_file_path(self):
         with GitRepo(self.__mock_repo_api) as testee:
             testee.clone()
@@ -323,6 +376,136 @@ echo password='Pass'
             self.assertEqual("initial commit\n", commits[0].message)
         logging_mock.assert_not_called()
 
+    def test_commit_paths(self):
+        self.__add_origin_files({"apps/a.yaml": "a", "apps/b.yaml": "b", "other.md": "other"})
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            Path(testee.get_full_file_path("apps/a.yaml")).write_text("changed a")
+            Path(testee.get_full_file_path("apps/b.yaml")).unlink()
+            Path(testee.get_full_file_path("apps/c.yaml")).write_text("new c")
+            Path(testee.get_full_file_path("other.md")).write_text("not committed")
+
+            commit_hash = testee.commit("john doe", "john@doe.com", None, None, "commit apps", paths=["apps"])
+
+            repo = Repo(testee.get_full_file_path("."))
+            self.assertEqual(commit_hash, repo.head.commit.hexsha)
+            self.assertEqual({"apps/a.yaml", "apps/b.yaml", "apps/c.yaml"}, set(repo.head.commit.stats.files))
+            self.assertEqual(["other.md"], [diff.a_path for diff in repo.index.diff(None)])
+
+    def test_commit_marked_changes(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            Path(testee.get_full_file_path("foo.md")).write_text("new file")
+            Path(testee.get_full_file_path("README.md")).write_text("new content")
+            testee.mark_changed("./foo.md")
+            self.assertEqual(["foo.md"], testee.get_changed_paths())
+
+            commit_hash = testee.commit(
+                "john doe", "john@doe.com", None, None, "new commit", paths=testee.get_changed_paths()
+            )
+
+            repo = Repo(testee.get_full_file_path("."))
+            self.assertEqual(["foo.md"], list(repo.commit(commit_hash).stats.files))
+            self.assertEqual([], testee.get_changed_paths())
+
+    def test_commit_without_paths_does_not_invoke_git(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            Path(testee.get_full_file_path("README.md")).write_text("not committed")
+
+            with patch.object(Git, "execute") as execute_mock:
+                self.assertIsNone(testee.commit("john doe", "john@doe.com", None, None, "nothing", paths=[]))
+
+            execute_mock.assert_not_called()
+
+    @patch("gitopscli.git_api.git_repo.logging")
+    def test_commit_files(self, logging_mock):
+        self.__add_origin_files({"apps/a/values.yaml": "a", "apps/b/values.yaml": "b"})
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            logging_mock.reset_mock()
+
+            commit_hash = testee.commit_files(
+                git_user="john doe",
+                git_email="john@doe.com",
+                git_author_name="custom author",
+                git_author_email="custom@author.com",
+                message="in-memory commit",
+                files={"README.md": "new content", "apps/c/values.yaml": "c", "apps/b/values.yaml": None},
+            )
+
+            repo = Repo(testee.get_full_file_path("."))
+            self.assertEqual(commit_hash, repo.head.commit.hexsha)
+            self.assertEqual("master", repo.active_branch.name)
+            self.assertEqual("in-memory commit", repo.head.commit.message)
+            self.assertEqual("john doe", repo.head.commit.committer.name)
+            self.assertEqual("john@doe.com", repo.head.commit.committer.email)
+            self.assertEqual("custom author", repo.head.commit.author.name)
+            self.assertEqual("custom@author.com", repo.head.commit.author.email)
+            self.assertEqual(
+                {"README.md", "apps/b/values.yaml", "apps/c/values.yaml"}, set(repo.head.commit.stats.files)
+            )
+            self.assertEqual("new content", self.__read_file(testee.get_full_file_path("README.md")))
+            self.assertEqual("c", self.__read_file(testee.get_full_file_path("apps/c/values.yaml")))
+            self.assertFalse(Path(testee.get_full_file_path("apps/b/values.yaml")).exists())
+            self.assertEqual("", repo.git.status("--porcelain"))
+
+            testee.pull_rebase()
+            testee.push()
+        self.assertEqual(commit_hash, self.__origin.git.rev_parse("master"))
+        logging_mock.info.assert_any_call("Creating commit with message: %s", "in-memory commit")
+
+    def test_commit_files_outside_sparse_checkout(self):
+        self.__add_origin_files({"apps/a/values.yaml": "a", "apps/b/values.yaml": "b"})
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone(sparse_paths=["apps/a"])
+
+            commit_hash = testee.commit_files(
+                "john doe", "john@doe.com", None, None, "sparse commit", {"apps/b/values.yaml": "changed"}
+            )
+
+            repo = Repo(testee.get_full_file_path("."))
+            self.assertEqual(commit_hash, repo.head.commit.hexsha)
+            self.assertEqual("changed", testee.read_file("apps/b/values.yaml"))
+            self.assertFalse(Path(testee.get_full_file_path("apps/b")).exists())
+            self.assertEqual("", repo.git.status("--porcelain"))
+
+    def test_commit_files_nothing_to_commit(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+
+            commit_hash = testee.commit_files(
+                "john doe", "john@doe.com", None, None, "empty commit", {"README.md": "master branch readme"}
+            )
+
+            self.assertIsNone(commit_hash)
+            repo = Repo(testee.get_full_file_path("."))
+            self.assertEqual("initial commit\n", repo.head.commit.message)
+
+    def test_commit_files_with_local_modifications(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            repo = Repo(testee.get_full_file_path("."))
+            head_hash = repo.head.commit.hexsha
+            with Path(testee.get_full_file_path("README.md")).open("w") as outfile:
+                outfile.write("local modification")
+
+            with pytest.raises(GitOpsException) as ex:
+                testee.commit_files("john doe", "john@doe.com", None, None, "conflict", {"README.md": "new content"})
+
+            self.assertEqual("Error creating commit.", str(ex.value))
+            self.assertEqual(head_hash, repo.head.commit.hexsha)
+            self.assertEqual("local modification", self.__read_file(testee.get_full_file_path("README.md")))
+            self.assertEqual(" M README.md", repo.git.status("--porcelain"))
+
+    def test_read_file(self):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone(sparse_paths=[])
+
+            self.assertEqual("master branch readme", testee.read_file("README.md"))
+            self.assertIsNone(testee.read_file("unknown.md"))
+            self.assertFalse(Path(testee.get_full_file_path("README.md")).exists())
+
     @patch("gitopscli.git_api.git_repo.logging")
     def test_pull_rebase_master_single_commit(self, logging_mock):
         origin_repo = self.__origin
@@ -503,6 +686,80 @@ echo password='Pass'
             assert "we reject this push" in str(ex.value)
         logging_mock.info.assert_called_once_with("Pushing branch: %s", "master")
 
+    @patch("gitopscli.git_api.git_repo.time.sleep")
+    @patch("gitopscli.git_api.git_repo.logging")
+    def test_push_rejected_by_new_origin_commits_is_retried(self, logging_mock, sleep_mock):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            self.__commit_local_file(testee, "local.md", "local file")
+            self.__add_origin_files({"origin.md": "origin file"})
+            retries_before = get_push_retries()
+
+            logging_mock.reset_mock()
+            with patch.dict("os.environ", {"GITOPSCLI_PUSH_RETRY_BASE_DELAY": "2"}):
+                testee.push()
+
+            commits = list(self.__origin.iter_commits("master"))
+            self.assertEqual(["new commit\n", "add files\n", "initial commit\n"], [c.message for c in commits])
+            self.assertEqual(retries_before + 1, get_push_retries())
+        sleep_mock.assert_called_once()
+        self.assertTrue(0 <= sleep_mock.call_args.args[0] <= 2)  # noqa: PLR2004
+        self.assertEqual(
+            [call("Pushing branch: %s", "master"), call("Pushing branch: %s", "master")],
+            [c for c in logging_mock.info.call_args_list if c.args[0] == "Pushing branch: %s"],
+        )
+
+    @patch("gitopscli.git_api.git_repo.time.sleep")
+    def test_push_rejected_by_conflicting_origin_commits(self, sleep_mock):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            self.__commit_local_file(testee, "README.md", "local readme")
+            self.__add_origin_files({"README.md": "origin readme"})
+
+            with pytest.raises(GitOpsException) as ex:
+                testee.push()
+            self.assertEqual("Error rebasing branch 'master' onto new commits of origin.", str(ex.value))
+            self.assertEqual("local readme", self.__read_file(testee.get_full_file_path("README.md")))
+        sleep_mock.assert_called_once()
+
+    @patch("gitopscli.git_api.git_repo.time.sleep")
+    @patch("gitopscli.git_api.git_repo.logging")
+    def test_push_rejected_without_retries(self, logging_mock, sleep_mock):
+        with GitRepo(self.__mock_repo_api) as testee:
+            testee.clone()
+            self.__commit_local_file(testee, "local.md", "local file")
+            self.__add_origin_files({"origin.md": "origin file"})
+
+            logging_mock.reset_mock()
+            with patch.dict("os.environ", {"GITOPSCLI_PUSH_MAX_ATTEMPTS": "1"}), pytest.raises(GitOpsException) as ex:
+                testee.push()
+            assert str(ex.value).startswith("Error pushing branch 'master' to origin:")
+            assert "[rejected]" in str(ex.value)
+        sleep_mock.assert_not_called()
+        logging_mock.info.assert_called_once_with("Pushing branch: %s", "master")
+
+    def __commit_local_file(self, testee, file_name, content):
+        Path(testee.get_full_file_path(file_name)).write_text(content)
+        local_repo = Repo(testee.get_full_file_path("."))
+        local_repo.git.add("--all")
+        local_repo.config_writer().set_value("user", "email", "unit@tester.com").release()
+        local_repo.git.commit("-m", "new commit")
+
+    def test_get_remote_head_hash(self):
+        testee = GitRepo(self.__mock_repo_api)
+
+        self.assertEqual(self.__origin.head.commit.hexsha, testee.get_remote_head_hash())  # without cloning
+
+        self.__add_origin_files({"new.txt": "new"})
+        self.assertEqual(self.__origin.head.commit.hexsha, testee.get_remote_head_hash())
+
+    def test_get_remote_head_hash_unknown_url(self):
+        self.__mock_repo_api.get_clone_url.return_value = "/tmp/unknown-repo"
+        testee = GitRepo(self.__mock_repo_api)
+
+        with pytest.raises(GitOpsException, match="Error reading HEAD of '/tmp/unknown-repo'"):
+            testee.get_remote_head_hash()
+
     def test_get_author_from_last_commit(self):
         with GitRepo(self.__mock_repo_api) as testee:
             testee.clone()
@@ -77,6 +77,11 @@ class GitRepoApiLoggingProxyTest(unittest.TestCase):
         self.__mock_repo_api.merge_pull_request.assert_called_once_with(42, merge_method="merge")
         logging_mock.info.assert_called_once_with("Merging pull request %s", 42)
 
+    def test_get_pull_request_merge_status(self):
+        self.__mock_repo_api.get_pull_request_merge_status.return_value = GitRepoApi.MergeStatus.READY
+        self.assertEqual(GitRepoApi.MergeStatus.READY, self.__testee.get_pull_request_merge_status(42))
+        self.__mock_repo_api.get_pull_request_merge_status.assert_called_once_with(42)
+
     @patch("gitopscli.git_api.git_repo_api_logging_proxy.logging")
     def test_add_pull_request_comment(self, logging_mock):
         self.__testee.add_pull_request_comment(pr_id=42, text="<text>", parent_id=4711)
@@ -114,3 +119,12 @@ class GitRepoApiLoggingProxyTest(unittest.TestCase):
 
         self.assertEqual(actual_return_value, expected_return_value)
         self.__mock_repo_api.get_pull_request_branch.assert_called_once_with(42)
+
+    def test_get_file_content(self):
+        expected_return_value = "<file content>"
+        self.__mock_repo_api.get_file_content.return_value = expected_return_value
+
+        actual_return_value = self.__testee.get_file_content("path/to/file.yaml", "main")
+
+        self.assertEqual(actual_return_value, expected_return_value)
+        self.__mock_repo_api.get_file_content.assert_called_once_with("path/to/file.yaml", "main")
@@ -0,0 +1,111 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gitopscli.git_api import GitProvider, GitRepoApi
+from gitopscli.git_api.git_api_metrics import GitApiMetrics
+from gitopscli.git_api.git_repo_api_metrics_proxy import GitRepoApiMetricsProxy
+from gitopscli.gitops_exception import GitOpsException
+
+
+class GitRepoApiMetricsProxyTest(unittest.TestCase):
+    def setUp(self):
+        self.__mock_repo_api = MagicMock()
+        self.__metrics = GitApiMetrics()
+        self.__testee = GitRepoApiMetricsProxy(self.__mock_repo_api, GitProvider.AZURE_DEVOPS, self.__metrics)
+
+    def test_calls_are_delegated(self):
+        self.__mock_repo_api.create_pull_request.return_value = GitRepoApi.PullRequestIdAndUrl(42, "<url>")
+
+        pr = self.__testee.create_pull_request("<from>", "<to>", "<title>", "<description>")
+        self.__testee.merge_pull_request(42, "squash", {"key": "value"})
+
+        self.assertEqual(GitRepoApi.PullRequestIdAndUrl(42, "<url>"), pr)
+        self.__mock_repo_api.create_pull_request.assert_called_once_with("<from>", "<to>", "<title>", "<description>")
+        self.__mock_repo_api.merge_pull_request.assert_called_once_with(42, "squash", {"key": "value"})
+
+    @patch("gitopscli.git_api.git_api_metrics.time.perf_counter")
+    def test_calls_latencies_and_errors(self, perf_counter_mock):
+        perf_counter_mock.side_effect = [0.0, 0.2, 10.0, 10.3, 20.0, 20.01]
+        self.__mock_repo_api.get_file_content.side_effect = ["<content>", GitOpsException("Error"), None]
+
+        self.assertEqual("<content>", self.__testee.get_file_content("path", "main"))
+        with pytest.raises(GitOpsException):
+            self.__testee.get_file_content("path")
+        self.__testee.get_file_content("other")
+        self.__testee.get_username()  # no API call
+
+        (call,) = self.__metrics.to_json()["calls"]
+        self.assertEqual("azure_devops", call["provider"])
+        self.assertEqual("get_file_content", call["method"])
+        self.assertEqual(3, call["calls"])
+        self.assertEqual({"GitOpsException": 1}, call["errors"])
+        self.assertEqual(0.51, call["duration_seconds_sum"])
+        self.assertEqual([1, 0, 1, 1, 0, 0, 0, 0, 0, 0], call["duration_buckets"])
+
+    def test_transferred_bytes_are_added_to_current_call(self):
+        self.__mock_repo_api.delete_branch.side_effect = lambda _: self.__metrics.record_transfer(10, 200)
+
+        self.__testee.delete_branch("feature")
+        self.__testee.delete_branch("feature")
+        self.__metrics.record_transfer(1, 1)  # outside of a measured call
+
+        (call,) = self.__metrics.to_json()["calls"]
+        self.assertEqual(20, call["sent_bytes"])
+        self.assertEqual(400, call["received_bytes"])
+
+    @patch("gitopscli.git_api.git_api_metrics.time.perf_counter")
+    def test_prometheus_format(self, perf_counter_mock):
+        perf_counter_mock.side_effect = [0.0, 0.3]
+        self.__mock_repo_api.delete_branch.side_effect = GitOpsException("Error")
+        with pytest.raises(GitOpsException):
+            self.__testee.delete_branch("feature")
+
+        labels = 'provider="azure_devops",method="delete_branch"'
+        self.assertEqual(
+            "# HELP gitopscli_git_api_calls_total Calls of the git provider API.\n"
+            "# TYPE gitopscli_git_api_calls_total counter\n"
+            f"gitopscli_git_api_calls_total{{{labels}}} 1\n"
+            "# HELP gitopscli_git_api_errors_total Failed calls of the git provider API by exception type.\n"
+            "# TYPE gitopscli_git_api_errors_total counter\n"
+            f'gitopscli_git_api_errors_total{{{labels},exception="GitOpsException"}} 1\n'
+            "# HELP gitopscli_git_api_call_duration_seconds Latency of the git provider API calls.\n"
+            "# TYPE gitopscli_git_api_call_duration_seconds histogram\n"
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="0.05"}} 0\n'
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="0.1"}} 0\n'
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="0.25"}} 0\n'
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="0.5"}} 1\n'
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="1"}} 1\n'
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="2.5"}} 1\n'
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="5"}} 1\n'
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="10"}} 1\n'
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="30"}} 1\n'
+            f'gitopscli_git_api_call_duration_seconds_bucket{{{labels},le="+Inf"}} 1\n'
+            f"gitopscli_git_api_call_duration_seconds_sum{{{labels}}} 0.3\n"
+            f"gitopscli_git_api_call_duration_seconds_count{{{labels}}} 1\n"
+            "# HELP gitopscli_git_api_sent_bytes_total HTTP bytes sent by git provider API calls.\n"
+            "# TYPE gitopscli_git_api_sent_bytes_total counter\n"
+            f"gitopscli_git_api_sent_bytes_total{{{labels}}} 0\n"
+            "# HELP gitopscli_git_api_received_bytes_total HTTP bytes received by git provider API calls.\n"
+            "# TYPE gitopscli_git_api_received_bytes_total counter\n"
+            f"gitopscli_git_api_received_bytes_total{{{labels}}} 0\n",
+            self.__metrics.to_prometheus(),
+        )
+
+    def test_write_file(self):
+        self.__mock_repo_api.get_clone_url.return_value = "<url>"
+        self.__testee.get_clone_url()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.__metrics.write_file(f"{tmp_dir}/gitopscli.prom")
+            self.__metrics.write_file(f"{tmp_dir}/gitopscli.json")
+
+            self.assertEqual(["gitopscli.json", "gitopscli.prom"], sorted(p.name for p in Path(tmp_dir).iterdir()))
+            self.assertEqual(self.__metrics.to_prometheus(), Path(f"{tmp_dir}/gitopscli.prom").read_text())
+            metrics_json = json.loads(Path(f"{tmp_dir}/gitopscli.json").read_text())
+        self.assertEqual(self.__metrics.to_json(), metrics_json)
+        self.assertEqual("get_clone_url", metrics_json["calls"][0]["method"])
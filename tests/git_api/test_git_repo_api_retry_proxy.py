@@ -0,0 +1,183 @@
+import json
+import unittest
+from unittest.mock import ANY, MagicMock, call, patch
+
+import gitlab
+import pytest
+import requests
+from github import GithubException
+
+from gitopscli.git_api import GitProvider, GitRepoApi
+from gitopscli.git_api.git_repo_api_retry_proxy import GitRepoApiRetryProxy
+from gitopscli.git_api.retry_policy import RetryPolicy
+from gitopscli.gitops_exception import GitOpsException
+
+PR = GitRepoApi.PullRequestIdAndUrl(pr_id=42, url="<url>")
+
+
+def http_error(status_code, body=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if body is not None:
+        response._content = json.dumps(body).encode()
+    return requests.exceptions.HTTPError(response=response)
+
+
+def bitbucket_merge_error(exception_name):
+    return http_error(
+        409, {"errors": [{"message": "...", "exceptionName": f"com.atlassian.bitbucket.{exception_name}"}]}
+    )
+
+
+class GitRepoApiRetryProxyTest(unittest.TestCase):
+    def setUp(self):
+        self.__mock_repo_api: GitRepoApi = MagicMock()
+        self.__sleep_mock = MagicMock()
+        self.__retry_policy = RetryPolicy(max_attempts=3, base_delay_seconds=1.0, max_delay_seconds=5.0)
+        self.__testee = self.__create_testee(GitProvider.GITHUB)
+
+    def __create_testee(self, git_provider, retry_policy=None):
+        return GitRepoApiRetryProxy(
+            self.__mock_repo_api, git_provider, retry_policy or self.__retry_policy, sleep=self.__sleep_mock
+        )
+
+    def test_get_username_and_password(self):
+        self.__mock_repo_api.get_username.return_value = "<username>"
+        self.__mock_repo_api.get_password.return_value = "<password>"
+
+        self.assertEqual("<username>", self.__testee.get_username())
+        self.assertEqual("<password>", self.__testee.get_password())
+
+    def test_delegates_without_retry(self):
+        self.__mock_repo_api.get_clone_url.return_value = "<clone url>"
+        self.__mock_repo_api.create_pull_request.return_value = PR
+        self.__mock_repo_api.get_file_content.return_value = "<content>"
+
+        self.assertEqual("<clone url>", self.__testee.get_clone_url())
+        self.assertEqual(PR, self.__testee.create_pull_request("from", "to", "title", "description"))
+        self.__testee.merge_pull_request(42, "squash", {"a": "b"})
+        self.__testee.add_pull_request_comment(42, "text", 7)
+        self.__testee.delete_branch("branch")
+        self.assertEqual("<content>", self.__testee.get_file_content("path", "ref"))
+
+        self.assertEqual(
+            [
+                call.get_clone_url(),
+                call.create_pull_request("from", "to", "title", "description"),
+                call.merge_pull_request(42, "squash", {"a": "b"}),
+                call.add_pull_request_comment(42, "text", 7),
+                call.delete_branch("branch"),
+                call.get_file_content("path", "ref"),
+            ],
+            self.__mock_repo_api.method_calls,
+        )
+        self.__sleep_mock.assert_not_called()
+
+    @patch("gitopscli.git_api.git_repo_api_retry_proxy.logging")
+    def test_transient_errors_are_retried(self, logging_mock):
+        mapped_timeout = GitOpsException("Error reading file")
+        mapped_timeout.__cause__ = requests.exceptions.ReadTimeout()
+        for error in [
+            GithubException(502, "Bad Gateway", None),
+            http_error(503),
+            requests.exceptions.ConnectionError("Connection reset by peer"),
+            mapped_timeout,
+        ]:
+            with self.subTest(error=error):
+                self.__sleep_mock.reset_mock()
+                self.__mock_repo_api.get_file_content.side_effect = [error, "<content>"]
+
+                self.assertEqual("<content>", self.__testee.get_file_content("path"))
+
+                self.__sleep_mock.assert_called_once()
+                self.assertTrue(0 <= self.__sleep_mock.call_args.args[0] <= 1.0)
+        logging_mock.warning.assert_called_with(
+            "Failed to %s, retrying in %.1fs (attempt %s/%s): %s",
+            "get file content",
+            ANY,
+            2,
+            3,
+            ANY,
+        )
+
+    def test_permanent_errors_are_not_retried(self):
+        for error in [GithubException(404, "Not Found", None), http_error(401), GitOpsException("Bad credentials")]:
+            with self.subTest(error=error):
+                self.__mock_repo_api.get_branch_head_hash.side_effect = error
+                with pytest.raises(type(error)):
+                    self.__testee.get_branch_head_hash("branch")
+        self.__sleep_mock.assert_not_called()
+
+    def test_gives_up_after_max_attempts(self):
+        self.__mock_repo_api.delete_branch.side_effect = GithubException(500, "Server Error", None)
+
+        with pytest.raises(GithubException):
+            self.__testee.delete_branch("branch")
+
+        self.assertEqual(3, self.__mock_repo_api.delete_branch.call_count)
+        self.assertEqual(2, self.__sleep_mock.call_count)
+
+    @patch("gitopscli.git_api.git_repo_api_retry_proxy.time.monotonic")
+    def test_gives_up_after_deadline(self, monotonic_mock):
+        monotonic_mock.side_effect = [0.0, 1.0, 100.0]
+        testee = self.__create_testee(GitProvider.GITHUB, RetryPolicy(10, 1.0, 5.0, deadline_seconds=60.0))
+        self.__mock_repo_api.delete_branch.side_effect = GithubException(500, "Server Error", None)
+
+        with pytest.raises(GithubException):
+            testee.delete_branch("branch")
+
+        self.assertEqual(2, self.__mock_repo_api.delete_branch.call_count)
+
+    def test_creates_are_only_retried_if_unavailable(self):
+        self.__mock_repo_api.create_pull_request_to_default_branch.side_effect = [http_error(503), PR]
+        self.assertEqual(PR, self.__testee.create_pull_request_to_default_branch("from", "title", "description"))
+
+        self.__mock_repo_api.add_pull_request_comment.side_effect = GithubException(502, "Bad Gateway", None)
+        with pytest.raises(GithubException):
+            self.__testee.add_pull_request_comment(42, "text")
+        self.assertEqual(1, self.__mock_repo_api.add_pull_request_comment.call_count)
+
+    def test_merge_not_ready_is_retried(self):
+        for git_provider, error in [
+            (
+                GitProvider.GITHUB,
+                GithubException(405, {"message": "Base branch was modified. Review and try the merge again."}, None),
+            ),
+            (GitProvider.GITLAB, GitOpsException("Error merging pull request: 'Branch cannot be merged'")),
+            (GitProvider.BITBUCKET, bitbucket_merge_error("pull.PullRequestOutOfDateException")),
+        ]:
+            if git_provider is GitProvider.GITLAB:
+                error.__cause__ = gitlab.exceptions.GitlabMRClosedError(response_code=405)
+            with self.subTest(git_provider=git_provider):
+                self.__mock_repo_api.merge_pull_request.reset_mock()
+                self.__mock_repo_api.merge_pull_request.side_effect = [error, None]
+
+                self.__create_testee(git_provider).merge_pull_request(42)
+
+                self.assertEqual(2, self.__mock_repo_api.merge_pull_request.call_count)
+
+    def test_merge_failures_are_not_retried(self):
+        for git_provider, error in [
+            (GitProvider.GITHUB, GithubException(405, {"message": "Pull Request is not mergeable"}, None)),
+            (
+                GitProvider.GITHUB,
+                GithubException(405, {"message": "Merge commits are not allowed on this repository."}, None),
+            ),
+            (GitProvider.GITHUB, GithubException(405, None, None)),
+            (GitProvider.BITBUCKET, bitbucket_merge_error("pull.PullRequestMergeVetoedException")),
+            (GitProvider.BITBUCKET, http_error(409)),
+        ]:
+            with self.subTest(git_provider=git_provider, error=error):
+                self.__mock_repo_api.merge_pull_request.reset_mock()
+                self.__mock_repo_api.merge_pull_request.side_effect = [error, None]
+
+                with pytest.raises(type(error)):
+                    self.__create_testee(git_provider).merge_pull_request(42)
+                self.assertEqual(1, self.__mock_repo_api.merge_pull_request.call_count)
+
+    def test_merge_not_ready_of_other_provider_is_not_retried(self):
+        self.__mock_repo_api.merge_pull_request.side_effect = http_error(409)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            self.__create_testee(GitProvider.GITHUB).merge_pull_request(42)
+        self.assertEqual(1, self.__mock_repo_api.merge_pull_request.call_count)
@@ -0,0 +1,54 @@
+import os
+import time
+import unittest
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from gitopscli.git_api.git_repo_metadata_cache import GitRepoMetadataCache
+from gitopscli.gitops_exception import GitOpsException
+
+
+class GitRepoMetadataCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = f"/tmp/gitopscli-test-{uuid.uuid4()}/metadata"
+
+    def test_from_env_not_configured(self):
+        with patch.dict("os.environ", {}, clear=True):
+            self.assertIsNone(GitRepoMetadataCache.from_env())
+
+    def test_from_env_invalid_ttl(self):
+        env = {"GITOPSCLI_METADATA_CACHE_DIR": self.cache_dir, "GITOPSCLI_METADATA_CACHE_TTL": "1h"}
+        with patch.dict("os.environ", env, clear=True), pytest.raises(GitOpsException) as ex:
+            GitRepoMetadataCache.from_env()
+        self.assertEqual("Invalid value for GITOPSCLI_METADATA_CACHE_TTL: '1h'", str(ex.value))
+
+    def test_put_and_get(self):
+        with patch.dict("os.environ", {"GITOPSCLI_METADATA_CACHE_DIR": self.cache_dir}, clear=True):
+            testee = GitRepoMetadataCache.from_env()
+        self.assertIsNone(testee.get("github/ORG/REPO"))
+
+        testee.put("github/ORG/REPO", {"default_branch": "main"})
+
+        self.assertEqual({"default_branch": "main"}, testee.get("github/ORG/REPO"))
+        self.assertIsNone(testee.get("github/ORG/OTHER_REPO"))
+        self.assertEqual(1, len(list(Path(self.cache_dir).iterdir())))
+
+    def test_expired_entries_are_ignored(self):
+        testee = GitRepoMetadataCache(self.cache_dir, ttl_seconds=60)
+        testee.put("github/ORG/REPO", {"default_branch": "main"})
+        (cache_file,) = Path(self.cache_dir).iterdir()
+        expired = time.time() - 61
+        os.utime(cache_file, (expired, expired))
+
+        self.assertIsNone(testee.get("github/ORG/REPO"))
+
+    def test_corrupt_entries_are_ignored(self):
+        testee = GitRepoMetadataCache(self.cache_dir, ttl_seconds=60)
+        testee.put("github/ORG/REPO", {"default_branch": "main"})
+        (cache_file,) = Path(self.cache_dir).iterdir()
+        cache_file.write_text("{no json")
+
+        self.assertIsNone(testee.get("github/ORG/REPO"))
@@ -0,0 +1,122 @@
+import unittest
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from github import BadCredentialsException, GithubException, UnknownObjectException
+
+from gitopscli.git_api import GitRepoApi
+from gitopscli.git_api.github_git_repo_api_adapter import GithubGitRepoApiAdapter
+from gitopscli.gitops_exception import GitOpsException
+
+
+class GithubGitRepoApiAdapterTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("gitopscli.git_api.github_git_repo_api_adapter.Github")
+        self.github_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repo_mock = MagicMock(clone_url="https://github.com/ORG/REPO.git", default_branch="main")
+        self.repo_mock.create_pull.return_value = MagicMock(number=42, html_url="https://github.com/ORG/REPO/pull/42")
+        self.get_repo_mock = self.github_mock.return_value.get_repo
+        self.get_repo_mock.return_value = self.repo_mock
+
+    def test_repository_is_fetched_once(self):
+        with patch.dict("os.environ", {}, clear=True):
+            testee = GithubGitRepoApiAdapter("USER", "PASS", "ORG", "REPO")
+
+        self.assertEqual("https://github.com/ORG/REPO.git", testee.get_clone_url())
+        pr = testee.create_pull_request_to_default_branch("feature", "title", "description")
+        testee.merge_pull_request(pr.pr_id)
+        testee.delete_branch("feature")
+
+        self.get_repo_mock.assert_called_once_with("ORG/REPO")
+        self.repo_mock.create_pull.assert_called_once_with(
+            title="title", body="description", head="feature", base="main"
+        )
+
+    def test_metadata_disk_cache(self):
+        env = {"GITOPSCLI_METADATA_CACHE_DIR": f"/tmp/gitopscli-test-{uuid.uuid4()}"}
+        with patch.dict("os.environ", env, clear=True):
+            first = GithubGitRepoApiAdapter("USER", "PASS", "ORG", "REPO")
+            second = GithubGitRepoApiAdapter("USER", "PASS", "ORG", "REPO")
+
+        self.assertEqual("https://github.com/ORG/REPO.git", first.get_clone_url())
+        self.get_repo_mock.assert_called_once_with("ORG/REPO")
+
+        self.get_repo_mock.reset_mock()
+        self.assertEqual("https://github.com/ORG/REPO.git", second.get_clone_url())
+        self.get_repo_mock.assert_not_called()
+
+        second.create_pull_request_to_default_branch("feature", "title", "description")
+        self.get_repo_mock.assert_called_once_with("ORG/REPO")
+        self.repo_mock.create_pull.assert_called_once_with(
+            title="title", body="description", head="feature", base="main"
+        )
+
+    def test_get_pull_request_merge_status(self):
+        with patch.dict("os.environ", {}, clear=True):
+            testee = GithubGitRepoApiAdapter("USER", "PASS", "ORG", "REPO")
+
+        for mergeable, mergeable_state, expected in [
+            (None, "unknown", GitRepoApi.MergeStatus.PENDING),
+            (True, "clean", GitRepoApi.MergeStatus.READY),
+            (True, "unstable", GitRepoApi.MergeStatus.READY),
+            (True, "blocked", GitRepoApi.MergeStatus.BLOCKED),
+            (False, "dirty", GitRepoApi.MergeStatus.BLOCKED),
+        ]:
+            with self.subTest(mergeable=mergeable, mergeable_state=mergeable_state):
+                self.repo_mock.get_pull.return_value = MagicMock(mergeable=mergeable, mergeable_state=mergeable_state)
+                self.assertEqual(expected, testee.get_pull_request_merge_status(42))
+
+        self.repo_mock.get_pull.assert_called_with(42)
+
+    def test_get_pull_request_merge_status_while_required_checks_are_running(self):
+        with patch.dict("os.environ", {}, clear=True):
+            testee = GithubGitRepoApiAdapter("USER", "PASS", "ORG", "REPO")
+        self.repo_mock.get_pull.return_value = MagicMock(mergeable=True, mergeable_state="blocked")
+        self.repo_mock.get_pull.return_value.head.sha = "HEAD_SHA"
+
+        for status_count, status_state, check_run_statuses, expected in [
+            (1, "pending", [], GitRepoApi.MergeStatus.PENDING),
+            (0, "pending", ["completed", "in_progress"], GitRepoApi.MergeStatus.PENDING),
+            (0, "pending", ["completed"], GitRepoApi.MergeStatus.BLOCKED),  # no statuses at all are reported "pending"
+            (1, "failure", ["completed"], GitRepoApi.MergeStatus.BLOCKED),
+        ]:
+            with self.subTest(status_state=status_state, check_run_statuses=check_run_statuses):
+                commit = self.repo_mock.get_commit.return_value
+                commit.get_combined_status.return_value = MagicMock(total_count=status_count, state=status_state)
+                commit.get_check_runs.return_value = [MagicMock(status=status) for status in check_run_statuses]
+                self.assertEqual(expected, testee.get_pull_request_merge_status(42))
+
+        self.repo_mock.get_commit.assert_called_with("HEAD_SHA")
+
+    def test_unknown_repository(self):
+        self.get_repo_mock.side_effect = UnknownObjectException(404, "Not Found", None)
+        with patch.dict("os.environ", {}, clear=True):
+            testee = GithubGitRepoApiAdapter("USER", "PASS", "ORG", "REPO")
+
+        with pytest.raises(GitOpsException) as ex:
+            testee.get_clone_url()
+        self.assertEqual("Repository 'ORG/REPO' does not exist.", str(ex.value))
+
+    def test_get_file_content_errors(self):
+        with patch.dict("os.environ", {}, clear=True):
+            testee = GithubGitRepoApiAdapter("USER", "PASS", "ORG", "REPO")
+
+        for error, expected_error in [
+            (BadCredentialsException(401, "Bad credentials", None), "Bad credentials"),
+            (GithubException(500, "Server error", None), "Error reading file 'file.yaml': Server error"),
+            (
+                requests.exceptions.ConnectionError("Connection refused"),
+                "Error reading file 'file.yaml': Connection refused",
+            ),
+        ]:
+            with self.subTest(error=error):
+                self.repo_mock.get_contents.side_effect = error
+                with pytest.raises(GitOpsException) as ex:
+                    testee.get_file_content("file.yaml")
+                self.assertEqual(expected_error, str(ex.value))
+
+        self.repo_mock.get_contents.side_effect = UnknownObjectException(404, "Not Found", None)
+        self.assertIsNone(testee.get_file_content("file.yaml"))
@@ -0,0 +1,228 @@
+import json
+import threading
+import unittest
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from gitopscli.git_api import GitProvider, GitRepoApi
+from gitopscli.git_api.git_api_metrics import GitApiMetrics
+from gitopscli.git_api.git_repo_api_metrics_proxy import GitRepoApiMetricsProxy
+from gitopscli.git_api.gitlab_git_repo_api_adapter import GitlabGitRepoApiAdapter
+from gitopscli.git_api.http_session_registry import HttpSessionRegistry
+from gitopscli.git_api.merge_readiness_poller import MergeReadinessPoller
+from gitopscli.gitops_exception import GitOpsException
+
+PROJECT_PATH = "/api/v4/projects/ORG%2FREPO"
+PROJECT_ID_PATH = "/api/v4/projects/1"  # used by python-gitlab once the project is loaded
+
+
+class FakeGitlabServer(ThreadingHTTPServer):
+    """Minimal GitLab REST API of a single project with `branch_count` branches."""
+
+    def __init__(self, branch_count, default_branch="main"):
+        super().__init__(("127.0.0.1", 0), FakeGitlabRequestHandler)
+        self.branch_count = branch_count
+        self.default_branch = default_branch
+        self.requests = []
+        self.client_ports = set()
+        self.rate_limited_posts = 0
+        self.merge_statuses = ["mergeable"]  # detailed_merge_status of subsequent merge request requests
+        self.file_status = HTTPStatus.NOT_FOUND  # of raw file requests
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def project(self):
+        return {
+            "id": 1,
+            "path_with_namespace": "ORG/REPO",
+            "default_branch": self.default_branch,
+            "http_url_to_repo": f"{self.url}/ORG/REPO.git",
+        }
+
+    def branches(self, page, per_page):
+        names = [self.default_branch, *(f"preview-{i}" for i in range(self.branch_count - 1))]
+        return [{"name": name, "default": name == self.default_branch} for name in names][
+            (page - 1) * per_page : page * per_page
+        ]
+
+
+class FakeGitlabRequestHandler(BaseHTTPRequestHandler):
+    server: FakeGitlabServer
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.server.requests.append(f"GET {url.path}")
+        self.server.client_ports.add(self.client_address[1])
+        if url.path == PROJECT_PATH:
+            self.__respond(self.server.project())
+        elif url.path == f"{PROJECT_ID_PATH}/repository/branches":
+            query = parse_qs(url.query)
+            page, per_page = int(query.get("page", ["1"])[0]), int(query.get("per_page", ["20"])[0])
+            pages = (self.server.branch_count + per_page - 1) // per_page
+            headers = {"X-Page": str(page), "X-Per-Page": str(per_page), "X-Total-Pages": str(pages)}
+            if page < pages:
+                next_query = f"page={page + 1}&per_page={per_page}"
+                headers["Link"] = f'<{self.server.url}{url.path}?{next_query}>; rel="next"'
+            self.__respond(self.server.branches(page, per_page), headers)
+        elif url.path == f"{PROJECT_ID_PATH}/merge_requests/7":
+            merge_statuses = self.server.merge_statuses
+            merge_status = merge_statuses.pop(0) if len(merge_statuses) > 1 else merge_statuses[0]
+            self.__respond({"iid": 7, "detailed_merge_status": merge_status})
+        elif url.path.startswith(f"{PROJECT_ID_PATH}/repository/files/"):
+            self.__respond({"message": self.server.file_status.phrase}, status=self.server.file_status)
+        else:
+            self.__respond({"message": "404 Not Found"}, status=HTTPStatus.NOT_FOUND)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        self.server.requests.append(f"POST {url.path}")
+        self.server.client_ports.add(self.client_address[1])
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.server.rate_limited_posts > 0:
+            self.server.rate_limited_posts -= 1
+            headers = {"Retry-After": "0", "RateLimit-Limit": "600", "RateLimit-Remaining": "0"}
+            self.__respond({"message": "Retry later"}, headers, status=HTTPStatus.TOO_MANY_REQUESTS)
+            return
+        self.__respond({"iid": 7, "web_url": f"{self.server.url}/ORG/REPO/-/merge_requests/7", **body})
+
+    def __respond(self, data, headers=None, status=HTTPStatus.OK):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+class GitlabGitRepoApiAdapterTest(unittest.TestCase):
+    def create_server(self, branch_count, default_branch="main"):
+        server = FakeGitlabServer(branch_count, default_branch)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_create_pull_request_to_default_branch(self):
+        server = self.create_server(branch_count=3)
+        testee = GitlabGitRepoApiAdapter(server.url, "TOKEN_NAME", "TOKEN", "ORG", "REPO")
+
+        pr = testee.create_pull_request_to_default_branch("preview-1", "title", "description")
+
+        self.assertEqual(7, pr.pr_id)
+        self.assertEqual(f"{server.url}/ORG/REPO/-/merge_requests/7", pr.url)
+        self.assertEqual([f"GET {PROJECT_PATH}", f"POST {PROJECT_ID_PATH}/merge_requests"], server.requests)
+
+    def test_create_pull_request_without_default_branch(self):
+        server = self.create_server(branch_count=0, default_branch=None)
+        testee = GitlabGitRepoApiAdapter(server.url, "TOKEN_NAME", "TOKEN", "ORG", "REPO")
+
+        with pytest.raises(GitOpsException) as ex:
+            testee.create_pull_request_to_default_branch("preview-1", "title", "description")
+        self.assertEqual("Default branch does not exist", str(ex.value))
+
+    def test_wait_until_merge_request_is_checked(self):
+        server = self.create_server(branch_count=3)
+        server.merge_statuses = ["preparing", "checking", "checking", "mergeable"]
+        testee = GitlabGitRepoApiAdapter(server.url, "TOKEN_NAME", "TOKEN", "ORG", "REPO")
+        sleeps = []
+
+        merge_status = MergeReadinessPoller(timeout_seconds=10, sleep=sleeps.append).wait_until_checked(testee, 7)
+
+        self.assertEqual(GitRepoApi.MergeStatus.READY, merge_status)
+        self.assertEqual(4, server.requests.count(f"GET {PROJECT_ID_PATH}/merge_requests/7"))
+        self.assertEqual([0.25, 0.5, 1.0], sleeps)
+
+    def test_get_merge_request_merge_status(self):
+        server = self.create_server(branch_count=3)
+        testee = GitlabGitRepoApiAdapter(server.url, "TOKEN_NAME", "TOKEN", "ORG", "REPO")
+
+        for merge_status, expected in [
+            ("unchecked", GitRepoApi.MergeStatus.PENDING),
+            ("approvals_syncing", GitRepoApi.MergeStatus.PENDING),
+            ("mergeable", GitRepoApi.MergeStatus.READY),
+            ("conflict", GitRepoApi.MergeStatus.BLOCKED),
+            ("ci_still_running", GitRepoApi.MergeStatus.PENDING),
+            ("ci_must_pass", GitRepoApi.MergeStatus.PENDING),
+            ("need_rebase", GitRepoApi.MergeStatus.BLOCKED),
+        ]:
+            with self.subTest(merge_status=merge_status):
+                server.merge_statuses = [merge_status]
+                self.assertEqual(expected, testee.get_pull_request_merge_status(7))
+
+    def test_get_file_content_errors(self):
+        server = self.create_server(branch_count=1)
+        testee = GitlabGitRepoApiAdapter(server.url, "TOKEN_NAME", "TOKEN", "ORG", "REPO")
+
+        self.assertIsNone(testee.get_file_content(".gitops.config.yaml"))
+
+        for status, expected_error in [
+            (HTTPStatus.UNAUTHORIZED, "Bad Personal Access Token"),
+            (HTTPStatus.FORBIDDEN, "Error reading file '.gitops.config.yaml': 'Forbidden'"),
+        ]:
+            with self.subTest(status=status):
+                server.file_status = status
+                with pytest.raises(GitOpsException) as ex:
+                    testee.get_file_content(".gitops.config.yaml")
+                self.assertEqual(expected_error, str(ex.value))
+
+    def test_default_branch_lookup_cost_does_not_grow_with_branch_count(self):
+        for branch_count in [10, 10_000]:
+            server = self.create_server(branch_count)
+            testee = GitlabGitRepoApiAdapter(server.url, "TOKEN_NAME", "TOKEN", "ORG", "REPO")
+
+            for _ in range(3):
+                testee.create_pull_request_to_default_branch("preview-1", "title", "description")
+
+            # one project request (in __init__) and one request per merge request, independent of branch count
+            self.assertEqual(1, server.requests.count(f"GET {PROJECT_PATH}"))
+            self.assertEqual(3, server.requests.count(f"POST {PROJECT_ID_PATH}/merge_requests"))
+            self.assertEqual(4, len(server.requests))
+
+    def test_adapters_share_keep_alive_connection(self):
+        server = self.create_server(branch_count=3)
+        session_registry = HttpSessionRegistry(pool_size=2, timeout_seconds=5)
+
+        for _ in range(3):
+            testee = GitlabGitRepoApiAdapter(server.url, "TOKEN_NAME", "TOKEN", "ORG", "REPO", session_registry)
+            testee.create_pull_request_to_default_branch("preview-1", "title", "description")
+
+        self.assertEqual(6, len(server.requests))
+        self.assertEqual(1, len(server.client_ports))
+
+    def test_transferred_bytes_are_recorded(self):
+        server = self.create_server(branch_count=3)
+        session_registry = HttpSessionRegistry(pool_size=2, timeout_seconds=5)
+        metrics = GitApiMetrics()
+        adapter = GitlabGitRepoApiAdapter(server.url, "TOKEN_NAME", "TOKEN", "ORG", "REPO", session_registry)
+        testee = GitRepoApiMetricsProxy(adapter, GitProvider.GITLAB, metrics)
+
+        testee.create_pull_request("preview-1", "main", "title", "description")
+
+        (call,) = metrics.to_json()["calls"]
+        self.assertEqual(("gitlab", "create_pull_request", 1), (call["provider"], call["method"], call["calls"]))
+        self.assertGreater(call["sent_bytes"], len("preview-1main" + "title" + "description"))
+        self.assertGreater(call["received_bytes"], len(f"{server.url}/ORG/REPO/-/merge_requests/7"))
+
+    def test_rate_limited_requests_are_retried(self):
+        server = self.create_server(branch_count=3)
+        server.rate_limited_posts = 2
+        session_registry = HttpSessionRegistry(pool_size=2, timeout_seconds=5)
+        testee = GitlabGitRepoApiAdapter(server.url, "TOKEN_NAME", "TOKEN", "ORG", "REPO", session_registry)
+
+        pr = testee.create_pull_request_to_default_branch("preview-1", "title", "description")
+
+        self.assertEqual(7, pr.pr_id)
+        self.assertEqual(3, server.requests.count(f"POST {PROJECT_ID_PATH}/merge_requests"))
+        (budget,) = session_registry.rate_limiter.get_budgets().values()
+        self.assertEqual({"limit": 600, "remaining": 0, "reset_at": None}, budget)
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gitopscli.git_api.http_session_registry import HttpSessionRegistry
+from gitopscli.gitops_exception import GitOpsException
+
+
+class HttpSessionRegistryTest(unittest.TestCase):
+    def test_from_env_defaults(self):
+        with patch.dict("os.environ", {}, clear=True):
+            testee = HttpSessionRegistry.from_env()
+        self.assertEqual(10, testee.pool_size)
+        self.assertEqual(60, testee.timeout_seconds)
+
+    def test_from_env(self):
+        with patch.dict("os.environ", {"GITOPSCLI_HTTP_POOL_SIZE": "32", "GITOPSCLI_HTTP_TIMEOUT": "5"}, clear=True):
+            testee = HttpSessionRegistry.from_env()
+        self.assertEqual(32, testee.pool_size)
+        self.assertEqual(5, testee.timeout_seconds)
+
+    def test_from_env_invalid_value(self):
+        with (
+            patch.dict("os.environ", {"GITOPSCLI_HTTP_TIMEOUT": "5s"}, clear=True),
+            pytest.raises(GitOpsException) as ex,
+        ):
+            HttpSessionRegistry.from_env()
+        self.assertEqual("Invalid value for GITOPSCLI_HTTP_TIMEOUT: '5s'", str(ex.value))
+
+    def test_get_session_per_host_and_credentials(self):
+        testee = HttpSessionRegistry(pool_size=3, timeout_seconds=5)
+
+        session = testee.get_session("https://gitlab.example.com")
+
+        self.assertIs(session, testee.get_session("https://gitlab.example.com/api/v4"))
+        self.assertIsNot(session, testee.get_session("https://bitbucket.example.com"))
+        self.assertIsNot(session, testee.get_session("https://gitlab.example.com", "USER", "PASS"))
+        self.assertIs(
+            testee.get_session("https://gitlab.example.com", "USER", "PASS"),
+            testee.get_session("https://gitlab.example.com", "USER", "PASS"),
+        )
+        self.assertEqual(3, session.get_adapter("https://gitlab.example.com")._pool_maxsize)
+
+    def test_get_client(self):
+        testee = HttpSessionRegistry(pool_size=3, timeout_seconds=5)
+        create_client = MagicMock(side_effect=object)
+
+        client = testee.get_client(("github", "USER", "PASS"), create_client)
+
+        self.assertIs(client, testee.get_client(("github", "USER", "PASS"), create_client))
+        self.assertIsNot(client, testee.get_client(("github", "OTHER_USER", "PASS"), create_client))
+        self.assertEqual(2, create_client.call_count)
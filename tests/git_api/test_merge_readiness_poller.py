@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gitopscli.git_api import GitRepoApi
+from gitopscli.git_api.merge_readiness_poller import MergeReadinessPoller
+from gitopscli.gitops_exception import GitOpsException
+
+PENDING = GitRepoApi.MergeStatus.PENDING
+READY = GitRepoApi.MergeStatus.READY
+BLOCKED = GitRepoApi.MergeStatus.BLOCKED
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class MergeReadinessPollerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sleep_mock = MagicMock(side_effect=self.clock.sleep)
+        self.git_repo_api_mock = MagicMock()
+        self.testee = MergeReadinessPoller(timeout_seconds=30, sleep=self.sleep_mock, clock=self.clock)
+
+    def test_ready_without_waiting(self):
+        self.git_repo_api_mock.get_pull_request_merge_status.return_value = READY
+
+        self.assertEqual(READY, self.testee.wait_until_checked(self.git_repo_api_mock, 42))
+
+        self.git_repo_api_mock.get_pull_request_merge_status.assert_called_once_with(42)
+        self.sleep_mock.assert_not_called()
+
+    def test_blocked_is_returned(self):
+        self.git_repo_api_mock.get_pull_request_merge_status.side_effect = [PENDING, BLOCKED]
+
+        self.assertEqual(BLOCKED, self.testee.wait_until_checked(self.git_repo_api_mock, 42))
+
+    def test_poll_interval_grows_up_to_max(self):
+        self.git_repo_api_mock.get_pull_request_merge_status.side_effect = [PENDING] * 8 + [READY]
+
+        self.assertEqual(READY, self.testee.wait_until_checked(self.git_repo_api_mock, 42))
+
+        sleeps = [c.args[0] for c in self.sleep_mock.call_args_list]
+        self.assertEqual([0.25, 0.5, 1.0, 2.0, 4.0, 5.0, 5.0, 5.0], sleeps)
+
+    def test_timeout(self):
+        self.git_repo_api_mock.get_pull_request_merge_status.return_value = PENDING
+
+        with pytest.raises(GitOpsException) as ex:
+            self.testee.wait_until_checked(self.git_repo_api_mock, 42)
+        self.assertEqual("Timed out after 30s waiting for pull request 42 to be checked", str(ex.value))
+        self.assertEqual(30, self.clock.now)  # last sleep is shortened to the timeout
+
+    def test_from_env(self):
+        with patch.dict("os.environ", {"GITOPSCLI_MERGE_TIMEOUT": "0"}):
+            testee = MergeReadinessPoller.from_env()
+        self.git_repo_api_mock.get_pull_request_merge_status.return_value = PENDING
+        with pytest.raises(GitOpsException):
+            testee.wait_until_checked(self.git_repo_api_mock, 42)
+        self.git_repo_api_mock.get_pull_request_merge_status.assert_called_once_with(42)
+
+    def test_from_env_invalid_value(self):
+        with patch.dict("os.environ", {"GITOPSCLI_MERGE_TIMEOUT": "soon"}), pytest.raises(GitOpsException) as ex:
+            MergeReadinessPoller.from_env()
+        self.assertEqual("Invalid value for GITOPSCLI_MERGE_TIMEOUT: 'soon'", str(ex.value))
@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gitopscli.git_api.rate_limiter import RateLimitBudget, RateLimiter
+from gitopscli.gitops_exception import GitOpsException
+
+NOW = 1_700_000_000.0
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.sleep_mock = MagicMock()
+        self.testee = RateLimiter(max_wait_seconds=120, sleep=self.sleep_mock, clock=lambda: NOW)
+
+    def test_from_env(self):
+        with patch.dict("os.environ", {"GITOPSCLI_RATE_LIMIT_MAX_WAIT": "abc"}, clear=True):
+            with pytest.raises(GitOpsException) as ex:
+                RateLimiter.from_env()
+            self.assertEqual("Invalid value for GITOPSCLI_RATE_LIMIT_MAX_WAIT: 'abc'", str(ex.value))
+
+    def test_get_key(self):
+        self.assertEqual("api.github.com", RateLimiter.get_key("https://api.github.com/repos/x", None))
+        key = RateLimiter.get_key("https://api.github.com/repos/x", "secret-token")
+        self.assertRegex(key, r"^api\.github\.com/[0-9a-f]{8}$")
+        self.assertNotIn("secret", key)
+        self.assertEqual(key, RateLimiter.get_key("https://api.github.com/user", b"secret-token"))
+
+    def test_no_wait_with_enough_budget(self):
+        headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": str(NOW + 60)}
+        self.assertFalse(self.testee.update("host", 200, headers))
+
+        self.testee.wait("host")
+        self.testee.wait("unknown-host")
+
+        self.sleep_mock.assert_not_called()
+        self.assertEqual(
+            {"host": {"limit": 5000, "remaining": 4999, "reset_at": int(NOW + 60)}}, self.testee.get_budgets()
+        )
+
+    def test_wait_for_reset_of_exhausted_budget(self):
+        headers = {"RateLimit-Limit": "600", "RateLimit-Remaining": "0", "RateLimit-Reset": str(NOW + 30)}
+        self.assertTrue(self.testee.update("host", 403, headers))
+
+        self.testee.wait("host")
+
+        self.sleep_mock.assert_called_once_with(30)
+
+    def test_pacing_of_low_budget(self):
+        headers = {"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "5", "X-RateLimit-Reset": str(NOW + 50)}
+        self.assertFalse(self.testee.update("host", 200, headers))
+
+        self.testee.wait("host")
+
+        self.sleep_mock.assert_called_once_with(10)
+
+    def test_retry_after(self):
+        self.assertTrue(self.testee.update("host", 429, {"Retry-After": "7"}))
+        self.testee.wait("host")
+        self.sleep_mock.assert_called_once_with(7)
+
+    def test_retry_after_http_date(self):
+        self.assertTrue(self.testee.update("host", 429, {"Retry-After": "Tue, 14 Nov 2023 22:14:00 GMT"}))
+        self.testee.wait("host")
+        self.sleep_mock.assert_called_once_with(40)
+
+    def test_forbidden_without_rate_limit_is_not_retried(self):
+        self.assertFalse(self.testee.update("host", 403, {"X-RateLimit-Remaining": "10"}))
+        self.assertFalse(self.testee.update("host", 403, {}))
+
+    def test_wait_is_capped(self):
+        self.testee.update("host", 429, {"Retry-After": "3600"})
+        self.testee.wait("host")
+        self.sleep_mock.assert_called_once_with(120)
+
+    def test_recorded_budget_source(self):
+        self.testee.record("api.github.com/1234", lambda: RateLimitBudget(limit=5000, remaining=42, reset_at=NOW))
+        self.testee.record("api.github.com/5678", lambda: None)
+
+        self.assertEqual(
+            {"api.github.com/1234": {"limit": 5000, "remaining": 42, "reset_at": int(NOW)}}, self.testee.get_budgets()
+        )
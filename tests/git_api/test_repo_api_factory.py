@@ -1,15 +1,24 @@
 import unittest
-from time import sleep
 from unittest.mock import MagicMock, patch
 
 from gitopscli.git_api import GitApiConfig, GitProvider, GitRepoApiFactory
+from gitopscli.git_api.git_api_metrics import get_git_api_metrics
+from gitopscli.git_api.http_session_registry import get_http_session_registry
 from gitopscli.gitops_exception import GitOpsException
 
 
 class GitRepoApiFactoryTest(unittest.TestCase):
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiMetricsProxy")
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiRetryProxy")
     @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiLoggingProxy")
-    @patch("gitopscli.git_api.git_repo_api_factory.GithubGitRepoApiAdapter")
-    def test_create_github(self, mock_github_adapter_constructor, mock_logging_proxy_constructor):
+    @patch("gitopscli.git_api.github_git_repo_api_adapter.GithubGitRepoApiAdapter")
+    def test_create_github(
+        self,
+        mock_github_adapter_constructor,
+        mock_logging_proxy_constructor,
+        mock_retry_proxy_constructor,
+        mock_metrics_proxy_constructor,
+    ):
         mock_github_adapter = MagicMock()
         mock_github_adapter_constructor.return_value = mock_github_adapter
 
@@ -27,13 +36,33 @@ class GitRepoApiFactoryTest(unittest.TestCase):
         self.assertEqual(git_repo_api, mock_logging_proxy)
 
         mock_github_adapter_constructor.assert_called_with(
-            username="USER", password="PASS", organisation="ORG", repository_name="REPO"
+            username="USER",
+            password="PASS",
+            organisation="ORG",
+            repository_name="REPO",
+            session_registry=get_http_session_registry(),
         )
-        mock_logging_proxy_constructor.assert_called_with(mock_github_adapter)
+        mock_metrics_proxy_constructor.assert_called_with(
+            mock_github_adapter, GitProvider.GITHUB, get_git_api_metrics()
+        )
+        mock_retry_proxy_constructor.assert_called_with(
+            mock_metrics_proxy_constructor.return_value,
+            GitProvider.GITHUB,
+            mock_retry_proxy_constructor.get_retry_policy(),
+        )
+        mock_logging_proxy_constructor.assert_called_with(mock_retry_proxy_constructor.return_value)
 
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiMetricsProxy")
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiRetryProxy")
     @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiLoggingProxy")
-    @patch("gitopscli.git_api.git_repo_api_factory.BitbucketGitRepoApiAdapter")
-    def test_create_bitbucket(self, mock_bitbucket_adapter_constructor, mock_logging_proxy_constructor):
+    @patch("gitopscli.git_api.bitbucket_git_repo_api_adapter.BitbucketGitRepoApiAdapter")
+    def test_create_bitbucket(
+        self,
+        mock_bitbucket_adapter_constructor,
+        mock_logging_proxy_constructor,
+        mock_retry_proxy_constructor,
+        mock_metrics_proxy_constructor,
+    ):
         mock_bitbucket_adapter = MagicMock()
         mock_bitbucket_adapter_constructor.return_value = mock_bitbucket_adapter
 
@@ -56,8 +85,17 @@ class GitRepoApiFactoryTest(unittest.TestCase):
             password="PASS",
             organisation="ORG",
             repository_name="REPO",
+            session_registry=get_http_session_registry(),
+        )
+        mock_metrics_proxy_constructor.assert_called_with(
+            mock_bitbucket_adapter, GitProvider.BITBUCKET, get_git_api_metrics()
         )
-        mock_logging_proxy_constructor.assert_called_with(mock_bitbucket_adapter)
+        mock_retry_proxy_constructor.assert_called_with(
+            mock_metrics_proxy_constructor.return_value,
+            GitProvider.BITBUCKET,
+            mock_retry_proxy_constructor.get_retry_policy(),
+        )
+        mock_logging_proxy_constructor.assert_called_with(mock_retry_proxy_constructor.return_value)
 
     def test_create_bitbucket_missing_url(self):
         try:
@@ -72,9 +110,17 @@ class GitRepoApiFactoryTest(unittest.TestCase):
         except GitOpsException as ex:
             self.assertEqual("Please provide url for Bitbucket!", str(ex))
 
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiMetricsProxy")
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiRetryProxy")
     @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiLoggingProxy")
-    @patch("gitopscli.git_api.git_repo_api_factory.GitlabGitRepoApiAdapter")
-    def test_create_gitlab(self, mock_gitlab_adapter_constructor, mock_logging_proxy_constructor):
+    @patch("gitopscli.git_api.gitlab_git_repo_api_adapter.GitlabGitRepoApiAdapter")
+    def test_create_gitlab(
+        self,
+        mock_gitlab_adapter_constructor,
+        mock_logging_proxy_constructor,
+        mock_retry_proxy_constructor,
+        mock_metrics_proxy_constructor,
+    ):
         mock_gitlab_adapter = MagicMock()
         mock_gitlab_adapter_constructor.return_value = mock_gitlab_adapter
 
@@ -97,12 +143,29 @@ class GitRepoApiFactoryTest(unittest.TestCase):
             password="PASS",
             organisation="ORG",
             repository_name="REPO",
+            session_registry=get_http_session_registry(),
+        )
+        mock_metrics_proxy_constructor.assert_called_with(
+            mock_gitlab_adapter, GitProvider.GITLAB, get_git_api_metrics()
         )
-        mock_logging_proxy_constructor.assert_called_with(mock_gitlab_adapter)
+        mock_retry_proxy_constructor.assert_called_with(
+            mock_metrics_proxy_constructor.return_value,
+            GitProvider.GITLAB,
+            mock_retry_proxy_constructor.get_retry_policy(),
+        )
+        mock_logging_proxy_constructor.assert_called_with(mock_retry_proxy_constructor.return_value)
 
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiMetricsProxy")
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiRetryProxy")
     @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiLoggingProxy")
-    @patch("gitopscli.git_api.git_repo_api_factory.GitlabGitRepoApiAdapter")
-    def test_create_gitlab_default_provider_url(self, mock_gitlab_adapter_constructor, mock_logging_proxy_constructor):
+    @patch("gitopscli.git_api.gitlab_git_repo_api_adapter.GitlabGitRepoApiAdapter")
+    def test_create_gitlab_default_provider_url(
+        self,
+        mock_gitlab_adapter_constructor,
+        mock_logging_proxy_constructor,
+        mock_retry_proxy_constructor,
+        mock_metrics_proxy_constructor,
+    ):
         mock_gitlab_adapter = MagicMock()
         mock_gitlab_adapter_constructor.return_value = mock_gitlab_adapter
 
@@ -125,12 +188,29 @@ class GitRepoApiFactoryTest(unittest.TestCase):
             password="PASS",
             organisation="ORG",
             repository_name="REPO",
+            session_registry=get_http_session_registry(),
+        )
+        mock_metrics_proxy_constructor.assert_called_with(
+            mock_gitlab_adapter, GitProvider.GITLAB, get_git_api_metrics()
         )
-        mock_logging_proxy_constructor.assert_called_with(mock_gitlab_adapter)
+        mock_retry_proxy_constructor.assert_called_with(
+            mock_metrics_proxy_constructor.return_value,
+            GitProvider.GITLAB,
+            mock_retry_proxy_constructor.get_retry_policy(),
+        )
+        mock_logging_proxy_constructor.assert_called_with(mock_retry_proxy_constructor.return_value)
 
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiMetricsProxy")
+    @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiRetryProxy")
     @patch("gitopscli.git_api.git_repo_api_factory.GitRepoApiLoggingProxy")
-    @patch("gitopscli.git_api.git_repo_api_factory.AzureDevOpsGitRepoApiAdapter")
-    def test_create_azure_devops(self, mock_azure_devops_adapter_constructor, mock_logging_proxy_constructor):
+    @patch("gitopscli.git_api.azure_devops_git_repo_api_adapter.AzureDevOpsGitRepoApiAdapter")
+    def test_create_azure_devops(
+        self,
+        mock_azure_devops_adapter_constructor,
+        mock_logging_proxy_constructor,
+        mock_retry_proxy_constructor,
+        mock_metrics_proxy_constructor,
+    ):
         mock_azure_devops_adapter = MagicMock()
         mock_azure_devops_adapter_constructor.return_value = mock_azure_devops_adapter
 
@@ -156,9 +236,17 @@ class GitRepoApiFactoryTest(unittest.TestCase):
             password="PAT_TOKEN",
             organisation="ORG",
             repository_name="REPO",
-            sleep_func=sleep,
+            session_registry=get_http_session_registry(),
+        )
+        mock_metrics_proxy_constructor.assert_called_with(
+            mock_azure_devops_adapter, GitProvider.AZURE_DEVOPS, get_git_api_metrics()
+        )
+        mock_retry_proxy_constructor.assert_called_with(
+            mock_metrics_proxy_constructor.return_value,
+            GitProvider.AZURE_DEVOPS,
+            mock_retry_proxy_constructor.get_retry_policy(),
         )
-        mock_logging_proxy_constructor.assert_called_with(mock_azure_devops_adapter)
+        mock_logging_proxy_constructor.assert_called_with(mock_retry_proxy_constructor.return_value)
 
     def test_create_azure_devops_missing_url(self):
         try:
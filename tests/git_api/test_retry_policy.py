@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from gitopscli.git_api.git_push_retry_policy import get_push_retry_policy
+from gitopscli.git_api.retry_policy import RetryPolicy
+from gitopscli.gitops_exception import GitOpsException
+
+DEFAULT = RetryPolicy(max_attempts=5, base_delay_seconds=0.5, max_delay_seconds=10.0, deadline_seconds=60.0)
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_from_env_defaults(self):
+        with patch.dict("os.environ", {}, clear=True):
+            self.assertEqual(DEFAULT, RetryPolicy.from_env("GITOPSCLI_TEST", DEFAULT))
+
+    def test_from_env(self):
+        env = {
+            "GITOPSCLI_TEST_MAX_ATTEMPTS": "3",
+            "GITOPSCLI_TEST_RETRY_BASE_DELAY": "0.25",
+            "GITOPSCLI_TEST_RETRY_MAX_DELAY": "4",
+            "GITOPSCLI_TEST_RETRY_DEADLINE": "30",
+        }
+        with patch.dict("os.environ", env, clear=True):
+            self.assertEqual(RetryPolicy(3, 0.25, 4.0, 30.0), RetryPolicy.from_env("GITOPSCLI_TEST", DEFAULT))
+
+    def test_from_env_invalid_value(self):
+        with patch.dict("os.environ", {"GITOPSCLI_PUSH_MAX_ATTEMPTS": "many"}, clear=True):
+            with pytest.raises(GitOpsException) as ex:
+                get_push_retry_policy()
+            self.assertEqual("Invalid value for GITOPSCLI_PUSH_MAX_ATTEMPTS: 'many'", str(ex.value))
+
+    def test_push_retry_policy_defaults(self):
+        with patch.dict("os.environ", {}, clear=True):
+            self.assertEqual(RetryPolicy(5, 0.5, 10.0), get_push_retry_policy())
+
+    def test_get_delay_seconds_is_jittered_exponential_backoff(self):
+        testee = RetryPolicy(max_attempts=10, base_delay_seconds=1.0, max_delay_seconds=5.0)
+        with patch("gitopscli.git_api.retry_policy.random.uniform", side_effect=lambda _, b: b):
+            self.assertEqual([1.0, 2.0, 4.0, 5.0, 5.0], [testee.get_delay_seconds(attempt) for attempt in range(1, 6)])
+        for attempt in range(1, 6):
+            self.assertTrue(0 <= testee.get_delay_seconds(attempt) <= testee.max_delay_seconds)
+
+    def test_allows_retry(self):
+        testee = RetryPolicy(max_attempts=3, base_delay_seconds=1.0, max_delay_seconds=5.0, deadline_seconds=10.0)
+        self.assertTrue(testee.allows_retry(1, elapsed_seconds=0.0, delay_seconds=1.0))
+        self.assertTrue(testee.allows_retry(2, elapsed_seconds=8.0, delay_seconds=2.0))
+        self.assertFalse(testee.allows_retry(2, elapsed_seconds=8.5, delay_seconds=2.0))
+        self.assertFalse(testee.allows_retry(3, elapsed_seconds=0.0, delay_seconds=0.0))
+        self.assertTrue(RetryPolicy(3, 1.0, 5.0).allows_retry(2, elapsed_seconds=1000.0, delay_seconds=5.0))
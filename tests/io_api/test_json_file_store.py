@@ -0,0 +1,50 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import pytest
+
+from gitopscli.io_api.json_file_store import JsonFileStore
+
+
+class JsonFileStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.store_dir = Path(tmp_dir.name) / "store"
+        self.testee = JsonFileStore(str(self.store_dir))
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.testee.get("key"))
+
+        self.testee.put("key", {"a": [1, 2]})
+        self.testee.put("key", {"a": [3]})
+
+        self.assertEqual({"a": [3]}, self.testee.get("key"))
+        self.assertIsNone(self.testee.get("other key"))
+        self.assertEqual(1, len(list(self.store_dir.iterdir())))  # no temporary files are left behind
+
+    def test_expired_documents_are_ignored(self):
+        self.testee.put("key", {"a": 1})
+        (file_path,) = self.store_dir.iterdir()
+        expired = time.time() - 61
+        os.utime(file_path, (expired, expired))
+
+        self.assertIsNone(self.testee.get("key", max_age_seconds=60))
+        self.assertEqual({"a": 1}, self.testee.get("key"))
+
+    def test_invalid_documents_are_ignored(self):
+        self.testee.put("key", {"a": 1})
+        (file_path,) = self.store_dir.iterdir()
+        file_path.write_text("{no json")
+
+        self.assertIsNone(self.testee.get("key"))
+
+    def test_put_raises_os_error(self):
+        self.store_dir.parent.joinpath("file").write_text("")
+        testee = JsonFileStore(str(self.store_dir.parent / "file" / "store"))
+
+        with pytest.raises(NotADirectoryError):
+            testee.put("key", {"a": 1})
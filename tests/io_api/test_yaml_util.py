@@ -1,19 +1,29 @@
+import os
 import shutil
+import time
 import unittest
 import uuid
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+from jsonpath_ng.exceptions import JSONPathError
+from jsonpath_ng.ext import parse
 
 from gitopscli.io_api.yaml_util import (
     YAMLException,
+    YAMLKeyError,
     merge_yaml_element,
+    parse_jsonpath,
     update_yaml_file,
+    update_yaml_file_values,
+    update_yaml_values,
     yaml_dump,
     yaml_file_dump,
     yaml_file_load,
     yaml_load,
 )
+from gitopscli.tracing import start_trace
 
 
 class YamlUtilTest(unittest.TestCase):
@@ -66,6 +76,16 @@ class YamlUtilTest(unittest.TestCase):
         yaml_content = self._read_file(path)
         self.assertEqual(yaml_content, "answer:\n  is: '42'\n")
 
+    def test_yaml_file_dump_skips_identical_content(self):
+        path = self._create_file("answer:\n  is: '42'\n")
+        os.utime(path, (0, 0))
+
+        self.assertFalse(yaml_file_dump({"answer": {"is": "42"}}, path))
+        self.assertEqual(0, Path(path).stat().st_mtime)
+
+        self.assertTrue(yaml_file_dump({"answer": {"is": "43"}}, path))
+        self.assertEqual("answer:\n  is: '43'\n", self._read_file(path))
+
     def test_yaml_file_dump_unknown_directory(self):
         try:
             yaml_file_dump({"answer": {"is": "42"}}, "/unknown-dir/foo")
@@ -230,6 +250,200 @@ a: # comment 1
         except IsADirectoryError:
             pass
 
+    def test_update_yaml_file_values(self):
+        test_file = self._create_file(
+            """\
+a: # comment 1
+  b: 1 # comment 2
+  c: 2 # comment 3
+  d: [3, 4] # comment 4
+"""
+        )
+
+        updated_values = update_yaml_file_values(test_file, {"a.b": 1, "a.c": "foo", "a.d.[1]": 42})
+        self.assertEqual({"a.c": "foo", "a.d.[1]": 42}, updated_values)
+
+        expected = """\
+a: # comment 1
+  b: 1 # comment 2
+  c: foo # comment 3
+  d: [3, 42] # comment 4
+"""
+        self.assertEqual(expected, self._read_file(test_file))
+
+        self.assertEqual({}, update_yaml_file_values(test_file, {"a.c": "foo", "a.d.[1]": 42}))  # already updated
+
+    def test_update_yaml_file_values_on_update(self):
+        test_file = self._create_file("a: 1\nb: 2\nc: 3\n")
+        file_contents_on_update = []
+
+        def on_update(key, value):
+            file_contents_on_update.append((key, value, self._read_file(test_file)))
+
+        updated_values = update_yaml_file_values(test_file, {"a": 10, "b": 2, "c": 30}, on_update=on_update)
+
+        self.assertEqual({"a": 10, "c": 30}, updated_values)
+        self.assertEqual(
+            [("a", 10, "a: 10\nb: 2\nc: 3\n"), ("c", 30, "a: 10\nb: 2\nc: 30\n")],
+            file_contents_on_update,
+        )
+
+    def test_update_yaml_file_values_key_error_leaves_file_untouched(self):
+        test_file = self._create_file("a: 1\nb: 2\n")
+
+        with pytest.raises(YAMLKeyError) as ex:
+            update_yaml_file_values(test_file, {"a": 10, "x.y": "foo"})
+        self.assertEqual("\"Key 'x.y' not found in YAML!\"", str(ex.value))
+        self.assertEqual("x.y", ex.value.key)
+
+        self.assertEqual("a: 1\nb: 2\n", self._read_file(test_file))
+
+    def test_update_yaml_file_values_replaces_scalars_in_place(self):
+        test_file = self._create_file(
+            """\
+image:
+  repository:    registry.example.com/app   # comment
+  tag: '1.0' # quotes are kept
+  pullPolicy: "Always"
+description: a long plain scalar which would be folded into two lines if the whole document was dumped again
+args:
+  - --verbose
+  -   --port=8080
+"""
+        )
+
+        updated_values = update_yaml_file_values(
+            test_file,
+            {"image.repository": "other/app", "image.tag": "2.0", "image.pullPolicy": "Never", "args.[1]": 9090},
+        )
+
+        self.assertEqual(4, len(updated_values))
+        expected = """\
+image:
+  repository:    other/app   # comment
+  tag: '2.0' # quotes are kept
+  pullPolicy: Never
+description: a long plain scalar which would be folded into two lines if the whole document was dumped again
+args:
+  - --verbose
+  -   9090
+"""
+        self.assertEqual(expected, self._read_file(test_file))
+
+    def test_update_yaml_file_values_falls_back_to_dump_for_structural_changes(self):
+        for values, expected in [
+            ({"a.b": {"c": "d"}}, "a:\n  b:\n    c: d\nx: &x 1\ny: *x\n"),
+            ({"x": 2}, "a:\n  b: 1\nx: 2\ny: &x 1\n"),  # anchor
+        ]:
+            with self.subTest(values=values):
+                test_file = self._create_file("a:\n    b: 1\nx: &x 1\ny: *x\n")
+                update_yaml_file_values(test_file, values)
+                self.assertEqual(expected, self._read_file(test_file))
+
+    def test_update_yaml_values(self):
+        source = "a: # comment 1\n  b: 1 # comment 2\n  c: '2'\n"
+
+        updated_source, updated_values = update_yaml_values(source, {"a.b": 1, "a.c": "foo"})
+
+        self.assertEqual({"a.c": "foo"}, updated_values)
+        self.assertEqual("a: # comment 1\n  b: 1 # comment 2\n  c: foo\n", updated_source)
+        self.assertEqual((source, {}), update_yaml_values(source, {"a.b": 1}))  # already up-to-date
+
+    def test_update_yaml_values_on_update(self):
+        sources_on_update = []
+
+        def on_update(key, value, source):
+            sources_on_update.append((key, value, source))
+
+        updated_source, updated_values = update_yaml_values(
+            "a: 1\nb: 2\nc: 3\n", {"a": 10, "b": 2, "c": 30}, on_update=on_update
+        )
+
+        self.assertEqual({"a": 10, "c": 30}, updated_values)
+        self.assertEqual("a: 10\nb: 2\nc: 30\n", updated_source)
+        self.assertEqual([("a", 10, "a: 10\nb: 2\nc: 3\n"), ("c", 30, "a: 10\nb: 2\nc: 30\n")], sources_on_update)
+
+    def test_update_yaml_values_falls_back_to_dump_for_structural_changes(self):
+        updated_source, _ = update_yaml_values("a:\n    b: 1\n", {"a.b": {"c": "d"}})
+        self.assertEqual("a:\n  b:\n    c: d\n", updated_source)
+
+    def test_update_yaml_values_key_error(self):
+        with pytest.raises(YAMLKeyError) as ex:
+            update_yaml_values("a: 1\n", {"x.y": "foo"})
+        self.assertEqual("x.y", ex.value.key)
+
+    def test_update_yaml_file_values_of_large_file(self):
+        service_count = 400
+        test_file = self._create_file(_large_yaml(service_count))
+        expected = self._read_file(test_file)
+        for i in range(0, service_count, 100):
+            expected = expected.replace(f"tag: '1.{i}'\n", "tag: '2.0'\n")
+
+        with (
+            start_trace("test") as trace,
+            patch("gitopscli.io_api.yaml_util.yaml_file_dump", wraps=yaml_file_dump) as yaml_file_dump_mock,
+        ):
+            update_yaml_file_values(
+                test_file, {f"service-{i:04}.image.tag": "2.0" for i in range(0, service_count, 100)}
+            )
+
+        yaml_file_dump_mock.assert_not_called()
+        self.assertIn("yaml.splice", trace.get_phases())
+        self.assertEqual(expected.encode(), Path(test_file).read_bytes())  # only the spliced tags changed
+
+    @pytest.mark.skipif(not os.environ.get("GITOPSCLI_BENCHMARK"), reason="set GITOPSCLI_BENCHMARK=1 to run benchmarks")
+    def test_benchmark_update_yaml_file_values_of_large_file(self):
+        service_count = 1000
+        test_file = self._create_file(_large_yaml(service_count))
+        source = self._read_file(test_file)
+        values = {f"service-{i:04}.image.tag": "2.0" for i in range(0, service_count, 100)}
+
+        dump_file = self._create_tmp_file_path()
+        dump_durations, splice_durations = [], []
+        for _ in range(3):  # best of three, so a slow run doesn't decide
+            Path(test_file).write_text(source)
+            start_time = time.perf_counter()
+            content = yaml_file_load(test_file)
+            for key, value in values.items():
+                parse_jsonpath(key).update(content, value)
+            yaml_file_dump(content, dump_file)
+            dump_durations.append(time.perf_counter() - start_time)
+
+            Path(test_file).write_text(source)
+            start_time = time.perf_counter()
+            update_yaml_file_values(test_file, values)
+            splice_durations.append(time.perf_counter() - start_time)
+
+        print(f"load+dump: {min(dump_durations):.3f}s, splice: {min(splice_durations):.3f}s")  # noqa: T201
+        self.assertEqual(yaml_file_load(dump_file), yaml_file_load(test_file))
+        self.assertLessEqual(min(splice_durations), min(dump_durations))
+
+    def test_parse_jsonpath(self):
+        for key in [
+            "a",
+            "image.tag",
+            "a.b[0].c",
+            "a.e.[0].g",
+            "[42].y",
+            "a[1][2]",
+            "a_b.c-d.whereabouts",
+            "truename.falsehood",
+            "a.*.b",
+            "a[-1]",
+            "a.e.[*].list[?key=='k3+4'].value",
+        ]:
+            with self.subTest(key=key):
+                self.assertEqual(parse(key), parse_jsonpath(key))
+
+    def test_parse_jsonpath_reserved_word(self):
+        for key in ["a.where", "wherenot.a", "a.true", "false"]:
+            with self.subTest(key=key), pytest.raises(JSONPathError):
+                parse_jsonpath(key)
+
+    def test_parse_jsonpath_is_cached(self):
+        self.assertIs(parse_jsonpath("a.b[0].c"), parse_jsonpath("a.b[0].c"))
+        self.assertIs(parse_jsonpath("a.*.b"), parse_jsonpath("a.*.b"))
+
     def test_merge_yaml_element(self):
         test_file = self._create_file(
             """\
@@ -242,7 +456,7 @@ applications:
         )
 
         value = {"app2": {"key2": "value"}, "app3": None}
-        merge_yaml_element(test_file, "applications", value)
+        self.assertTrue(merge_yaml_element(test_file, "applications", value))
 
         expected = """\
 # Kept comment
@@ -255,6 +469,13 @@ applications:
         actual = self._read_file(test_file)
         self.assertEqual(expected, actual)
 
+    def test_merge_yaml_element_unchanged(self):
+        content = "applications:\n  app1:\n  app2:\n    key: value\n"
+        test_file = self._create_file(content)
+
+        self.assertFalse(merge_yaml_element(test_file, "applications", {"app1": None, "app2": {"key": "value"}}))
+        self.assertEqual(content, self._read_file(test_file))
+
     def test_merge_yaml_element_create(self):
         test_file = self._create_file(
             """\
@@ -298,3 +519,12 @@ applications:
 """
         actual = self._read_file(test_file)
         self.assertEqual(expected, actual)
+
+
+def _large_yaml(service_count: int) -> str:
+    return "".join(
+        f"service-{i:04}:  # service {i}\n"
+        f"  image:\n    repository: registry.example.com/team/service-{i:04}\n    tag: '1.{i}'\n"
+        f"  resources: {{limits: {{cpu: 100m, memory: 128Mi}}}}\n"
+        for i in range(service_count)
+    )
@@ -13,7 +13,9 @@ from gitopscli.commands import (
     CreatePrPreviewCommand,
     DeletePreviewCommand,
     DeletePrPreviewCommand,
+    DeployBatchCommand,
     DeployCommand,
+    ServeCommand,
     SyncAppsCommand,
     VersionCommand,
 )
@@ -21,7 +23,7 @@ from gitopscli.git_api import GitProvider
 
 EXPECTED_GITOPSCLI_HELP = """\
 usage: gitopscli [-h]
-                 {deploy,sync-apps,add-pr-comment,create-preview,create-pr-preview,delete-preview,delete-pr-preview,version}
+                 {deploy,deploy-batch,sync-apps,add-pr-comment,create-preview,create-pr-preview,delete-preview,delete-pr-preview,version,serve}
                  ...
 
 GitOps CLI
@@ -30,8 +32,10 @@ options:
   -h, --help            show this help message and exit
 
 commands:
-  {deploy,sync-apps,add-pr-comment,create-preview,create-pr-preview,delete-preview,delete-pr-preview,version}
+  {deploy,deploy-batch,sync-apps,add-pr-comment,create-preview,create-pr-preview,delete-preview,delete-pr-preview,version,serve}
     deploy              Trigger a new deployment by changing YAML values
+    deploy-batch        Trigger deployments in multiple files and repositories
+                        defined in a manifest
     sync-apps           Synchronize applications (= every directory) from apps
                         config repository to apps root config
     add-pr-comment      Create a comment on the pull request
@@ -40,6 +44,8 @@ commands:
     delete-preview      Delete a preview environment
     delete-pr-preview   Delete a pr preview environment
     version             Show the GitOps CLI version information
+    serve               Run a server which executes commands sent as JSON
+                        requests
 """
 
 EXPECTED_ADD_PR_COMMENT_NO_ARGS_ERROR = """\
@@ -392,13 +398,15 @@ usage: gitopscli sync-apps [-h] --username USERNAME --password PASSWORD
                            [--git-user GIT_USER] [--git-email GIT_EMAIL]
                            [--git-author-name GIT_AUTHOR_NAME]
                            [--git-author-email GIT_AUTHOR_EMAIL]
-                           --organisation ORGANISATION --repository-name
-                           REPOSITORY_NAME [--git-provider GIT_PROVIDER]
+                           [--organisation ORGANISATION]
+                           [--repository-name REPOSITORY_NAME]
+                           [--git-provider GIT_PROVIDER]
                            [--git-provider-url GIT_PROVIDER_URL]
                            [-v [VERBOSE]] --root-organisation
                            ROOT_ORGANISATION --root-repository-name
-                           ROOT_REPOSITORY_NAME
-gitopscli sync-apps: error: the following arguments are required: --username, --password, --organisation, --repository-name, --root-organisation, --root-repository-name
+                           ROOT_REPOSITORY_NAME [--all-tenants [ALL_TENANTS]]
+                           [--max-workers MAX_WORKERS]
+gitopscli sync-apps: error: the following arguments are required: --username, --password, --root-organisation, --root-repository-name
 """  # noqa: E501
 
 EXPECTED_SYNC_APPS_HELP = """\
@@ -406,12 +414,14 @@ usage: gitopscli sync-apps [-h] --username USERNAME --password PASSWORD
                            [--git-user GIT_USER] [--git-email GIT_EMAIL]
                            [--git-author-name GIT_AUTHOR_NAME]
                            [--git-author-email GIT_AUTHOR_EMAIL]
-                           --organisation ORGANISATION --repository-name
-                           REPOSITORY_NAME [--git-provider GIT_PROVIDER]
+                           [--organisation ORGANISATION]
+                           [--repository-name REPOSITORY_NAME]
+                           [--git-provider GIT_PROVIDER]
                            [--git-provider-url GIT_PROVIDER_URL]
                            [-v [VERBOSE]] --root-organisation
                            ROOT_ORGANISATION --root-repository-name
-                           ROOT_REPOSITORY_NAME
+                           ROOT_REPOSITORY_NAME [--all-tenants [ALL_TENANTS]]
+                           [--max-workers MAX_WORKERS]
 
 options:
   -h, --help            show this help message and exit
@@ -441,6 +451,13 @@ options:
                         Root config repository organisation
   --root-repository-name ROOT_REPOSITORY_NAME
                         Root config repository name
+  --all-tenants [ALL_TENANTS]
+                        Synchronize all apps config repositories of the root
+                        config repository in a single commit (instead of
+                        --organisation and --repository-name)
+  --max-workers MAX_WORKERS
+                        Number of apps config repositories cloned in parallel
+                        with --all-tenants (default: 4)
 """
 
 EXPECTED_VERSION_HELP = """\
@@ -450,6 +467,19 @@ options:
   -h, --help  show this help message and exit
 """
 
+EXPECTED_SERVE_HELP = """\
+usage: gitopscli serve [-h] [--host HOST] [--port PORT] [--socket SOCKET]
+                       [-v [VERBOSE]]
+
+options:
+  -h, --help            show this help message and exit
+  --host HOST           Host to listen on (default: 127.0.0.1)
+  --port PORT           Port to listen on (default: 8080)
+  --socket SOCKET       Listen on this unix socket instead of host and port
+  -v, --verbose [VERBOSE]
+                        Verbose exception logging
+"""
+
 
 @contextmanager
 def captured_output():
@@ -1169,6 +1199,75 @@ class CliParserTest(unittest.TestCase):
         self.assertTrue(args.single_commit)
         self.assertTrue(verbose)
 
+    def test_deploy_batch_required_args(self):
+        verbose, args = parse_args(
+            ["deploy-batch", "--git-provider", "github", "--username", "USER", "--password", "PASS", "--manifest", "M"]
+        )
+        self.assertEqual(
+            DeployBatchCommand.Args(
+                username="USER",
+                password="PASS",
+                git_provider=GitProvider.GITHUB,
+                git_provider_url=None,
+                git_user="GitOpsCLI",
+                git_email="gitopscli@baloise.dev",
+                git_author_name=None,
+                git_author_email=None,
+                manifest="M",
+                single_commit=False,
+                max_workers=4,
+                json=False,
+            ),
+            args,
+        )
+        self.assertFalse(verbose)
+
+    def test_deploy_batch_all_args(self):
+        verbose, args = parse_args(
+            [
+                "deploy-batch",
+                "--git-provider-url",
+                "https://gitlab.example.tld",
+                "--username",
+                "USER",
+                "--password",
+                "PASS",
+                "--git-user",
+                "GIT_USER",
+                "--git-email",
+                "GIT_EMAIL",
+                "--git-author-name",
+                "GIT_AUTHOR_NAME",
+                "--git-author-email",
+                "GIT_AUTHOR_EMAIL",
+                "--manifest",
+                "M",
+                "--single-commit",
+                "--max-workers",
+                "8",
+                "--json",
+                "-v",
+            ]
+        )
+        self.assertEqual(
+            DeployBatchCommand.Args(
+                username="USER",
+                password="PASS",
+                git_provider=GitProvider.GITLAB,
+                git_provider_url="https://gitlab.example.tld",
+                git_user="GIT_USER",
+                git_email="GIT_EMAIL",
+                git_author_name="GIT_AUTHOR_NAME",
+                git_author_email="GIT_AUTHOR_EMAIL",
+                manifest="M",
+                single_commit=True,
+                max_workers=8,
+                json=True,
+            ),
+            args,
+        )
+        self.assertTrue(verbose)
+
     def test_sync_apps_no_args(self):
         exit_code, stdout, stderr = self._capture_parse_args(["sync-apps"])
         self.assertEqual(exit_code, 2)
@@ -1221,6 +1320,8 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual(args.repository_name, "REPO")
         self.assertEqual(args.root_organisation, "ROOT_ORGA")
         self.assertEqual(args.root_repository_name, "ROOT_REPO")
+        self.assertFalse(args.all_tenants)
+        self.assertEqual(args.max_workers, 4)
 
         self.assertEqual(args.git_provider, GitProvider.GITLAB)
         self.assertEqual(args.git_provider_url, "https://www.gitlab.com/")
@@ -1254,6 +1355,9 @@ class CliParserTest(unittest.TestCase):
                 "ROOT_ORGA",
                 "--root-repository-name",
                 "ROOT_REPO",
+                "--all-tenants",
+                "--max-workers",
+                "8",
                 "--verbose",
                 "false",
             ]
@@ -1270,6 +1374,8 @@ class CliParserTest(unittest.TestCase):
         self.assertEqual(args.repository_name, "REPO")
         self.assertEqual(args.root_organisation, "ROOT_ORGA")
         self.assertEqual(args.root_repository_name, "ROOT_REPO")
+        self.assertTrue(args.all_tenants)
+        self.assertEqual(args.max_workers, 8)
 
         self.assertEqual(args.git_provider, GitProvider.GITHUB)
         self.assertEqual(args.git_provider_url, "GIT_PROVIDER_URL")
@@ -1285,6 +1391,24 @@ class CliParserTest(unittest.TestCase):
         self.assert_equal_ignoring_whitespace_and_newlines(EXPECTED_VERSION_HELP, stdout)
         self.assertEqual("", stderr)
 
+    def test_serve_args(self):
+        verbose, args = parse_args(["serve"])
+        self.assertEqual(ServeCommand.Args(host="127.0.0.1", port=8080, socket=None), args)
+        self.assertFalse(verbose)
+
+    def test_serve_all_args(self):
+        verbose, args = parse_args(
+            ["serve", "--host", "0.0.0.0", "--port", "9000", "--socket", "/run/gitopscli.sock", "-v"]  # noqa: S104
+        )
+        self.assertEqual(ServeCommand.Args(host="0.0.0.0", port=9000, socket="/run/gitopscli.sock"), args)  # noqa: S104
+        self.assertTrue(verbose)
+
+    def test_serve_help(self):
+        exit_code, stdout, stderr = self._capture_parse_args(["serve", "--help"])
+        self.assertEqual(exit_code, 0)
+        self.assert_equal_ignoring_whitespace_and_newlines(EXPECTED_SERVE_HELP, stdout)
+        self.assertEqual("", stderr)
+
     def test_invalid_boolean(self):
         exit_code, stdout, stderr = self._capture_parse_args(
             [
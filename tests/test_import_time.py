@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import unittest
+
+PROVIDER_SDK_PACKAGES = {"github", "gitlab", "atlassian", "azure", "msrest"}
+
+
+def imported_packages(code: str) -> set[str]:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # stderr lines look like: "import time:       271 |     554540 |         gitopscli.git_api"
+    return {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_cli_startup_does_not_import_provider_sdks(self):
+        packages = imported_packages("import gitopscli.__main__")
+        self.assertIn("gitopscli", packages)
+        self.assertEqual(set(), packages & PROVIDER_SDK_PACKAGES)
+
+    def test_only_selected_provider_sdk_is_imported(self):
+        packages = imported_packages(
+            "from gitopscli.git_api import GitApiConfig, GitProvider, GitRepoApiFactory\n"
+            "GitRepoApiFactory.create(GitApiConfig('USER', 'PASS', GitProvider.GITHUB, None), 'ORG', 'REPO')"
+        )
+        self.assertEqual({"github"}, packages & PROVIDER_SDK_PACKAGES)
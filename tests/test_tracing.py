@@ -0,0 +1,113 @@
+import json
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from pathlib import Path
+
+import pytest
+
+from gitopscli.tracing import get_current_trace, span, start_trace, submit_in_context, traced
+
+
+@traced("traced.function")
+def traced_function(value):
+    return value * 2
+
+
+class TracingTest(unittest.TestCase):
+    def test_spans_without_trace_are_not_recorded(self):
+        with span("outside"):
+            self.assertEqual(4, traced_function(2))
+        self.assertIsNone(get_current_trace())
+
+    def test_nested_spans(self):
+        with start_trace("command") as trace:
+            with span("git.clone", branch="main"):
+                pass
+            traced_function(1)
+            traced_function(2)
+
+        root, clone, *function_spans = trace.get_spans()
+        self.assertEqual("command", root.name)
+        self.assertIsNone(root.parent_span_id)
+        self.assertEqual("git.clone", clone.name)
+        self.assertEqual(root.span_id, clone.parent_span_id)
+        self.assertEqual({"branch": "main"}, clone.attributes)
+        self.assertEqual(["traced.function", "traced.function"], [s.name for s in function_spans])
+        self.assertTrue(all(s.parent_span_id == root.span_id for s in function_spans))
+        self.assertTrue(all(s.end_time_ns >= s.start_time_ns for s in trace.get_spans()))
+        self.assertIsNone(get_current_trace())
+
+    def test_phases(self):
+        with start_trace("command") as trace:
+            traced_function(1)
+            traced_function(2)
+            self.assertEqual({"traced.function": 2}, {name: p["count"] for name, p in trace.get_phases().items()})
+
+        phases = trace.get_phases()
+        self.assertEqual(["command", "traced.function"], list(phases))
+        self.assertEqual(1, phases["command"]["count"])
+        self.assertGreaterEqual(phases["command"]["duration_seconds"], phases["traced.function"]["duration_seconds"])
+
+    def test_failed_span(self):
+        with start_trace("command") as trace, pytest.raises(ValueError, match="boom"), span("failing"):
+            raise ValueError("boom")
+
+        failing = next(s for s in trace.get_spans() if s.name == "failing")
+        self.assertEqual("boom", failing.error)
+        otlp_spans = trace.to_otlp_json()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual([{"code": 1}, {"code": 2, "message": "boom"}], [s["status"] for s in otlp_spans])
+
+    def test_spans_of_threads_with_copied_context(self):
+        with start_trace("command") as trace:
+            threads = [threading.Thread(target=copy_context().run, args=(traced_function, i)) for i in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(3, trace.get_phases()["traced.function"]["count"])
+
+    def test_submit_in_context(self):
+        with start_trace("command") as trace, ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [submit_in_context(executor, traced_function, i) for i in range(3)]
+            self.assertEqual([0, 2, 4], [future.result() for future in futures])
+
+        root = trace.get_spans()[0]
+        function_spans = [s for s in trace.get_spans() if s.name == "traced.function"]
+        self.assertEqual(3, len(function_spans))
+        self.assertTrue(all(s.parent_span_id == root.span_id for s in function_spans))
+
+    def test_write_otlp_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_file = Path(tmp_dir) / "traces.jsonl"
+            for _ in range(2):
+                with start_trace("command", dry_run=False) as trace, span("git.push", attempts=1, branch="main"):
+                    pass
+                trace.write_otlp_file(str(trace_file))
+
+            lines = trace_file.read_text().splitlines()
+
+        self.assertEqual(2, len(lines))
+        resource_spans = json.loads(lines[-1])["resourceSpans"][0]
+        self.assertEqual(
+            [{"key": "service.name", "value": {"stringValue": "gitopscli"}}], resource_spans["resource"]["attributes"]
+        )
+        root, push = resource_spans["scopeSpans"][0]["spans"]
+        self.assertEqual(trace.trace_id, root["traceId"])
+        self.assertEqual(32, len(root["traceId"]))
+        self.assertNotIn("parentSpanId", root)
+        self.assertEqual([{"key": "dry_run", "value": {"boolValue": False}}], root["attributes"])
+        self.assertEqual(root["spanId"], push["parentSpanId"])
+        self.assertEqual("git.push", push["name"])
+        self.assertEqual(
+            [
+                {"key": "attempts", "value": {"intValue": "1"}},
+                {"key": "branch", "value": {"stringValue": "main"}},
+            ],
+            push["attributes"],
+        )
+        self.assertEqual({"code": 1}, push["status"])
+        self.assertLessEqual(int(push["startTimeUnixNano"]), int(push["endTimeUnixNano"]))